@@ -20,9 +20,28 @@ class Settings(BaseSettings):
     SUPABASE_JWT_SECRET: str
     ALGORITHM: ClassVar[str] = "HS256"
 
+    # SQL connection pool (per process; defaults are SQLAlchemy's).
+    # Instances x (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay below the
+    # database / pgbouncer connection limit.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = -1  # seconds before a connection is replaced
+    # Set when DATABASE_URL points at pgbouncer in transaction mode (e.g. the
+    # Supabase pooler on port 6543): disables prepared statement caching
+    DB_PGBOUNCER: bool = False
+    # Log pool metrics every N seconds (0 disables; see GET /health/pool)
+    DB_POOL_METRICS_LOG_INTERVAL: float = 0.0
+
     # redis config
     REDIS_URL: str = Field(default="redis://redis:6379/0")
 
+    # Background worker (app/worker)
+    # When enabled, POST /answer enqueues mastery propagation after commit
+    # instead of running it inline (requires Redis and a running worker)
+    MASTERY_PROPAGATION_ASYNC: bool = False
+    WORKER_CONCURRENCY: int = 8
+
     # AI API key
     GOOGLE_API_KEY: str
 
@@ -52,6 +71,49 @@ class Settings(BaseSettings):
     PDF_POLL_INTERVAL_SECONDS: int = 2
     PDF_MAX_CONCURRENCY: int = 2
 
+    # Background job: cached_retrievability refresh
+    RETRIEVABILITY_REFRESH_BATCH_SIZE: int = 5000
+    RETRIEVABILITY_REFRESH_CONCURRENCY: int = 4
+
+    # FSRS review history: review_events kept per mastery row (older events
+    # are trimmed, see UserMastery.review_count; 0 keeps everything)
+    REVIEW_HISTORY_MAX_EVENTS: int = 100
+
+    # In-process graph topology cache (number of graphs kept)
+    GRAPH_TOPOLOGY_CACHE_SIZE: int = 256
+
+    # Streamed graph responses (?stream=true): rows fetched per server-side
+    # cursor round trip, and flushed to the client as one chunk
+    GRAPH_STREAM_BATCH_SIZE: int = 1000
+
+    # Per-(user, graph) mastery snapshots (app/services/mastery_snapshot_cache.py)
+    # Written through on commit by this process; changes made elsewhere (the
+    # worker, other instances) are picked up after the TTL (0 disables)
+    MASTERY_SNAPSHOT_TTL_SECONDS: float = 30.0
+    MASTERY_SNAPSHOT_CACHE_SIZE: int = 5000
+
+    # Shared graph content cache (app/services/graph_content_cache.py)
+    # Serialized, user-independent parts of public/template graph content and
+    # visualization responses, keyed by content_version. The local tier is
+    # bounded by payload bytes per process (0 disables); GRAPH_CONTENT_CACHE_REDIS
+    # also shares entries through Redis for GRAPH_CONTENT_CACHE_REDIS_TTL_SECONDS
+    GRAPH_CONTENT_CACHE_BYTES: int = 64 * 1024 * 1024
+    GRAPH_CONTENT_CACHE_REDIS: bool = False
+    GRAPH_CONTENT_CACHE_REDIS_TTL_SECONDS: int = 3600
+
+    # Auth caches (app/services/auth_cache.py)
+    # Users are cached per process for USER_CACHE_TTL_SECONDS (0 disables);
+    # USER_CACHE_REDIS also shares them through Redis. Verified JWT payloads
+    # are kept until the token expires.
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_REDIS: bool = False
+    JWT_CACHE_SIZE: int = 10000
+
+    # Prerequisite closure: ancestors further away than this are not indexed
+    # (implicit review probability 0.5**depth, 0.5**8 < 0.4%)
+    PREREQUISITE_CLOSURE_MAX_DEPTH: int = 8
+
     # Pipeline storage paths
     PIPELINE_STORAGE_PATH: str = Field(default="temp/pipeline_storage")
     PIPELINE_RESULTS_PATH: str = Field(default="temp/results")
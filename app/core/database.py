@@ -2,7 +2,9 @@ import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from uuid import uuid4
 
+from redis.asyncio import Redis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -12,6 +14,7 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.core.config import Settings, settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool
 from app.models.base import Base
 
 logger = logging.getLogger(__name__)
@@ -22,12 +25,16 @@ class DatabaseManager:
         self.settings = settings
         self._sql_engine: AsyncEngine | None = None
         self._session_local = None
+        self._redis_client: Redis | None = None
 
     # ==================== PostgreSQL ====================
     @property
     def sql_engine(self) -> AsyncEngine:
         """
         Lazy initialization of SQL engine.
+
+        Pool sizing comes from the DB_POOL_* settings; DB_PGBOUNCER makes the
+        engine safe behind pgbouncer in transaction mode.
         """
         if self._sql_engine is None:
             self._sql_engine = create_async_engine(
@@ -36,9 +43,50 @@ class DatabaseManager:
                 echo=False,
                 future=True,
                 pool_pre_ping=True,
+                poolclass=InstrumentedAsyncQueuePool,
+                pool_size=self.settings.DB_POOL_SIZE,
+                max_overflow=self.settings.DB_MAX_OVERFLOW,
+                pool_timeout=self.settings.DB_POOL_TIMEOUT,
+                pool_recycle=self.settings.DB_POOL_RECYCLE,
+                connect_args=self._connect_args(),
             )
         return self._sql_engine
 
+    def _connect_args(self) -> dict:
+        """
+        asyncpg connect() arguments.
+
+        pgbouncer in transaction mode hands each transaction to any server
+        connection, so prepared statements must be neither cached nor
+        reused by name across transactions.
+        """
+        if not self.settings.DB_PGBOUNCER:
+            return {}
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    def pool_status(self) -> dict:
+        """
+        Connection pool gauges and checkout wait metrics.
+
+        Returns:
+            dict with pool_size, checked_out, checked_in, overflow,
+            max_overflow, checkouts, timeouts, wait_avg_ms, wait_max_ms
+        """
+        pool = self.sql_engine.pool
+        if isinstance(pool, InstrumentedAsyncQueuePool):
+            return pool.status_dict()
+        return {"status": pool.status()}
+
+    async def log_pool_metrics(self, interval: float):
+        """Log pool_status() every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            logger.info(f"📊 SQL pool: {self.pool_status()}")
+
     @property
     def _get_session_factory(self) -> async_sessionmaker[AsyncSession]:
         """
@@ -73,6 +121,18 @@ class DatabaseManager:
             finally:
                 await session.close()
 
+    # ==================== Redis ====================
+    @property
+    def redis_client(self) -> Redis:
+        """
+        Lazy initialization of the Redis client (connection pool).
+        """
+        if self._redis_client is None:
+            self._redis_client = Redis.from_url(
+                self.settings.REDIS_URL, decode_responses=True
+            )
+        return self._redis_client
+
     # ==================== Initialization & Health Checks ====================
     async def _check_sql(self):
         try:
@@ -82,6 +142,13 @@ class DatabaseManager:
         except Exception as e:
             return False, f"❌ SQL database connection failed: {e}"
 
+    async def _check_redis(self):
+        try:
+            await self.redis_client.ping()
+            return True, None
+        except Exception as e:
+            return False, f"❌ Redis connection failed: {e}"
+
     async def initialize(self):
         """
         Initialize all database connections and verify connectivity.
@@ -133,5 +200,14 @@ class DatabaseManager:
             except Exception as e:
                 errors.append(f"SQL close error: {e}")
 
+        # Close Redis connection pool
+        if self._redis_client:
+            try:
+                await self._redis_client.aclose()
+                self._redis_client = None
+                logger.info("✅ Redis client closed")
+            except Exception as e:
+                errors.append(f"Redis close error: {e}")
+
 
 db_manager = DatabaseManager(settings)
@@ -11,8 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.database import db_manager
 from app.crud.knowledge_graph import get_graph_by_id
-from app.crud.user import get_user_by_id
 from app.models.user import User
+from app.services.auth_cache import token_cache, user_cache
 from app.worker.config import WorkerContext
 
 logger = logging.getLogger(__name__)
@@ -29,12 +29,17 @@ def _decode_jwt_token(token: str) -> dict | None:
     """
     Decode and validate a JWT token.
 
+    Verified payloads are memoized until the token expires (token_cache),
+    so repeated requests with the same token skip signature verification.
+
     Args:
         token: JWT access token string
 
     Returns:
         dict: JWT payload if valid, None if invalid
     """
+    if payload := token_cache.get(token):
+        return payload
     try:
         payload = jwt.decode(
             token,
@@ -42,16 +47,18 @@ def _decode_jwt_token(token: str) -> dict | None:
             algorithms=[settings.ALGORITHM],
             audience="authenticated",
         )
-        return payload
     except JWTError:
         return None
+    token_cache.set(token, payload)
+    return payload
 
 
 async def _get_user_from_payload(
     db: AsyncSession, payload: dict
 ) -> tuple[User | None, str | None]:
     """
-    Extract user from JWT payload and fetch from database.
+    Extract user from JWT payload and fetch it (through user_cache, so
+    usually without a database round trip).
 
     Args:
         db: Database session
@@ -69,7 +76,7 @@ async def _get_user_from_payload(
     except ValueError:
         return None, "Invalid UUID format"
 
-    user = await get_user_by_id(db=db, user_id=user_uuid)
+    user = await user_cache.get_user(db, user_uuid)
     if user is None:
         return None, f"User not found in database: {user_id_str}"
 
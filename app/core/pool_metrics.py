@@ -0,0 +1,75 @@
+"""
+Connection pool metrics.
+
+InstrumentedAsyncQueuePool is SQLAlchemy's default async pool plus counters
+for how long requests wait for a connection. DatabaseManager.pool_status()
+combines them with the pool's own gauges (size, checked out, overflow); the
+numbers are served by GET /health/pool and, with
+settings.DB_POOL_METRICS_LOG_INTERVAL > 0, logged periodically.
+
+Waiting time is the time spent in the pool's checkout (including opening a
+new connection), so a growing avg/max wait or any timeouts mean the pool
+(or the database's connection limit) is the bottleneck.
+"""
+
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolMetrics:
+    """Cumulative checkout counters of one pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total_seconds: float = 0.0
+    wait_max_seconds: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total_seconds += seconds
+        self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": (
+                1000 * self.wait_total_seconds / self.checkouts
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_max_ms": 1000 * self.wait_max_seconds,
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def status_dict(self) -> dict:
+        """Current gauges plus cumulative wait metrics."""
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            **self.metrics.as_dict(),
+        }
@@ -1,8 +1,12 @@
+from collections.abc import AsyncIterator, Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.knowledge_graph import bump_graph_content_version
+from app.domain.mastery_snapshot import MasterySnapshot
 from app.models.knowledge_node import KnowledgeNode, Prerequisite
 from app.models.user import UserMastery
 from app.schemas.knowledge_graph import (
@@ -16,6 +20,7 @@ async def get_graph_visualization(
     db_session: AsyncSession,
     graph_id: UUID,
     user_id: UUID,
+    snapshot: MasterySnapshot | None = None,
 ):
     """
     Get visualization data for a knowledge graph with user mastery scores.
@@ -27,36 +32,50 @@ async def get_graph_visualization(
         db_session: Database session
         graph_id: Knowledge graph UUID
         user_id: User UUID for fetching mastery scores
+        snapshot: The user's cached mastery snapshot for this graph; when
+            given, scores come from it instead of a join on user_mastery
 
     Returns:
         GraphVisualization with nodes and edges
     """
-    # Fetch all nodes with user mastery scores (LEFT JOIN to get default 0.1 for no mastery)
-    nodes_stmt = (
-        select(
-            KnowledgeNode.id,
-            KnowledgeNode.node_name,
-            KnowledgeNode.description,
-            func.coalesce(UserMastery.cached_retrievability, 0.1).label(
-                "mastery_score"
-            ),
+    node_columns = (
+        KnowledgeNode.id,
+        KnowledgeNode.node_name,
+        KnowledgeNode.description,
+    )
+    if snapshot is not None:
+        nodes_stmt = (
+            select(*node_columns)
+            .where(KnowledgeNode.graph_id == graph_id)
+            .order_by(KnowledgeNode.id)
         )
-        .outerjoin(
-            UserMastery,
-            (UserMastery.node_id == KnowledgeNode.id)
-            & (UserMastery.user_id == user_id)
-            & (UserMastery.graph_id == graph_id),
+    else:
+        # Fetch all nodes with user mastery scores (LEFT JOIN to get default 0.1 for no mastery)
+        nodes_stmt = (
+            select(
+                *node_columns,
+                func.coalesce(UserMastery.cached_retrievability, 0.1).label(
+                    "mastery_score"
+                ),
+            )
+            .outerjoin(
+                UserMastery,
+                (UserMastery.node_id == KnowledgeNode.id)
+                & (UserMastery.user_id == user_id)
+                & (UserMastery.graph_id == graph_id),
+            )
+            .where(KnowledgeNode.graph_id == graph_id)
+            .order_by(KnowledgeNode.id)
         )
-        .where(KnowledgeNode.graph_id == graph_id)
-    )
     nodes_result = await db_session.execute(nodes_stmt)
     nodes_rows = nodes_result.all()
 
     # Fetch all prerequisite edges
-    prereq_stmt = select(
-        Prerequisite.from_node_id,
-        Prerequisite.to_node_id,
-    ).where(Prerequisite.graph_id == graph_id)
+    prereq_stmt = (
+        select(Prerequisite.from_node_id, Prerequisite.to_node_id)
+        .where(Prerequisite.graph_id == graph_id)
+        .order_by(Prerequisite.from_node_id, Prerequisite.to_node_id)
+    )
     prereq_result = await db_session.execute(prereq_stmt)
     prereq_rows = prereq_result.all()
 
@@ -66,7 +85,11 @@ async def get_graph_visualization(
             id=row.id,
             name=row.node_name,
             description=row.description,
-            mastery_score=row.mastery_score,
+            mastery_score=(
+                row.mastery_score
+                if snapshot is None
+                else snapshot.cached_retrievability(row.id, default=0.1)
+            ),
         )
         for row in nodes_rows
     ]
@@ -86,6 +109,95 @@ async def get_graph_visualization(
     return GraphVisualization(nodes=nodes, edges=edges)
 
 
+# ==================== Streaming (server-side cursors) ====================
+
+
+async def _stream_partitions(
+    db_session: AsyncSession, stmt: Select, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Run `stmt` on a server-side cursor, yielding `batch_size` rows at a time."""
+    result = await db_session.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+
+def stream_visualization_nodes(
+    db_session: AsyncSession, graph_id: UUID, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the nodes of a graph for visualization, in batches.
+
+    Only the columns the visualization needs are selected; mastery scores
+    are looked up by the caller (see MasterySnapshot).
+
+    Args:
+        db_session: Database session
+        graph_id: Knowledge graph UUID
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Batches of rows of (id, node_name, description)
+    """
+    stmt = (
+        select(KnowledgeNode.id, KnowledgeNode.node_name, KnowledgeNode.description)
+        .where(KnowledgeNode.graph_id == graph_id)
+        .order_by(KnowledgeNode.id)
+    )
+    return _stream_partitions(db_session, stmt, batch_size)
+
+
+def stream_content_nodes(
+    db_session: AsyncSession, graph_id: UUID, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the nodes of a graph with the GraphContentNode columns, in batches.
+
+    Args:
+        db_session: Database session
+        graph_id: Knowledge graph UUID
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Batches of rows of (id, node_id_str, node_name, description, level,
+        dependents_count)
+    """
+    stmt = (
+        select(
+            KnowledgeNode.id,
+            KnowledgeNode.node_id_str,
+            KnowledgeNode.node_name,
+            KnowledgeNode.description,
+            KnowledgeNode.level,
+            KnowledgeNode.dependents_count,
+        )
+        .where(KnowledgeNode.graph_id == graph_id)
+        .order_by(KnowledgeNode.id)
+    )
+    return _stream_partitions(db_session, stmt, batch_size)
+
+
+def stream_prerequisites(
+    db_session: AsyncSession, graph_id: UUID, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the prerequisite edges of a graph, in batches.
+
+    Args:
+        db_session: Database session
+        graph_id: Knowledge graph UUID
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Batches of rows of (from_node_id, to_node_id, weight)
+    """
+    stmt = (
+        select(Prerequisite.from_node_id, Prerequisite.to_node_id, Prerequisite.weight)
+        .where(Prerequisite.graph_id == graph_id)
+        .order_by(Prerequisite.from_node_id, Prerequisite.to_node_id)
+    )
+    return _stream_partitions(db_session, stmt, batch_size)
+
+
 # ==================== Topology Analysis Support ====================
 
 
@@ -159,6 +271,8 @@ async def batch_update_node_topology(
         result = await db_session.execute(update_stmt)
         nodes_updated += result.rowcount
 
+    if nodes_updated:
+        await bump_graph_content_version(db_session, graph_id)
     await db_session.commit()  # FIXME: shouldn't commit here
     return nodes_updated
 
@@ -183,6 +297,8 @@ async def reset_node_topology(db_session: AsyncSession, graph_id: UUID) -> int:
     )
 
     result = await db_session.execute(update_stmt)
+    if result.rowcount:
+        await bump_graph_content_version(db_session, graph_id)
     await db_session.commit()  # FIXME: shouldn't commit here
 
     return result.rowcount
@@ -0,0 +1,82 @@
+"""
+Per-request identity cache.
+
+AsyncSession.get already answers primary-key lookups from the session's
+identity map, but the map only holds weak references: a row loaded by one
+helper is usually garbage-collected before the next helper asks for it.
+This module keeps strong references on the session (session.info) so that
+rows loaded once in a request stay available to every later lookup on the
+same session. Sessions are per request, so the cache dies with the request.
+
+Usage:
+    node = await get_cached(db_session, KnowledgeNode, node_id)
+    remember(db_session, question, node)   # after a custom (e.g. joined) query
+    mastery = peek(db_session, UserMastery, pk)   # never queries
+"""
+
+from typing import Any, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
+
+T = TypeVar("T")
+
+_CACHE_KEY = "identity_cache"
+
+
+def remember(db_session: AsyncSession, *instances: Any) -> None:
+    """
+    Keep loaded ORM instances alive for the rest of the session.
+
+    Args:
+        db_session: Database session
+        instances: ORM instances (None values are ignored)
+    """
+    pinned = db_session.info.setdefault(_CACHE_KEY, {})
+    for instance in instances:
+        if instance is not None:
+            pinned[id(instance)] = instance
+
+
+async def get_cached(db_session: AsyncSession, model: type[T], pk: Any) -> T | None:
+    """
+    Get a row by primary key, without a round trip if already loaded.
+
+    A cached instance with expired attributes (e.g. onupdate columns after
+    a bulk UPDATE statement) is refreshed, as a plain SELECT would have done.
+
+    Args:
+        db_session: Database session
+        model: ORM class
+        pk: Primary key value (a tuple for composite keys)
+
+    Returns:
+        The instance or None if not found
+    """
+    instance = await db_session.get(model, pk)
+    if instance is not None and inspect(instance).expired_attributes:
+        await db_session.refresh(instance)
+    remember(db_session, instance)
+    return instance
+
+
+def peek(db_session: AsyncSession, model: type[T], pk: Any) -> T | None:
+    """
+    Get a row by primary key only if it is already loaded (no round trip).
+
+    Unlike get_cached, a miss does not query: the caller decides how to
+    load or create the row (e.g. with an upsert).
+
+    Args:
+        db_session: Database session
+        model: ORM class
+        pk: Primary key value (a tuple for composite keys)
+
+    Returns:
+        The loaded, unexpired instance or None
+    """
+    instance = db_session.identity_map.get(identity_key(model, pk))
+    if instance is None or inspect(instance).expired_attributes:
+        return None
+    return instance
@@ -1,12 +1,18 @@
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import event, func, null, select, text, update
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 from app.models.enrollment import GraphEnrollment
 from app.models.knowledge_graph import KnowledgeGraph
-from app.models.knowledge_node import KnowledgeNode
+from app.models.knowledge_node import KnowledgeNode, Prerequisite
+from app.models.question import Question
 
 # ==================== Knowledge Graph CRUD ====================
 
@@ -26,6 +32,143 @@ async def get_graph_by_owner_and_slug(
     return result.scalar_one_or_none()
 
 
+async def get_graph_structure_version(
+    db_session: AsyncSession,
+    graph_id: UUID,
+) -> int | None:
+    """
+    Get the structure version of a graph (None if the graph does not exist)
+    """
+    stmt = select(KnowledgeGraph.structure_version).where(KnowledgeGraph.id == graph_id)
+    result = await db_session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def bump_graph_structure_version(
+    db_session: AsyncSession,
+    graph_id: UUID,
+    nodes: int = 0,
+    prerequisites: int = 0,
+) -> None:
+    """
+    Increment the structure version (and content version) of a graph.
+
+    Call this in the same transaction as any node/prerequisite insert so
+    topology caches keyed by version never serve a stale structure.
+    Statement-level (Core) inserts pass their row counts so node_count /
+    prerequisite_count move in the same UPDATE; ORM inserts are counted
+    at flush. Does NOT commit.
+    """
+    await _update_graph_row(
+        db_session,
+        graph_id,
+        structure_version=KnowledgeGraph.structure_version + 1,
+        node_count=KnowledgeGraph.node_count + nodes,
+        prerequisite_count=KnowledgeGraph.prerequisite_count + prerequisites,
+    )
+
+
+async def bump_graph_content_version(
+    db_session: AsyncSession,
+    graph_id: UUID,
+    questions: int = 0,
+) -> None:
+    """
+    Increment the content version of a graph.
+
+    Call this in the same transaction as any write that changes what the
+    content/visualization endpoints return without changing the structure
+    (questions, node topology, nodes without edges), so clients holding an
+    old ETag get the new representation. Statement-level (Core) question
+    inserts pass their row count for question_count. Does NOT commit.
+    """
+    await _update_graph_row(
+        db_session,
+        graph_id,
+        question_count=KnowledgeGraph.question_count + questions,
+    )
+
+
+async def _update_graph_row(
+    db_session: AsyncSession, graph_id: UUID, **values: Any
+) -> None:
+    """Bump the content version with `values` and sync a loaded graph."""
+    values.update(
+        content_version=KnowledgeGraph.content_version + 1,
+        content_updated_at=func.now(),
+    )
+    stmt = (
+        update(KnowledgeGraph)
+        .where(KnowledgeGraph.id == graph_id)
+        .values(values)
+        .returning(*_returning(values))
+        .execution_options(synchronize_session=False)
+    )
+    result = await db_session.execute(stmt)
+    _sync_loaded_graph(db_session.sync_session, graph_id, result.mappings().first())
+
+
+def _returning(values: dict[str, Any]) -> list:
+    # updated_at changes too (onupdate)
+    return [getattr(KnowledgeGraph, name) for name in values] + [
+        KnowledgeGraph.updated_at
+    ]
+
+
+def _sync_loaded_graph(
+    session: Session, graph_id: UUID, row: RowMapping | None
+) -> None:
+    """
+    Copy RETURNING values onto the session's instance of the graph, if any.
+
+    Counter and version columns are updated with SQL expressions; instead
+    of expiring them (which would need a lazy load), set what the database
+    returned.
+    """
+    graph = session.identity_map.get(identity_key(KnowledgeGraph, graph_id))
+    if graph is None or row is None:
+        return
+    for name, value in row.items():
+        set_committed_value(graph, name, value)
+
+
+# ==================== Denormalized counters (ORM inserts) ====================
+# Rows added through the ORM (create_knowledge_node, create_prerequisite,
+# create_question, test fixtures) are counted at flush, in the flushing
+# transaction, so the counters commit or roll back with the rows.
+
+_COUNTERS = {
+    KnowledgeNode: "node_count",
+    Prerequisite: "prerequisite_count",
+    Question: "question_count",
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_graph_rows(session: Session, flush_context) -> None:
+    deltas: dict[UUID, dict[str, int]] = {}
+    for sign, objects in ((1, session.new), (-1, session.deleted)):
+        for obj in objects:
+            counter = _COUNTERS.get(type(obj))
+            if counter is not None:
+                graph_deltas = deltas.setdefault(obj.graph_id, {})
+                graph_deltas[counter] = graph_deltas.get(counter, 0) + sign
+
+    for graph_id, graph_deltas in deltas.items():
+        values = {
+            name: getattr(KnowledgeGraph, name) + delta
+            for name, delta in graph_deltas.items()
+        }
+        stmt = (
+            update(KnowledgeGraph)
+            .where(KnowledgeGraph.id == graph_id)
+            .values(values)
+            .returning(*_returning(values))
+        )
+        result = session.connection().execute(stmt)
+        _sync_loaded_graph(session, graph_id, result.mappings().first())
+
+
 async def get_graph_by_id(
     db_session: AsyncSession,
     graph_id: UUID,
@@ -77,35 +220,19 @@ async def get_graphs_by_owner(
     Returns:
         List of dicts containing KnowledgeGraph data with node_count field
     """
-    # Subquery to count nodes per graph
-    node_count_subquery = (
-        select(KnowledgeNode.graph_id, func.count(KnowledgeNode.id).label("node_count"))
-        .group_by(KnowledgeNode.graph_id)
-        .subquery()
-    )
-
-    # Main query with left join to include graphs even if they have 0 nodes
+    # node_count is maintained on the graph row (no per-listing COUNT)
     stmt = (
-        select(
-            KnowledgeGraph,
-            func.coalesce(node_count_subquery.c.node_count, 0).label("node_count"),
-        )
-        .outerjoin(
-            node_count_subquery, KnowledgeGraph.id == node_count_subquery.c.graph_id
-        )
+        select(KnowledgeGraph)
         .where(KnowledgeGraph.owner_id == owner_id)
         .order_by(KnowledgeGraph.created_at.desc())
     )
 
     result = await db_session.execute(stmt)
-    rows = result.all()
+    graphs = result.scalars().all()
 
     # Convert to list of dicts with node_count
     graphs_with_counts = []
-    for row in rows:
-        graph = row[0]
-        node_count = row[1]
-
+    for graph in graphs:
         graph_dict = {
             "id": graph.id,
             "name": graph.name,
@@ -116,7 +243,7 @@ async def get_graphs_by_owner(
             "is_template": graph.is_template,
             "owner_id": graph.owner_id,
             "enrollment_count": graph.enrollment_count,
-            "node_count": node_count,
+            "node_count": graph.node_count,
             "is_enrolled": None,
             "created_at": graph.created_at,
         }
@@ -125,6 +252,54 @@ async def get_graphs_by_owner(
     return graphs_with_counts
 
 
+async def get_template_graph_versions(
+    db_session: AsyncSession,
+    user_id: UUID | None = None,
+) -> list[tuple[UUID, int, datetime, int, bool | None]]:
+    """
+    Get the columns that determine the template listing.
+
+    Cheap enough to run on every poll of GET /graphs/templates: the listing
+    is only rebuilt (get_all_template_graphs) when these rows change.
+
+    Args:
+        db_session: Database session
+        user_id: Optional user ID to check enrollment status
+
+    Returns:
+        List of (id, content_version, last_modified, enrollment_count,
+        is_enrolled) tuples, in get_all_template_graphs order
+    """
+    is_enrolled = (
+        select(GraphEnrollment.graph_id)
+        .where(
+            GraphEnrollment.user_id == user_id,
+            GraphEnrollment.graph_id == KnowledgeGraph.id,
+        )
+        .exists()
+        if user_id
+        else null()
+    )
+    stmt = (
+        select(
+            KnowledgeGraph.id,
+            KnowledgeGraph.content_version,
+            # GREATEST ignores NULLs (updated_at is NULL until the first update)
+            func.greatest(
+                KnowledgeGraph.content_updated_at,
+                KnowledgeGraph.updated_at,
+                KnowledgeGraph.created_at,
+            ),
+            KnowledgeGraph.enrollment_count,
+            is_enrolled,
+        )
+        .where(KnowledgeGraph.is_template)
+        .order_by(KnowledgeGraph.created_at.desc())
+    )
+    result = await db_session.execute(stmt)
+    return [tuple(row) for row in result.all()]
+
+
 async def get_all_template_graphs(
     db_session: AsyncSession,
     user_id: UUID | None = None,
@@ -144,28 +319,15 @@ async def get_all_template_graphs(
     Returns:
         List of dicts containing KnowledgeGraph data with node_count and is_enrolled fields
     """
-    # Subquery to count nodes per graph
-    node_count_subquery = (
-        select(KnowledgeNode.graph_id, func.count(KnowledgeNode.id).label("node_count"))
-        .group_by(KnowledgeNode.graph_id)
-        .subquery()
-    )
-
-    # Main query with left join to include graphs even if they have 0 nodes
+    # node_count is maintained on the graph row (no per-listing COUNT)
     stmt = (
-        select(
-            KnowledgeGraph,
-            func.coalesce(node_count_subquery.c.node_count, 0).label("node_count"),
-        )
-        .outerjoin(
-            node_count_subquery, KnowledgeGraph.id == node_count_subquery.c.graph_id
-        )
+        select(KnowledgeGraph)
         .where(KnowledgeGraph.is_template)
         .order_by(KnowledgeGraph.created_at.desc())
     )
 
     result = await db_session.execute(stmt)
-    rows = result.all()
+    graphs = result.scalars().all()
 
     # If user_id provided, get all enrollments for this user
     enrollment_graph_ids = set()
@@ -178,10 +340,7 @@ async def get_all_template_graphs(
 
     # Convert to list of dicts with node_count and is_enrolled
     graphs_with_counts = []
-    for row in rows:
-        graph = row[0]
-        node_count = row[1]
-
+    for graph in graphs:
         # Create a dict from the graph object
         graph_dict = {
             "id": graph.id,
@@ -193,10 +352,91 @@ async def get_all_template_graphs(
             "is_template": graph.is_template,
             "owner_id": graph.owner_id,
             "enrollment_count": graph.enrollment_count,
-            "node_count": node_count,
+            "node_count": graph.node_count,
             "is_enrolled": graph.id in enrollment_graph_ids if user_id else None,
             "created_at": graph.created_at,
         }
         graphs_with_counts.append(graph_dict)
 
     return graphs_with_counts
+
+
+# ==================== Counter reconciliation ====================
+
+
+async def get_graph_ids_page(
+    db_session: AsyncSession,
+    batch_size: int,
+    after: UUID | None = None,
+) -> list[UUID]:
+    """
+    Keyset-paginate all graph ids.
+
+    Args:
+        db_session: Database session
+        batch_size: Maximum number of ids to return
+        after: Last id of the previous page (None for the first page)
+
+    Returns:
+        Graph ids in primary key order
+    """
+    stmt = select(KnowledgeGraph.id).order_by(KnowledgeGraph.id).limit(batch_size)
+    if after is not None:
+        stmt = stmt.where(KnowledgeGraph.id > after)
+    result = await db_session.execute(stmt)
+    return list(result.scalars().all())
+
+
+_RECONCILE_COUNTERS_SQL = text(
+    """
+    WITH actual AS (
+        SELECT
+            g.id,
+            (SELECT count(*) FROM knowledge_nodes n WHERE n.graph_id = g.id) AS nodes,
+            (SELECT count(*) FROM questions q WHERE q.graph_id = g.id) AS questions,
+            (
+                SELECT count(*) FROM prerequisites p WHERE p.graph_id = g.id
+            ) AS prerequisites
+        FROM knowledge_graphs g
+        WHERE g.id = ANY(:graph_ids)
+    )
+    UPDATE knowledge_graphs g
+    SET node_count = a.nodes,
+        question_count = a.questions,
+        prerequisite_count = a.prerequisites,
+        content_version = g.content_version + 1,
+        content_updated_at = now()
+    FROM actual a
+    WHERE g.id = a.id
+      AND (g.node_count, g.question_count, g.prerequisite_count)
+          IS DISTINCT FROM (a.nodes, a.questions, a.prerequisites)
+    RETURNING g.id
+    """
+)
+
+
+async def reconcile_graph_counters(
+    db_session: AsyncSession, graph_ids: list[UUID]
+) -> list[UUID]:
+    """
+    Recount nodes, questions and prerequisites of graphs and fix drifted rows.
+
+    The graph rows are locked first, so writers that already inserted rows
+    have committed (and are counted) and later writers increment the fixed
+    value. Fixed graphs also get a new content version (node_count is part
+    of the content response). Does NOT commit.
+
+    Returns:
+        Ids of the graphs whose counters were corrected
+    """
+    if not graph_ids:
+        return []
+    await db_session.execute(
+        select(KnowledgeGraph.id)
+        .where(KnowledgeGraph.id.in_(graph_ids))
+        .with_for_update()
+    )
+    result = await db_session.execute(
+        _RECONCILE_COUNTERS_SQL, {"graph_ids": graph_ids}
+    )
+    return list(result.scalars().all())
@@ -6,6 +6,11 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.crud.identity_cache import get_cached
+from app.crud.knowledge_graph import (
+    bump_graph_content_version,
+    bump_graph_structure_version,
+)
 from app.models.knowledge_node import KnowledgeNode
 from app.schemas.knowledge_node import KnowledgeNodeWithEmbedding
 
@@ -14,10 +19,8 @@ async def get_node_by_id(
     db_session: AsyncSession,
     node_id: UUID,
 ) -> KnowledgeNode | None:
-    """Get a knowledge node by its UUID."""
-    stmt = select(KnowledgeNode).where(KnowledgeNode.id == node_id)
-    result = await db_session.execute(stmt)
-    return result.scalar_one_or_none()
+    """Get a knowledge node by its UUID (per-request identity cache first)."""
+    return await get_cached(db_session, KnowledgeNode, node_id)
 
 
 async def create_knowledge_node(
@@ -35,6 +38,7 @@ async def create_knowledge_node(
         description=description,
     )
     db_session.add(node)
+    await bump_graph_content_version(db_session, graph_id)
     await db_session.flush()
     await db_session.refresh(node)
     return node
@@ -57,8 +61,12 @@ async def get_nodes_by_graph(
     db_session: AsyncSession,
     graph_id: UUID,
 ) -> list[KnowledgeNode]:
-    """Get all knowledge nodes in a graph."""
-    stmt = select(KnowledgeNode).where(KnowledgeNode.graph_id == graph_id)
+    """Get all knowledge nodes in a graph, ordered by id."""
+    stmt = (
+        select(KnowledgeNode)
+        .where(KnowledgeNode.graph_id == graph_id)
+        .order_by(KnowledgeNode.id)
+    )
     result = await db_session.execute(stmt)
     return list(result.scalars().all())
 
@@ -157,5 +165,8 @@ async def bulk_insert_nodes_tx(
     )
 
     result = await db_session.execute(stmt)
+    inserted = result.rowcount or 0
+    if inserted:
+        await bump_graph_structure_version(db_session, graph_id, nodes=inserted)
     await db_session.flush()
-    return result.rowcount or 0
+    return inserted
@@ -2,18 +2,37 @@
 CRUD operations for User Mastery tracking.
 
 This module provides data access layer for mastery-related operations:
-- Getting/creating mastery records
-- Querying prerequisites for propagation
+- Getting/creating mastery records (race-free upsert, one statement)
+- Querying prerequisites for propagation (recursive CTE and closure table)
 - Batch queries for efficient graph traversal
 """
 
+from collections.abc import Sequence
 from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import Integer, func, literal_column, select
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Integer,
+    String,
+    and_,
+    bindparam,
+    func,
+    literal_column,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.knowledge_node import Prerequisite
+from app.crud.identity_cache import get_cached, peek, remember
+from app.models.knowledge_node import Prerequisite, PrerequisiteClosure
 from app.models.user import UserMastery
 
 # ==================== UserMastery CRUD ====================
@@ -25,6 +44,8 @@ async def get_mastery(
     """
     Get a user's mastery record for a specific node.
 
+    Served from the per-request identity cache if already loaded.
+
     Args:
         db_session: Database session
         user_id: User UUID
@@ -34,13 +55,7 @@ async def get_mastery(
     Returns:
         UserMastery record or None if not found
     """
-    stmt = select(UserMastery).where(
-        UserMastery.user_id == user_id,
-        UserMastery.graph_id == graph_id,
-        UserMastery.node_id == node_id,
-    )
-    result = await db_session.execute(stmt)
-    return result.scalar_one_or_none()
+    return await get_cached(db_session, UserMastery, (user_id, graph_id, node_id))
 
 
 async def create_mastery(
@@ -49,6 +64,7 @@ async def create_mastery(
     graph_id: UUID,
     node_id: UUID,
     cached_retrievability: float,
+    flush: bool = True,
 ) -> UserMastery:
     """
     Create a new mastery record for a user-node pair.
@@ -62,6 +78,9 @@ async def create_mastery(
         graph_id: Knowledge graph UUID
         node_id: Knowledge node UUID
         cached_retrievability: Initial cached R(t) value (calculated by FSRS)
+        flush: Write the row now. With False the row stays pending, so a
+            caller that updates it before its own flush issues one INSERT
+            instead of an INSERT followed by an UPDATE
 
     Returns:
         Newly created UserMastery record
@@ -74,10 +93,83 @@ async def create_mastery(
         last_updated=datetime.now(UTC),
     )
     db_session.add(mastery)
-    await db_session.flush()
+    if flush:
+        await db_session.flush()
     return mastery
 
 
+def get_loaded_mastery(
+    db_session: AsyncSession, user_id: UUID, graph_id: UUID, node_id: UUID
+) -> UserMastery | None:
+    """
+    Get a mastery record only if this session already loaded it (no query).
+
+    On the answer path GradingService.fetch_and_grade loads the row together
+    with the question; a miss means the row is new or was never loaded, and
+    the caller should go through upsert_masteries.
+
+    Args:
+        db_session: Database session
+        user_id: User UUID
+        graph_id: Knowledge graph UUID
+        node_id: Knowledge node UUID
+
+    Returns:
+        UserMastery record or None if not loaded
+    """
+    return peek(db_session, UserMastery, (user_id, graph_id, node_id))
+
+
+async def upsert_masteries(
+    db_session: AsyncSession,
+    user_id: UUID,
+    rows: Sequence[dict[str, Any]],
+) -> dict[tuple[UUID, UUID], tuple[UserMastery, bool]]:
+    """
+    Create mastery records, or lock and return the ones that already exist.
+
+    One INSERT ... ON CONFLICT DO UPDATE ... RETURNING for all rows: new rows
+    are written with the given values, existing rows are left unchanged (the
+    no-op update only locks them until commit) and returned as loaded. Two
+    concurrent first answers on the same node therefore never hit a
+    primary key violation; the second one waits and gets the first's row.
+
+    Args:
+        db_session: Database session
+        user_id: User UUID
+        rows: Column values per record; each needs graph_id and node_id,
+            and all rows must have the same keys. Duplicate keys not allowed
+
+    Returns:
+        {(graph_id, node_id): (UserMastery, was_created)}
+    """
+    if not rows:
+        return {}
+
+    stmt = (
+        insert(UserMastery)
+        .values([{**row, "user_id": user_id} for row in rows])
+        .on_conflict_do_update(
+            index_elements=[
+                UserMastery.user_id,
+                UserMastery.graph_id,
+                UserMastery.node_id,
+            ],
+            set_={"last_updated": UserMastery.last_updated},
+        )
+        .returning(UserMastery, literal_column("xmax = 0").label("was_created"))
+    )
+    result = await db_session.execute(
+        stmt, execution_options={"populate_existing": True}
+    )
+    masteries = {
+        (mastery.graph_id, mastery.node_id): (mastery, bool(was_created))
+        for mastery, was_created in result.all()
+    }
+    remember(db_session, *(mastery for mastery, _ in masteries.values()))
+    return masteries
+
+
 async def get_or_create_mastery(
     db_session: AsyncSession,
     user_id: UUID,
@@ -89,7 +181,8 @@ async def get_or_create_mastery(
     Get existing mastery record or create a new one.
 
     If creating, uses the provided cached_retrievability (should be calculated
-    by the caller using FSRS).
+    by the caller using FSRS). An already loaded record costs no query,
+    otherwise this is a single race-free upsert (see upsert_masteries).
 
     Args:
         db_session: Database session
@@ -101,15 +194,22 @@ async def get_or_create_mastery(
     Returns:
         Tuple of (mastery_record, was_created)
     """
-    # Try to get existing record
-    if mastery := await get_mastery(db_session, user_id, graph_id, node_id):
+    if mastery := get_loaded_mastery(db_session, user_id, graph_id, node_id):
         return mastery, False
 
-    # Create new record
-    mastery = await create_mastery(
-        db_session, user_id, graph_id, node_id, cached_retrievability
+    masteries = await upsert_masteries(
+        db_session,
+        user_id,
+        [
+            {
+                "graph_id": graph_id,
+                "node_id": node_id,
+                "cached_retrievability": cached_retrievability,
+                "last_updated": datetime.now(UTC),
+            }
+        ],
     )
-    return mastery, True
+    return masteries[(graph_id, node_id)]
 
 
 # ==================== Batch Queries for Performance ====================
@@ -140,6 +240,30 @@ async def get_masteries_by_user_and_graph(
     return list(result.scalars().all())
 
 
+async def get_mastery_snapshot_rows(
+    db_session: AsyncSession, user_id: UUID, graph_id: UUID
+) -> list[Row]:
+    """
+    Get the columns of a MasterySnapshot for all of a user's rows in a graph.
+
+    Args:
+        db_session: Database session
+        user_id: User UUID
+        graph_id: Knowledge graph UUID
+
+    Returns:
+        Rows of (node_id, fsrs_stability, due_date, cached_retrievability)
+    """
+    stmt = select(
+        UserMastery.node_id,
+        UserMastery.fsrs_stability,
+        UserMastery.due_date,
+        UserMastery.cached_retrievability,
+    ).where(UserMastery.user_id == user_id, UserMastery.graph_id == graph_id)
+    result = await db_session.execute(stmt)
+    return list(result.all())
+
+
 async def get_masteries_by_nodes(
     db_session: AsyncSession, user_id: UUID, graph_id: UUID, node_ids: list[UUID]
 ) -> dict[UUID, UserMastery]:
@@ -169,6 +293,33 @@ async def get_masteries_by_nodes(
     return {mastery.node_id: mastery for mastery in result.scalars().all()}
 
 
+async def get_masteries_by_keys(
+    db_session: AsyncSession,
+    user_id: UUID,
+    keys: list[tuple[UUID, UUID]],
+) -> dict[tuple[UUID, UUID], UserMastery]:
+    """
+    Get a user's mastery records for (graph_id, node_id) pairs across graphs.
+
+    Args:
+        db_session: Database session
+        user_id: User UUID
+        keys: List of (graph_id, node_id) pairs
+
+    Returns:
+        A dictionary mapping {(graph_id, node_id): UserMastery object}
+    """
+    if not keys:
+        return {}
+
+    stmt = select(UserMastery).where(
+        UserMastery.user_id == user_id,
+        tuple_(UserMastery.graph_id, UserMastery.node_id).in_(set(keys)),
+    )
+    result = await db_session.execute(stmt)
+    return {(m.graph_id, m.node_id): m for m in result.scalars().all()}
+
+
 async def get_prerequisite_roots_to_bonus(
     db_session: AsyncSession, graph_id: UUID, start_node_id: UUID
 ) -> dict[UUID, int]:
@@ -221,3 +372,243 @@ async def get_prerequisite_roots_to_bonus(
 
     result = await db_session.execute(stmt)
     return {row.node_id: row.min_depth for row in result.all()}
+
+
+async def get_prerequisite_ancestors_with_masteries(
+    db_session: AsyncSession,
+    user_id: UUID,
+    graph_id: UUID,
+    start_node_id: UUID,
+    max_depth: int | None = None,
+) -> dict[UUID, tuple[int, UserMastery | None]]:
+    """
+    Closure-table equivalent of get_prerequisite_roots_to_bonus, fused with
+    the mastery fetch: one indexed lookup on prerequisite_closure, LEFT JOINed
+    to the user's mastery rows.
+
+    Args:
+        db_session: Database session
+        user_id: User UUID
+        graph_id: Knowledge graph UUID
+        start_node_id: The node that was answered correctly
+        max_depth: Optional maximum depth (ancestors beyond
+            settings.PREREQUISITE_CLOSURE_MAX_DEPTH are never indexed)
+
+    Returns:
+        A dict mapping {prerequisite_node_id: (min_depth, UserMastery or None)}
+    """
+    stmt = (
+        select(PrerequisiteClosure.ancestor_id, PrerequisiteClosure.min_depth, UserMastery)
+        .outerjoin(
+            UserMastery,
+            and_(
+                UserMastery.user_id == user_id,
+                UserMastery.graph_id == PrerequisiteClosure.graph_id,
+                UserMastery.node_id == PrerequisiteClosure.ancestor_id,
+            ),
+        )
+        .where(
+            PrerequisiteClosure.graph_id == graph_id,
+            PrerequisiteClosure.descendant_id == start_node_id,
+        )
+        .order_by(PrerequisiteClosure.min_depth, PrerequisiteClosure.ancestor_id)
+    )
+    if max_depth is not None:
+        stmt = stmt.where(PrerequisiteClosure.min_depth <= max_depth)
+
+    result = await db_session.execute(stmt)
+    return {
+        ancestor_id: (depth, mastery) for ancestor_id, depth, mastery in result.all()
+    }
+
+
+# ==================== Bulk Maintenance ====================
+
+MasteryKey = tuple[UUID, UUID, UUID]
+"""Primary key of a UserMastery row: (user_id, graph_id, node_id)."""
+
+
+async def get_mastery_fsrs_page(
+    db_session: AsyncSession, after_key: MasteryKey | None, limit: int
+) -> list[Row]:
+    """
+    Read one keyset-paginated page of the FSRS columns needed to compute R(t).
+
+    Pages are ordered by the primary key and start strictly after `after_key`,
+    so each query is an index range scan regardless of how deep the scan is
+    (no OFFSET). Only the key and FSRS inputs are selected, not full rows.
+
+    Args:
+        db_session: Database session
+        after_key: Last primary key of the previous page, or None for the first
+        limit: Maximum number of rows to return
+
+    Returns:
+        Rows with user_id, graph_id, node_id, fsrs_stability, last_review
+    """
+    pk = tuple_(UserMastery.user_id, UserMastery.graph_id, UserMastery.node_id)
+    stmt = select(
+        UserMastery.user_id,
+        UserMastery.graph_id,
+        UserMastery.node_id,
+        UserMastery.fsrs_stability,
+        UserMastery.last_review,
+    ).order_by(UserMastery.user_id, UserMastery.graph_id, UserMastery.node_id)
+    if after_key is not None:
+        stmt = stmt.where(pk > tuple_(*after_key))
+
+    result = await db_session.execute(stmt.limit(limit))
+    return list(result.all())
+
+
+_BULK_UPDATE_RETRIEVABILITY = text(
+    """
+    UPDATE user_mastery AS um
+    SET cached_retrievability = v.retrievability,
+        last_updated = :now
+    FROM unnest(:user_ids, :graph_ids, :node_ids, :retrievabilities)
+        AS v(user_id, graph_id, node_id, retrievability)
+    WHERE um.user_id = v.user_id
+      AND um.graph_id = v.graph_id
+      AND um.node_id = v.node_id
+      AND um.cached_retrievability IS DISTINCT FROM v.retrievability
+    """
+).bindparams(
+    bindparam("user_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("graph_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("node_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("retrievabilities", type_=ARRAY(Float)),
+)
+
+
+async def bulk_update_cached_retrievability(
+    db_session: AsyncSession,
+    keys: list[MasteryKey],
+    retrievabilities: list[float],
+    now: datetime,
+) -> int:
+    """
+    Write cached_retrievability for many rows with one set-based UPDATE.
+
+    The new values are shipped as parallel arrays and joined via unnest(),
+    so a whole batch costs a single statement. Rows whose value did not
+    change are skipped.
+
+    Note: Does NOT commit; the caller owns the transaction.
+
+    Args:
+        db_session: Database session
+        keys: (user_id, graph_id, node_id) per row
+        retrievabilities: New R(t) per row, aligned with `keys`
+        now: Timestamp the new values were computed at (stored as last_updated)
+
+    Returns:
+        Number of rows actually updated
+    """
+    if not keys:
+        return 0
+
+    user_ids, graph_ids, node_ids = (list(col) for col in zip(*keys, strict=True))
+    result = await db_session.execute(
+        _BULK_UPDATE_RETRIEVABILITY,
+        {
+            "user_ids": user_ids,
+            "graph_ids": graph_ids,
+            "node_ids": node_ids,
+            "retrievabilities": retrievabilities,
+            "now": now,
+        },
+    )
+    return result.rowcount
+
+
+_BULK_APPLY_IMPLICIT_REVIEWS = text(
+    """
+    UPDATE user_mastery AS um
+    SET cached_retrievability = v.retrievability,
+        fsrs_state = v.fsrs_state,
+        fsrs_stability = v.stability,
+        fsrs_difficulty = v.difficulty,
+        due_date = v.due_date,
+        last_review = v.reviewed_at,
+        last_updated = v.reviewed_at
+    FROM unnest(
+        :node_ids,
+        :retrievabilities,
+        :fsrs_states,
+        :stabilities,
+        :difficulties,
+        :due_dates,
+        :reviewed_ats
+    ) AS v(
+        node_id,
+        retrievability,
+        fsrs_state,
+        stability,
+        difficulty,
+        due_date,
+        reviewed_at
+    )
+    WHERE um.user_id = :user_id
+      AND um.graph_id = :graph_id
+      AND um.node_id = v.node_id
+    """
+).bindparams(
+    bindparam("user_id", type_=PG_UUID(as_uuid=True)),
+    bindparam("graph_id", type_=PG_UUID(as_uuid=True)),
+    bindparam("node_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("retrievabilities", type_=ARRAY(Float)),
+    bindparam("fsrs_states", type_=ARRAY(String)),
+    bindparam("stabilities", type_=ARRAY(Float)),
+    bindparam("difficulties", type_=ARRAY(Float)),
+    bindparam("due_dates", type_=ARRAY(DateTime(timezone=True))),
+    bindparam("reviewed_ats", type_=ARRAY(DateTime(timezone=True))),
+)
+
+
+async def bulk_apply_implicit_reviews(
+    db_session: AsyncSession,
+    user_id: UUID,
+    graph_id: UUID,
+    node_ids: list[UUID],
+    updates: list[dict[str, Any]],
+) -> int:
+    """
+    Write implicit review results for many rows with one set-based UPDATE.
+
+    Propagation reviews every triggered ancestor of the answered node; the
+    results (MasteryLogic.calculate_implicit_review_updates) are shipped as
+    column arrays and joined via unnest(), so a prerequisite chain of any
+    length costs a single statement instead of one UPDATE per ancestor.
+
+    Note: Does NOT commit, and does not touch loaded ORM instances; the
+    caller keeps them in sync.
+
+    Args:
+        db_session: Database session
+        user_id: User UUID
+        graph_id: Knowledge graph UUID
+        node_ids: Node UUID per row
+        updates: Implicit review update per row, aligned with `node_ids`
+
+    Returns:
+        Number of rows updated
+    """
+    if not node_ids:
+        return 0
+
+    result = await db_session.execute(
+        _BULK_APPLY_IMPLICIT_REVIEWS,
+        {
+            "user_id": user_id,
+            "graph_id": graph_id,
+            "node_ids": node_ids,
+            "retrievabilities": [u["cached_retrievability"] for u in updates],
+            "fsrs_states": [u["fsrs_state"] for u in updates],
+            "stabilities": [u["fsrs_stability"] for u in updates],
+            "difficulties": [u["fsrs_difficulty"] for u in updates],
+            "due_dates": [u["due_date"] for u in updates],
+            "reviewed_ats": [u["last_review"] for u in updates],
+        },
+    )
+    return result.rowcount
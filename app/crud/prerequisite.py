@@ -3,6 +3,8 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.knowledge_graph import bump_graph_structure_version
+from app.crud.prerequisite_closure import add_edge_to_closure
 from app.models.knowledge_node import Prerequisite
 
 
@@ -36,6 +38,9 @@ async def create_prerequisite(
         weight=weight,
     )
     db_session.add(prereq)
+    await db_session.flush()
+    await add_edge_to_closure(db_session, graph_id, from_node_id, to_node_id)
+    await bump_graph_structure_version(db_session, graph_id)
     await db_session.commit()
     await db_session.refresh(prereq)
     return prereq
@@ -46,13 +51,29 @@ async def get_prerequisites_by_graph(
     graph_id: UUID,
 ) -> list[Prerequisite]:
     """
-    Get all prerequisites in a graph
+    Get all prerequisites in a graph, ordered by (from_node_id, to_node_id)
     """
-    stmt = select(Prerequisite).where(Prerequisite.graph_id == graph_id)
+    stmt = (
+        select(Prerequisite)
+        .where(Prerequisite.graph_id == graph_id)
+        .order_by(Prerequisite.from_node_id, Prerequisite.to_node_id)
+    )
     result = await db_session.execute(stmt)
     return list(result.scalars().all())
 
 
+async def get_prerequisite_edges(
+    db_session: AsyncSession,
+    graph_id: UUID,
+) -> list[tuple[UUID, UUID]]:
+    """Get all prerequisite edges of a graph as (from_node_id, to_node_id)."""
+    stmt = select(Prerequisite.from_node_id, Prerequisite.to_node_id).where(
+        Prerequisite.graph_id == graph_id
+    )
+    result = await db_session.execute(stmt)
+    return list(result.tuples().all())
+
+
 async def bulk_insert_prerequisites_tx(
     db_session: AsyncSession,
     graph_id: UUID,
@@ -60,6 +81,8 @@ async def bulk_insert_prerequisites_tx(
 ) -> int:
     """
     Transaction-safe bulk insert without committing.
+
+    The prerequisite closure is updated for every edge actually inserted.
     """
     from sqlalchemy.dialects.postgresql import insert
 
@@ -82,8 +105,17 @@ async def bulk_insert_prerequisites_tx(
         .on_conflict_do_nothing(
             index_elements=["graph_id", "from_node_id", "to_node_id"]
         )
+        .returning(Prerequisite.from_node_id, Prerequisite.to_node_id)
     )
 
     result = await db_session.execute(stmt)
+    inserted_edges = result.tuples().all()
+    inserted = len(inserted_edges)
+    for from_id, to_id in inserted_edges:
+        await add_edge_to_closure(db_session, graph_id, from_id, to_id)
+    if inserted:
+        await bump_graph_structure_version(
+            db_session, graph_id, prerequisites=inserted
+        )
     await db_session.flush()
-    return result.rowcount or 0
+    return inserted
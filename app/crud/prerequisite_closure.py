@@ -0,0 +1,140 @@
+from uuid import UUID
+
+from sqlalchemy import Integer, delete, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.knowledge_node import PrerequisiteClosure
+
+
+async def add_edge_to_closure(
+    db_session: AsyncSession,
+    graph_id: UUID,
+    from_node_id: UUID,
+    to_node_id: UUID,
+    max_depth: int | None = None,
+) -> None:
+    """
+    Incrementally update the closure for a newly inserted edge.
+
+    Every ancestor of from_node (and from_node itself) becomes an ancestor of
+    every descendant of to_node (and to_node itself), with depth
+    d(ancestor, from_node) + 1 + d(to_node, descendant). Existing pairs keep
+    the shorter depth. Does NOT commit.
+
+    Args:
+        db_session: Database session
+        graph_id: Knowledge graph UUID
+        from_node_id: Prerequisite node of the new edge
+        to_node_id: Dependent node of the new edge
+        max_depth: Pairs deeper than this are not stored
+            (default settings.PREREQUISITE_CLOSURE_MAX_DEPTH)
+    """
+    if max_depth is None:
+        max_depth = settings.PREREQUISITE_CLOSURE_MAX_DEPTH
+
+    closure = PrerequisiteClosure
+    node_type = PG_UUID(as_uuid=True)
+
+    ancestors = union_all(
+        select(
+            literal(from_node_id, node_type).label("node_id"),
+            literal(0, Integer).label("depth"),
+        ),
+        select(closure.ancestor_id, closure.min_depth).where(
+            closure.graph_id == graph_id, closure.descendant_id == from_node_id
+        ),
+    ).subquery("ancestors")
+
+    descendants = union_all(
+        select(
+            literal(to_node_id, node_type).label("node_id"),
+            literal(0, Integer).label("depth"),
+        ),
+        select(closure.descendant_id, closure.min_depth).where(
+            closure.graph_id == graph_id, closure.ancestor_id == to_node_id
+        ),
+    ).subquery("descendants")
+
+    depth = ancestors.c.depth + 1 + descendants.c.depth
+    pairs = select(
+        literal(graph_id, node_type),
+        descendants.c.node_id,
+        ancestors.c.node_id,
+        depth,
+    ).where(
+        ancestors.c.node_id != descendants.c.node_id,
+        depth <= max_depth,
+    )
+
+    stmt = insert(closure).from_select(
+        ["graph_id", "descendant_id", "ancestor_id", "min_depth"], pairs
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["graph_id", "descendant_id", "ancestor_id"],
+        set_={"min_depth": func.least(closure.min_depth, stmt.excluded.min_depth)},
+    )
+    await db_session.execute(stmt)
+
+
+async def replace_graph_closure(
+    db_session: AsyncSession,
+    graph_id: UUID,
+    rows: list[tuple[UUID, UUID, int]],
+    batch_size: int = 5000,
+) -> int:
+    """
+    Replace all closure rows of a graph. Does NOT commit.
+
+    Args:
+        db_session: Database session
+        graph_id: Knowledge graph UUID
+        rows: (descendant_id, ancestor_id, min_depth) tuples
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        Number of rows written
+    """
+    await db_session.execute(
+        delete(PrerequisiteClosure).where(PrerequisiteClosure.graph_id == graph_id)
+    )
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        await db_session.execute(
+            insert(PrerequisiteClosure).values(
+                [
+                    {
+                        "graph_id": graph_id,
+                        "descendant_id": descendant_id,
+                        "ancestor_id": ancestor_id,
+                        "min_depth": min_depth,
+                    }
+                    for descendant_id, ancestor_id, min_depth in batch
+                ]
+            )
+        )
+    return len(rows)
+
+
+async def get_ancestor_depths(
+    db_session: AsyncSession,
+    graph_id: UUID,
+    node_id: UUID,
+    max_depth: int | None = None,
+) -> dict[UUID, int]:
+    """
+    Get all indexed ancestors of a node with their shortest depth.
+
+    Returns:
+        Dict mapping {ancestor_node_id: min_depth}
+    """
+    stmt = select(PrerequisiteClosure.ancestor_id, PrerequisiteClosure.min_depth).where(
+        PrerequisiteClosure.graph_id == graph_id,
+        PrerequisiteClosure.descendant_id == node_id,
+    )
+    if max_depth is not None:
+        stmt = stmt.where(PrerequisiteClosure.min_depth <= max_depth)
+    result = await db_session.execute(stmt)
+    return dict(result.tuples().all())
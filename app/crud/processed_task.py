@@ -0,0 +1,39 @@
+"""
+Processed Task CRUD Operations
+
+Idempotency keys for background tasks (see app/models/processed_task.py).
+"""
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.processed_task import ProcessedTask
+
+
+async def claim_idempotency_key(
+    db_session: AsyncSession,
+    idempotency_key: str,
+    task_type: str,
+) -> bool:
+    """
+    Claim an idempotency key inside the caller's transaction.
+
+    The claim becomes visible only when the caller commits, so it is undone
+    together with the task's writes if the task fails. Does NOT commit.
+
+    Args:
+        db_session: Database session
+        idempotency_key: Unique key of the task
+        task_type: Registered task type
+
+    Returns:
+        True if the key was claimed, False if it was already processed
+    """
+    stmt = (
+        insert(ProcessedTask)
+        .values(idempotency_key=idempotency_key, task_type=task_type)
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        .returning(ProcessedTask.idempotency_key)
+    )
+    result = await db_session.execute(stmt)
+    return result.scalar_one_or_none() is not None
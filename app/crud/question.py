@@ -4,6 +4,10 @@ CRUD operations for Questions.
 This module provides data access layer for question-related operations:
 - Creating and querying questions
 - Bulk operations for performance
+
+Primary-key lookups (get_question_by_id, get_node_by_question) consult the
+per-request identity cache (app/crud/identity_cache.py), so a row already
+loaded in the request's session costs no further round trip.
 """
 
 from typing import Any
@@ -13,8 +17,11 @@ from sqlalchemy import desc, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.identity_cache import get_cached, remember
+from app.crud.knowledge_graph import bump_graph_content_version
 from app.models.knowledge_node import KnowledgeNode
 from app.models.question import Question
+from app.models.user import UserMastery
 
 
 # ==================== Helper Functions ====================
@@ -70,6 +77,8 @@ async def get_question_by_id(
     """
     Get a question by its UUID.
 
+    Served from the per-request identity cache if already loaded.
+
     Args:
         db_session: Database session
         question_id: Question UUID
@@ -77,9 +86,49 @@ async def get_question_by_id(
     Returns:
         Question record or None if not found
     """
-    stmt = select(Question).where(Question.id == question_id)
-    result = await db_session.execute(stmt)
-    return result.scalar_one_or_none()
+    return await get_cached(db_session, Question, question_id)
+
+
+async def get_question_with_node(
+    db_session: AsyncSession, question_id: UUID, user_id: UUID | None = None
+) -> tuple[Question, KnowledgeNode | None] | None:
+    """
+    Get a question together with its knowledge node in one query.
+
+    Used by the answer hot path: the loaded rows go into the per-request
+    identity cache, so the follow-up get_question_by_id / get_node_by_question /
+    get_mastery calls of the mastery update need no round trip.
+
+    Args:
+        db_session: Database session
+        question_id: Question UUID
+        user_id: If given, also load this user's mastery row for the node
+            (outer join, so a missing row costs nothing)
+
+    Returns:
+        (Question, KnowledgeNode or None) or None if the question is not found
+    """
+    stmt = (
+        select(Question, KnowledgeNode)
+        .outerjoin(
+            KnowledgeNode,
+            (KnowledgeNode.id == Question.node_id)
+            & (KnowledgeNode.graph_id == Question.graph_id),
+        )
+        .where(Question.id == question_id)
+    )
+    if user_id is not None:
+        stmt = stmt.add_columns(UserMastery).outerjoin(
+            UserMastery,
+            (UserMastery.user_id == user_id)
+            & (UserMastery.graph_id == KnowledgeNode.graph_id)
+            & (UserMastery.node_id == KnowledgeNode.id),
+        )
+    row = (await db_session.execute(stmt)).first()
+    if row is None:
+        return None
+    remember(db_session, *row)
+    return row[0], row[1]
 
 
 async def get_questions_by_graph(
@@ -148,6 +197,37 @@ async def get_questions_by_node(
     return list(result.scalars().all())
 
 
+async def get_questions_with_nodes(
+    db_session: AsyncSession, question_ids: list[UUID]
+) -> dict[UUID, tuple[Question, KnowledgeNode]]:
+    """
+    Get many questions together with their knowledge nodes in one query.
+
+    Questions whose node is missing are left out.
+
+    Args:
+        db_session: Database session
+        question_ids: Question UUIDs
+
+    Returns:
+        A dictionary mapping {question_id: (Question, KnowledgeNode)}
+    """
+    if not question_ids:
+        return {}
+
+    stmt = (
+        select(Question, KnowledgeNode)
+        .join(
+            KnowledgeNode,
+            (KnowledgeNode.id == Question.node_id)
+            & (KnowledgeNode.graph_id == Question.graph_id),
+        )
+        .where(Question.id.in_(set(question_ids)))
+    )
+    result = await db_session.execute(stmt)
+    return {question.id: (question, node) for question, node in result.tuples().all()}
+
+
 # ==================== Node Query Helpers ====================
 async def get_node_by_question(
     db_session: AsyncSession, question: Question
@@ -155,6 +235,8 @@ async def get_node_by_question(
     """
     Get the knowledge node associated with a question.
 
+    Served from the per-request identity cache if already loaded.
+
     Args:
         db_session: Database session
         question: Question record
@@ -162,12 +244,10 @@ async def get_node_by_question(
     Returns:
         KnowledgeNode or None if not found
     """
-    stmt = select(KnowledgeNode).where(
-        KnowledgeNode.id == question.node_id,
-        KnowledgeNode.graph_id == question.graph_id,
-    )
-    result = await db_session.execute(stmt)
-    return result.scalar_one_or_none()
+    node = await get_cached(db_session, KnowledgeNode, question.node_id)
+    if node is None or node.graph_id != question.graph_id:
+        return None
+    return node
 
 
 async def create_question(
@@ -208,6 +288,7 @@ async def create_question(
         created_by=created_by,
     )
     db_session.add(question)
+    await bump_graph_content_version(db_session, graph_id)
     await db_session.commit()  # FIXME: shouldn't commit here
     await db_session.refresh(question)
     return question
@@ -262,6 +343,8 @@ async def bulk_create_questions(
 
     stmt = insert(Question).values(values)
     result = await db_session.execute(stmt)
+    created = result.rowcount if result.rowcount else 0
+    await bump_graph_content_version(db_session, graph_id, questions=created)
     await db_session.commit()
 
-    return result.rowcount if result.rowcount else 0
+    return created
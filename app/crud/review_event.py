@@ -0,0 +1,264 @@
+"""
+Review Event CRUD Operations
+
+Append-only FSRS review history (see app/models/review_event.py), plus the
+helpers that move the legacy user_mastery.review_log JSONB arrays into it
+(see app/services/review_log_backfill.py) and keep it bounded
+(see app/services/review_history_compaction.py).
+"""
+
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.review_event import ReviewEvent
+from app.models.user import UserMastery
+
+MasteryKey = tuple[UUID, UUID, UUID]  # (user_id, graph_id, node_id)
+
+
+async def get_review_events(
+    db_session: AsyncSession, user_id: UUID, graph_id: UUID, node_id: UUID
+) -> list[ReviewEvent]:
+    """
+    Get the review history of one mastery row, oldest first.
+
+    Args:
+        db_session: Database session
+        user_id: User UUID
+        graph_id: Knowledge graph UUID
+        node_id: Knowledge node UUID
+
+    Returns:
+        ReviewEvent records ordered by review time
+    """
+    stmt = (
+        select(ReviewEvent)
+        .where(
+            ReviewEvent.user_id == user_id,
+            ReviewEvent.graph_id == graph_id,
+            ReviewEvent.node_id == node_id,
+        )
+        .order_by(ReviewEvent.reviewed_at, ReviewEvent.id)
+    )
+    result = await db_session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def trim_review_events(
+    db_session: AsyncSession, mastery_keys: Sequence[MasteryKey], keep: int
+) -> int:
+    """
+    Delete all but the newest `keep` review events of each mastery row.
+
+    The lifetime totals survive on UserMastery (review_count, lapse_count,
+    first_review). Uses idx_review_events_mastery per row; does NOT commit.
+
+    Args:
+        db_session: Database session
+        mastery_keys: (user_id, graph_id, node_id) of the rows to trim
+        keep: Number of most recent events to keep per row
+
+    Returns:
+        Number of events deleted
+    """
+    if not mastery_keys:
+        return 0
+
+    mastery_cols = (ReviewEvent.user_id, ReviewEvent.graph_id, ReviewEvent.node_id)
+    ranked = (
+        select(
+            ReviewEvent.id,
+            func.row_number()
+            .over(
+                partition_by=mastery_cols,
+                order_by=(ReviewEvent.reviewed_at.desc(), ReviewEvent.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(tuple_(*mastery_cols).in_(list(mastery_keys)))
+        .subquery()
+    )
+    stmt = delete(ReviewEvent).where(
+        ReviewEvent.id.in_(select(ranked.c.id).where(ranked.c.position > keep))
+    )
+    result = await db_session.execute(
+        stmt, execution_options={"synchronize_session": False}
+    )
+    return result.rowcount or 0
+
+
+async def get_oversized_mastery_keys(
+    db_session: AsyncSession,
+    keep: int,
+    batch_size: int,
+    after: MasteryKey | None = None,
+) -> list[MasteryKey]:
+    """
+    Keyset-paginate the mastery rows that may hold more than `keep` events.
+
+    review_count counts every review ever made, so a row with
+    review_count <= keep can never need trimming.
+
+    Args:
+        db_session: Database session
+        keep: Events kept per row
+        batch_size: Maximum number of keys to return
+        after: Last key of the previous page (None for the first page)
+
+    Returns:
+        (user_id, graph_id, node_id) keys in primary key order
+    """
+    pk = (UserMastery.user_id, UserMastery.graph_id, UserMastery.node_id)
+    stmt = (
+        select(*pk)
+        .where(UserMastery.review_count > keep)
+        .order_by(*pk)
+        .limit(batch_size)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(*pk) > tuple_(*after))
+    result = await db_session.execute(stmt)
+    return [tuple(row) for row in result.all()]
+
+
+_BACKFILL_SUMMARY_SQL = text(
+    """
+    WITH summary AS (
+        SELECT
+            user_id,
+            graph_id,
+            node_id,
+            count(*) AS reviews,
+            count(*) FILTER (
+                WHERE rating = 1 AND previous_state = 'review'
+            ) AS lapses,
+            min(reviewed_at) AS first_reviewed_at
+        FROM (
+            SELECT
+                e.*,
+                lag(state_after) OVER (
+                    PARTITION BY user_id, graph_id, node_id
+                    ORDER BY reviewed_at, id
+                ) AS previous_state
+            FROM review_events e
+        ) ordered
+        GROUP BY user_id, graph_id, node_id
+    ),
+    updated AS (
+        UPDATE user_mastery m
+        SET review_count = s.reviews,
+            lapse_count = s.lapses,
+            first_review = s.first_reviewed_at
+        FROM summary s
+        WHERE m.user_id = s.user_id
+          AND m.graph_id = s.graph_id
+          AND m.node_id = s.node_id
+          AND m.review_count = 0
+        RETURNING 1
+    )
+    SELECT count(*) FROM updated
+    """
+)
+
+
+async def backfill_review_summary(db_session: AsyncSession) -> int:
+    """
+    Derive review_count / lapse_count / first_review from review_events.
+
+    For rows reviewed before the summary columns existed (review_count = 0
+    but events present). Run it before trimming anything, since trimmed
+    history cannot be counted. Does NOT commit.
+
+    Returns:
+        Number of mastery rows updated
+    """
+    return int(await db_session.scalar(_BACKFILL_SUMMARY_SQL) or 0)
+
+
+# ==================== Legacy review_log migration ====================
+
+
+async def legacy_review_log_exists(db_session: AsyncSession) -> bool:
+    """Whether user_mastery still has the old review_log JSONB column."""
+    stmt = text(
+        """
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND table_name = 'user_mastery'
+              AND column_name = 'review_log'
+        )
+        """
+    )
+    return bool(await db_session.scalar(stmt))
+
+
+_MIGRATE_BATCH_SQL = text(
+    """
+    WITH batch AS (
+        SELECT user_id, graph_id, node_id, review_log
+        FROM user_mastery
+        WHERE jsonb_typeof(review_log) = 'array'
+          AND jsonb_array_length(review_log) > 0
+        ORDER BY user_id, graph_id, node_id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    inserted AS (
+        INSERT INTO review_events (
+            user_id, graph_id, node_id, rating, state_after, step, reviewed_at
+        )
+        SELECT
+            b.user_id,
+            b.graph_id,
+            b.node_id,
+            (entry->>'rating')::smallint,
+            COALESCE(entry->>'state_after', 'learning'),
+            (entry->>'step')::int,
+            COALESCE((entry->>'review_datetime')::timestamptz, now())
+        FROM batch b
+        CROSS JOIN LATERAL jsonb_array_elements(b.review_log)
+            WITH ORDINALITY AS log(entry, position)
+        WHERE entry ? 'rating'
+        ORDER BY b.user_id, b.graph_id, b.node_id, log.position
+        RETURNING 1
+    ),
+    updated AS (
+        UPDATE user_mastery m
+        SET last_step = COALESCE((b.review_log->-1->>'step')::int, 0),
+            review_log = '[]'::jsonb
+        FROM batch b
+        WHERE m.user_id = b.user_id
+          AND m.graph_id = b.graph_id
+          AND m.node_id = b.node_id
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM updated), (SELECT count(*) FROM inserted)
+    """
+)
+
+
+async def migrate_legacy_review_log_batch(
+    db_session: AsyncSession, batch_size: int
+) -> tuple[int, int]:
+    """
+    Move one batch of legacy review_log arrays into review_events.
+
+    Each migrated row gets its last_step from the array's last entry and an
+    emptied review_log, so re-running only picks up rows not yet migrated
+    (and concurrent runs skip each other's locked rows). Does NOT commit.
+
+    Args:
+        db_session: Database session
+        batch_size: Maximum number of mastery rows to migrate
+
+    Returns:
+        (mastery rows migrated, review events inserted)
+    """
+    row = (
+        await db_session.execute(_MIGRATE_BATCH_SQL, {"batch_size": batch_size})
+    ).one()
+    return int(row[0]), int(row[1])
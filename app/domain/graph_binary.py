@@ -0,0 +1,161 @@
+"""
+Graph Binary - Compact columnar encoding of graph responses.
+
+JSON graph payloads repeat a 36-character UUID string for every edge
+endpoint and spell out every key of every node. This format sends each
+table once, column by column:
+
+- Node ids as raw 16-byte UUIDs, edges as int32 row indexes into the node
+  table, scores/weights as float32 and counts as int32
+- Strings as one UTF-8 blob plus uint32 offsets (and a null mask when the
+  column is nullable)
+
+Layout (all integers little-endian):
+
+    magic   b"AGB1"
+    uint32  column count
+    per column:
+        uint8   dtype code (see DTYPES)
+        uint8   name length
+        uint16  reserved (0)
+        uint32  row count
+        uint32  payload byte length
+        name (ASCII, "table.column"), zero-padded to a multiple of 4 bytes
+        payload, zero-padded to a multiple of 4 bytes
+
+Every numeric payload therefore starts 4-byte aligned, so a browser can
+wrap it in a Float32Array / Int32Array view without copying.
+
+Pure encoding logic (no DB access); see GraphContentService.
+"""
+
+import json
+import struct
+from collections.abc import Sequence
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+
+MEDIA_TYPE = "application/vnd.aether.graph+binary"
+
+MAGIC = b"AGB1"
+
+# dtype code -> NumPy dtype of fixed-width columns
+DTYPES = {
+    ord("u"): np.dtype("V16"),  # UUID (16 raw bytes)
+    ord("i"): np.dtype("<i4"),  # int32
+    ord("f"): np.dtype("<f4"),  # float32
+}
+STRING = ord("s")  # uint32 offsets[n + 1] + UTF-8 bytes
+NULLABLE_STRING = ord("z")  # uint8 null mask[n] (padded to 4) + STRING
+JSON = ord("j")  # one UTF-8 JSON document (row count 1)
+
+_COLUMN_HEADER = struct.Struct("<BBHII")
+
+
+def _pad(payload: bytes) -> bytes:
+    return payload + b"\0" * (-len(payload) % 4)
+
+
+class GraphBinaryWriter:
+    """Collects columns and encodes them into one buffer."""
+
+    def __init__(self) -> None:
+        self._columns: list[bytes] = []
+
+    def uuids(self, name: str, values: Sequence[UUID]) -> "GraphBinaryWriter":
+        payload = b"".join(value.bytes for value in values)
+        return self._add(name, ord("u"), len(values), payload)
+
+    def int32(
+        self, name: str, values: Sequence[int] | np.ndarray
+    ) -> "GraphBinaryWriter":
+        array = np.asarray(values, dtype="<i4")
+        return self._add(name, ord("i"), array.size, array.tobytes())
+
+    def float32(
+        self, name: str, values: Sequence[float] | np.ndarray
+    ) -> "GraphBinaryWriter":
+        array = np.asarray(values, dtype="<f4")
+        return self._add(name, ord("f"), array.size, array.tobytes())
+
+    def strings(
+        self, name: str, values: Sequence[str | None]
+    ) -> "GraphBinaryWriter":
+        encoded = [b"" if value is None else value.encode() for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+        offsets[1:] = np.cumsum([len(value) for value in encoded])
+        payload = offsets.tobytes() + b"".join(encoded)
+
+        if any(value is None for value in values):
+            mask = bytes(value is None for value in values)
+            return self._add(name, NULLABLE_STRING, len(values), _pad(mask) + payload)
+        return self._add(name, STRING, len(values), payload)
+
+    def json(self, name: str, document: Any) -> "GraphBinaryWriter":
+        payload = json.dumps(document, separators=(",", ":")).encode()
+        return self._add(name, JSON, 1, payload)
+
+    def to_bytes(self) -> bytes:
+        return MAGIC + struct.pack("<I", len(self._columns)) + b"".join(self._columns)
+
+    def _add(
+        self, name: str, dtype: int, rows: int, payload: bytes
+    ) -> "GraphBinaryWriter":
+        encoded_name = name.encode("ascii")
+        self._columns.append(
+            _COLUMN_HEADER.pack(dtype, len(encoded_name), 0, rows, len(payload))
+            + _pad(encoded_name)
+            + _pad(payload)
+        )
+        return self
+
+
+def decode(buffer: bytes) -> dict[str, Any]:
+    """
+    Decode a buffer into {column name: values}.
+
+    Reference implementation of the format (the frontend has its own):
+    UUID columns decode to lists of UUID, numeric columns to NumPy arrays,
+    string columns to lists of str (None where masked), JSON to its value.
+    """
+    if buffer[:4] != MAGIC:
+        raise ValueError("Not a graph binary buffer")
+    (count,) = struct.unpack_from("<I", buffer, 4)
+    offset = 8
+    columns: dict[str, Any] = {}
+    for _ in range(count):
+        dtype, name_length, _, rows, length = _COLUMN_HEADER.unpack_from(
+            buffer, offset
+        )
+        offset += _COLUMN_HEADER.size
+        name = buffer[offset : offset + name_length].decode("ascii")
+        offset += name_length + (-name_length % 4)
+        payload = buffer[offset : offset + length]
+        offset += length + (-length % 4)
+
+        if dtype == ord("u"):
+            columns[name] = [
+                UUID(bytes=payload[i : i + 16]) for i in range(0, 16 * rows, 16)
+            ]
+        elif dtype in DTYPES:
+            columns[name] = np.frombuffer(payload, dtype=DTYPES[dtype], count=rows)
+        elif dtype in (STRING, NULLABLE_STRING):
+            mask = None
+            if dtype == NULLABLE_STRING:
+                mask = payload[:rows]
+                payload = payload[rows + (-rows % 4) :]
+            offsets = np.frombuffer(payload, dtype="<u4", count=rows + 1)
+            blob = payload[4 * (rows + 1) :]
+            columns[name] = [
+                None
+                if mask is not None and mask[i]
+                else blob[offsets[i] : offsets[i + 1]].decode()
+                for i in range(rows)
+            ]
+        elif dtype == JSON:
+            columns[name] = json.loads(payload)
+        else:
+            raise ValueError(f"Unknown column dtype {dtype!r} for {name}")
+    return columns
@@ -0,0 +1,143 @@
+"""
+Graph CSR - Compact array representation of a graph's prerequisite structure.
+
+Stores the prerequisite edges of one knowledge graph as CSR (compressed sparse
+row) arrays over dense integer node indices, plus the UUID <-> index mapping.
+Both directions are kept:
+- successors (prerequisite -> dependents)
+- predecessors (dependent -> prerequisites)
+
+The structure is immutable once built, so it can be shared through caches.
+It relies on NO database connections.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+
+
+def _build_csr(
+    rows: np.ndarray, cols: np.ndarray, num_nodes: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build (indptr, indices) so that row i's neighbours are indices[indptr[i]:indptr[i+1]]."""
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32)
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """
+    Immutable CSR adjacency of a prerequisite graph.
+
+    Attributes:
+        node_ids: Index -> node UUID
+        index: Node UUID -> index
+        out_indptr / out_indices: Successors (prerequisite -> dependents)
+        in_indptr / in_indices: Predecessors (dependent -> prerequisites)
+    """
+
+    node_ids: tuple[UUID, ...]
+    index: dict[UUID, int]
+    out_indptr: np.ndarray
+    out_indices: np.ndarray
+    in_indptr: np.ndarray
+    in_indices: np.ndarray
+
+    @classmethod
+    def from_edges(
+        cls, node_ids: Iterable[UUID], edges: Iterable[tuple[UUID, UUID]]
+    ) -> "CSRGraph":
+        """
+        Build the CSR structure from node UUIDs and (from_node, to_node) edges.
+
+        Edge endpoints missing from `node_ids` are appended to the node set.
+
+        Args:
+            node_ids: All node UUIDs of the graph
+            edges: Prerequisite edges as (from_node_id, to_node_id)
+
+        Returns:
+            CSRGraph
+        """
+        ordered = list(dict.fromkeys(node_ids))
+        index = {node_id: i for i, node_id in enumerate(ordered)}
+
+        src, dst = [], []
+        for from_id, to_id in edges:
+            for node_id in (from_id, to_id):
+                if node_id not in index:
+                    index[node_id] = len(ordered)
+                    ordered.append(node_id)
+            src.append(index[from_id])
+            dst.append(index[to_id])
+
+        num_nodes = len(ordered)
+        src_arr = np.asarray(src, dtype=np.int64)
+        dst_arr = np.asarray(dst, dtype=np.int64)
+        out_indptr, out_indices = _build_csr(src_arr, dst_arr, num_nodes)
+        in_indptr, in_indices = _build_csr(dst_arr, src_arr, num_nodes)
+
+        return cls(
+            node_ids=tuple(ordered),
+            index=index,
+            out_indptr=out_indptr,
+            out_indices=out_indices,
+            in_indptr=in_indptr,
+            in_indices=in_indices,
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.out_indices)
+
+    def successors(self, i: int) -> np.ndarray:
+        """Dependents of node index `i`."""
+        return self.out_indices[self.out_indptr[i] : self.out_indptr[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        """Prerequisites of node index `i`."""
+        return self.in_indices[self.in_indptr[i] : self.in_indptr[i + 1]]
+
+    def ancestor_depths(
+        self, node_id: UUID, max_depth: int | None = None
+    ) -> dict[UUID, int]:
+        """
+        All (transitive) prerequisites of a node with their shortest distance.
+
+        In-memory equivalent of the recursive CTE in
+        mastery_crud.get_prerequisite_roots_to_bonus: depth 1 = direct
+        prerequisites, depth N = N hops away (minimum over all paths).
+
+        Args:
+            node_id: Start node UUID
+            max_depth: Optional maximum depth to traverse
+
+        Returns:
+            Dict mapping {prerequisite_node_id: min_depth}
+        """
+        start = self.index.get(node_id)
+        if start is None:
+            return {}
+
+        depths: dict[int, int] = {}
+        frontier = [start]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for i in frontier:
+                for parent in self.predecessors(i).tolist():
+                    if parent not in depths and parent != start:
+                        depths[parent] = depth
+                        next_frontier.append(parent)
+            frontier = next_frontier
+
+        return {self.node_ids[i]: d for i, d in depths.items()}
@@ -0,0 +1,390 @@
+"""
+Mastery Batch Logic - Vectorized FSRS core for many mastery records at once.
+
+MasteryLogic rebuilds one fsrs.Card per record and calls the scalar Scheduler
+card by card. For propagation, dashboards and nightly recalculations that
+per-object overhead dominates, so this module keeps cards as parallel NumPy
+arrays (struct-of-arrays) and evaluates a whole batch per call.
+
+The formulas mirror fsrs.Scheduler exactly (same parameters, learning steps,
+interval rounding and fuzzing rules); parity is covered by unit tests against
+the scalar library.
+It relies on NO database connections.
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from fsrs import Rating, Scheduler, State
+from fsrs.scheduler import FUZZ_RANGES, MAX_DIFFICULTY, MIN_DIFFICULTY, STABILITY_MIN
+
+# All timestamps are handled as UTC microseconds (matches datetime resolution)
+_DATETIME_DTYPE = "datetime64[us]"
+_MICROS_PER_DAY = 86_400_000_000
+
+
+def to_datetime64(values: list[datetime | None]) -> np.ndarray:
+    """Convert timezone-aware datetimes to a UTC datetime64 array (None -> NaT)."""
+    return np.array(
+        [
+            np.datetime64(value.astimezone(UTC).replace(tzinfo=None), "us")
+            if value is not None
+            else np.datetime64("NaT", "us")
+            for value in values
+        ],
+        dtype=_DATETIME_DTYPE,
+    )
+
+
+def from_datetime64(values: np.ndarray) -> list[datetime | None]:
+    """Convert a datetime64 array back to timezone-aware UTC datetimes."""
+    return [
+        value.replace(tzinfo=UTC) if value is not None else None
+        for value in values.astype(_DATETIME_DTYPE).astype(object)
+    ]
+
+
+@dataclass
+class FSRSCardBatch:
+    """
+    Struct-of-arrays representation of N FSRS cards.
+
+    Attributes:
+        state: fsrs.State values (Learning=1, Review=2, Relearning=3), int8
+        step: Learning/relearning step; ignored for Review cards, int64
+        stability: Memory stability, NaN for never-reviewed cards, float64
+        difficulty: Difficulty (1.0-10.0), NaN for never-reviewed cards, float64
+        due: Next due timestamp (UTC), datetime64[us]
+        last_review: Last review timestamp (UTC), NaT if never reviewed
+    """
+
+    state: np.ndarray
+    step: np.ndarray
+    stability: np.ndarray
+    difficulty: np.ndarray
+    due: np.ndarray
+    last_review: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    @classmethod
+    def empty(cls, size: int) -> "FSRSCardBatch":
+        """Create a batch of `size` brand new cards (equivalent to fsrs.Card())."""
+        return cls(
+            state=np.full(size, State.Learning.value, dtype=np.int8),
+            step=np.zeros(size, dtype=np.int64),
+            stability=np.full(size, np.nan),
+            difficulty=np.full(size, np.nan),
+            due=np.full(size, np.datetime64("NaT", "us"), dtype=_DATETIME_DTYPE),
+            last_review=np.full(
+                size, np.datetime64("NaT", "us"), dtype=_DATETIME_DTYPE
+            ),
+        )
+
+
+class FSRSBatchScheduler:
+    """
+    Vectorized counterpart of fsrs.Scheduler.
+
+    Takes its parameters from an existing scalar Scheduler so both paths are
+    always configured identically.
+    """
+
+    def __init__(self, scheduler: Scheduler | None = None):
+        scheduler = scheduler or Scheduler()
+        self.scheduler = scheduler
+        self.w = np.asarray(scheduler.parameters, dtype=np.float64)
+        self.desired_retention = scheduler.desired_retention
+        self.maximum_interval = scheduler.maximum_interval
+        self.enable_fuzzing = scheduler.enable_fuzzing
+        self.learning_steps_us = self._steps_to_micros(scheduler.learning_steps)
+        self.relearning_steps_us = self._steps_to_micros(scheduler.relearning_steps)
+        self._decay = -self.w[20]
+        self._factor = 0.9 ** (1 / self._decay) - 1
+
+    @staticmethod
+    def _steps_to_micros(steps) -> np.ndarray:
+        return np.array(
+            [step // timedelta(microseconds=1) for step in steps], dtype=np.int64
+        )
+
+    # ==================== Retrievability ====================
+
+    def get_retrievability(self, cards: FSRSCardBatch, now: datetime) -> np.ndarray:
+        """
+        Calculate R(t) for every card at `now`.
+
+        Equivalent to Scheduler.get_card_retrievability: never-reviewed cards
+        get 0.0 and elapsed time is counted in whole days.
+
+        Args:
+            cards: Card batch
+            now: Current timestamp (timezone-aware)
+
+        Returns:
+            float64 array of retrievability values (0.0-1.0)
+        """
+        elapsed_days = self._elapsed_days(cards.last_review, now)
+        return self._retrievability(cards.stability, cards.last_review, elapsed_days)
+
+    def _elapsed_days(self, last_review: np.ndarray, now: datetime) -> np.ndarray:
+        now64 = np.datetime64(now.astimezone(UTC).replace(tzinfo=None), "us")
+        has_review = ~np.isnat(last_review)
+        delta_us = np.where(
+            has_review, (now64 - last_review).astype(np.int64), 0
+        )
+        # timedelta.days floors towards negative infinity
+        return np.floor_divide(delta_us, _MICROS_PER_DAY)
+
+    def _retrievability(
+        self, stability: np.ndarray, last_review: np.ndarray, elapsed_days: np.ndarray
+    ) -> np.ndarray:
+        reviewed = ~np.isnat(last_review) & ~np.isnan(stability) & (stability > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            retrievability = (
+                1 + self._factor * np.maximum(elapsed_days, 0) / stability
+            ) ** self._decay
+        return np.where(reviewed, retrievability, 0.0)
+
+    # ==================== Review ====================
+
+    def review(
+        self,
+        cards: FSRSCardBatch,
+        ratings: np.ndarray | Rating | int,
+        now: datetime,
+        fuzz: np.ndarray | None = None,
+    ) -> FSRSCardBatch:
+        """
+        Review every card in the batch at `now`.
+
+        Equivalent to calling Scheduler.review_card once per card.
+
+        Args:
+            cards: Card batch to review
+            ratings: One fsrs.Rating value per card, or a single rating for all
+            now: Review timestamp (timezone-aware, UTC)
+            fuzz: Optional uniform [0, 1) draws, one per card, used for interval
+                fuzzing. Drawn from NumPy's default generator when omitted.
+
+        Returns:
+            New FSRSCardBatch with the post-review state
+        """
+        size = len(cards)
+        ratings = np.broadcast_to(np.asarray(ratings, dtype=np.int64), (size,))
+        now64 = np.datetime64(now.astimezone(UTC).replace(tzinfo=None), "us")
+
+        is_new = np.isnan(cards.stability) | np.isnan(cards.difficulty)
+        state = np.where(is_new, State.Learning.value, cards.state).astype(np.int8)
+        step = np.where(is_new, 0, cards.step).astype(np.int64)
+
+        # 1. Stability and difficulty
+        elapsed_days = self._elapsed_days(cards.last_review, now)
+        same_day = ~np.isnat(cards.last_review) & (elapsed_days < 1)
+        with np.errstate(all="ignore"):
+            retrievability = self._retrievability(
+                cards.stability, cards.last_review, elapsed_days
+            )
+            long_term = self._next_stability(
+                cards.difficulty, cards.stability, retrievability, ratings
+            )
+            short_term = self._short_term_stability(cards.stability, ratings)
+            stability = np.where(
+                is_new,
+                self._initial_stability(ratings),
+                np.where(same_day, short_term, long_term),
+            )
+            difficulty = np.where(
+                is_new,
+                self._initial_difficulty(ratings, clamp=True),
+                self._next_difficulty(cards.difficulty, ratings),
+            )
+
+        # 2. State machine and next interval
+        new_state = state.copy()
+        new_step = step.copy()
+        interval_us = np.zeros(size, dtype=np.int64)
+        review_interval_us = self._next_interval(stability) * _MICROS_PER_DAY
+
+        again = ratings == Rating.Again.value
+        for phase, steps_us in (
+            (State.Learning.value, self.learning_steps_us),
+            (State.Relearning.value, self.relearning_steps_us),
+        ):
+            in_phase = state == phase
+            self._advance_steps(
+                in_phase, steps_us, step, ratings, new_state, new_step, interval_us
+            )
+            graduated = in_phase & (new_state == State.Review.value)
+            interval_us[graduated] = review_interval_us[graduated]
+
+        in_review = state == State.Review.value
+        to_relearning = in_review & again & (len(self.relearning_steps_us) > 0)
+        new_state[to_relearning] = State.Relearning.value
+        new_step[to_relearning] = 0
+        if len(self.relearning_steps_us):
+            interval_us[to_relearning] = self.relearning_steps_us[0]
+        stays_review = in_review & ~to_relearning
+        interval_us[stays_review] = review_interval_us[stays_review]
+
+        # 3. Fuzzing (Review-state intervals only)
+        if self.enable_fuzzing:
+            fuzzable = new_state == State.Review.value
+            if fuzz is None:
+                fuzz = np.random.default_rng().random(size)
+            interval_us = np.where(
+                fuzzable,
+                self._fuzzed_interval_days(interval_us // _MICROS_PER_DAY, fuzz)
+                * _MICROS_PER_DAY,
+                interval_us,
+            )
+
+        new_step[new_state == State.Review.value] = 0
+        return FSRSCardBatch(
+            state=new_state,
+            step=new_step,
+            stability=stability,
+            difficulty=difficulty,
+            due=now64 + interval_us.astype("timedelta64[us]"),
+            last_review=np.full(size, now64, dtype=_DATETIME_DTYPE),
+        )
+
+    @staticmethod
+    def _advance_steps(
+        in_phase: np.ndarray,
+        steps_us: np.ndarray,
+        step: np.ndarray,
+        ratings: np.ndarray,
+        new_state: np.ndarray,
+        new_step: np.ndarray,
+        interval_us: np.ndarray,
+    ) -> None:
+        """Apply the (re)learning-step transitions in place for one phase."""
+        num_steps = len(steps_us)
+        again = ratings == Rating.Again.value
+        hard = ratings == Rating.Hard.value
+        good = ratings == Rating.Good.value
+        easy = ratings == Rating.Easy.value
+
+        if num_steps == 0:
+            graduate = in_phase
+        else:
+            graduate = in_phase & (
+                ((step >= num_steps) & ~again) | easy | (good & (step + 1 == num_steps))
+            )
+        new_state[graduate] = State.Review.value
+        if num_steps == 0:
+            return
+
+        staying = in_phase & ~graduate
+        current_idx = np.clip(step, 0, num_steps - 1)
+        next_idx = np.clip(step + 1, 0, num_steps - 1)
+
+        # Again: back to the first step
+        reset = staying & again
+        new_step[reset] = 0
+        interval_us[reset] = steps_us[0]
+
+        # Hard: stay on the same step
+        if num_steps == 1:
+            first_hard = np.rint(steps_us[0] * 1.5)
+        else:
+            first_hard = np.rint((steps_us[0] + steps_us[1]) / 2.0)
+        hard_interval = np.where(step == 0, first_hard, steps_us[current_idx])
+        repeat = staying & hard
+        interval_us[repeat] = hard_interval[repeat].astype(np.int64)
+
+        # Good: move on to the next step
+        advance = staying & good
+        new_step[advance] = step[advance] + 1
+        interval_us[advance] = steps_us[next_idx][advance]
+
+    # ==================== FSRS formulas (vectorized) ====================
+
+    def _initial_stability(self, ratings: np.ndarray) -> np.ndarray:
+        return np.maximum(self.w[ratings - 1], STABILITY_MIN)
+
+    def _initial_difficulty(self, ratings: np.ndarray, clamp: bool) -> np.ndarray:
+        difficulty = self.w[4] - np.power(np.e, self.w[5] * (ratings - 1)) + 1
+        if clamp:
+            difficulty = np.clip(difficulty, MIN_DIFFICULTY, MAX_DIFFICULTY)
+        return difficulty
+
+    def _next_interval(self, stability: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            interval = (stability / self._factor) * (
+                (self.desired_retention ** (1 / self._decay)) - 1
+            )
+            interval = np.nan_to_num(np.rint(interval), nan=1.0)
+        return np.clip(interval, 1, self.maximum_interval).astype(np.int64)
+
+    def _short_term_stability(
+        self, stability: np.ndarray, ratings: np.ndarray
+    ) -> np.ndarray:
+        increase = np.power(np.e, self.w[17] * (ratings - 3 + self.w[18])) * np.power(
+            stability, -self.w[19]
+        )
+        increase = np.where(
+            ratings >= Rating.Hard.value, np.maximum(increase, 1.0), increase
+        )
+        return np.maximum(stability * increase, STABILITY_MIN)
+
+    def _next_difficulty(
+        self, difficulty: np.ndarray, ratings: np.ndarray
+    ) -> np.ndarray:
+        easy_difficulty = self.w[4] - np.power(np.e, self.w[5] * (Rating.Easy - 1)) + 1
+        delta = -(self.w[6] * (ratings - 3))
+        damped = difficulty + (10.0 - difficulty) * delta / 9.0
+        reverted = self.w[7] * easy_difficulty + (1 - self.w[7]) * damped
+        return np.clip(reverted, MIN_DIFFICULTY, MAX_DIFFICULTY)
+
+    def _next_stability(
+        self,
+        difficulty: np.ndarray,
+        stability: np.ndarray,
+        retrievability: np.ndarray,
+        ratings: np.ndarray,
+    ) -> np.ndarray:
+        forget_long = (
+            self.w[11]
+            * np.power(difficulty, -self.w[12])
+            * (np.power(stability + 1, self.w[13]) - 1)
+            * np.power(np.e, (1 - retrievability) * self.w[14])
+        )
+        forget_short = stability / np.power(np.e, self.w[17] * self.w[18])
+        forget = np.minimum(forget_long, forget_short)
+
+        hard_penalty = np.where(ratings == Rating.Hard.value, self.w[15], 1.0)
+        easy_bonus = np.where(ratings == Rating.Easy.value, self.w[16], 1.0)
+        recall = stability * (
+            1
+            + np.power(np.e, self.w[8])
+            * (11 - difficulty)
+            * np.power(stability, -self.w[9])
+            * (np.power(np.e, (1 - retrievability) * self.w[10]) - 1)
+            * hard_penalty
+            * easy_bonus
+        )
+        next_stability = np.where(ratings == Rating.Again.value, forget, recall)
+        return np.maximum(next_stability, STABILITY_MIN)
+
+    def _fuzzed_interval_days(
+        self, interval_days: np.ndarray, fuzz: np.ndarray
+    ) -> np.ndarray:
+        delta = np.ones(interval_days.shape, dtype=np.float64)
+        for fuzz_range in FUZZ_RANGES:
+            delta += fuzz_range["factor"] * np.maximum(
+                np.minimum(interval_days.astype(np.float64), fuzz_range["end"])
+                - fuzz_range["start"],
+                0.0,
+            )
+        min_ivl = np.maximum(2, np.rint(interval_days - delta))
+        max_ivl = np.minimum(np.rint(interval_days + delta), self.maximum_interval)
+        min_ivl = np.minimum(min_ivl, max_ivl)
+
+        fuzzed = np.rint(fuzz * (max_ivl - min_ivl + 1) + min_ivl)
+        fuzzed = np.minimum(fuzzed, self.maximum_interval).astype(np.int64)
+        # Fuzz is not applied to intervals shorter than 2.5 days
+        return np.where(interval_days < 2.5, interval_days, fuzzed)
@@ -8,11 +8,19 @@ It relies on NO database connections.
 
 import logging
 import random
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 from fsrs import Card, Rating, Scheduler, State
 
+from app.domain.mastery_batch_logic import (
+    FSRSBatchScheduler,
+    FSRSCardBatch,
+    from_datetime64,
+    to_datetime64,
+)
 from app.models.user import FSRSState, UserMastery
 from app.utils.time_utils import get_now
 
@@ -25,6 +33,7 @@ class MasteryLogic:
     """
 
     _fsrs_scheduler = Scheduler()
+    _fsrs_batch_scheduler = FSRSBatchScheduler(_fsrs_scheduler)
 
     @staticmethod
     def map_correctness_to_rating(is_correct: bool) -> Rating:
@@ -91,27 +100,54 @@ class MasteryLogic:
         # Use node_id int value for consistency (hash() is not stable across restarts)
         card_id = mastery.node_id.int % (10**12)
 
-        # Retrieve 'step' from the last review log if available
-        # This is critical for LEARNING/RELEARNING states to track multi-step progress
-        step = 0
-        if mastery.review_log and isinstance(mastery.review_log, list):
-            try:
-                last_log = mastery.review_log[-1]
-                if isinstance(last_log, dict):
-                    step = last_log.get("step", 0)
-            except (IndexError, AttributeError):
-                pass
-
+        # 'step' of the last explicit review is critical for LEARNING/RELEARNING
+        # states to track multi-step progress
         return Card(
             card_id=card_id,
             state=fsrs_state,
-            step=step,
+            step=mastery.last_step or 0,
             stability=mastery.fsrs_stability or 0.0,
             difficulty=mastery.fsrs_difficulty or 0.0,
             due=mastery.due_date,
             last_review=mastery.last_review,
         )
 
+    @staticmethod
+    def build_fsrs_card_batch(masteries: Sequence[UserMastery]) -> FSRSCardBatch:
+        """Build a struct-of-arrays card batch from UserMastery records.
+
+        Batch counterpart of build_fsrs_card with the same reconstruction rules.
+
+        Args:
+            masteries: UserMastery records with FSRS fields.
+
+        Returns:
+            FSRSCardBatch: One card per record, in input order.
+        """
+        state_mapping = {
+            FSRSState.LEARNING.value: State.Learning.value,
+            FSRSState.REVIEW.value: State.Review.value,
+            FSRSState.RELEARNING.value: State.Relearning.value,
+        }
+        batch = FSRSCardBatch.empty(len(masteries))
+        reviewed = [m.last_review is not None for m in masteries]
+
+        for i, mastery in enumerate(masteries):
+            if not reviewed[i]:
+                continue
+            batch.state[i] = state_mapping.get(
+                mastery.fsrs_state, State.Learning.value
+            )
+            batch.step[i] = mastery.last_step or 0
+            batch.stability[i] = mastery.fsrs_stability or 0.0
+            batch.difficulty[i] = mastery.fsrs_difficulty or 0.0
+
+        batch.due = to_datetime64(
+            [m.due_date if reviewed[i] else None for i, m in enumerate(masteries)]
+        )
+        batch.last_review = to_datetime64([m.last_review for m in masteries])
+        return batch
+
     @classmethod
     def calculate_next_state(
         cls,
@@ -159,6 +195,11 @@ class MasteryLogic:
         new_fsrs_state_enum = cls.map_fsrs_state_to_enum(new_card.state)
         new_retrievability = cls._fsrs_scheduler.get_card_retrievability(new_card, now)
 
+        # Lifetime summary (review_events only keeps the most recent reviews)
+        is_lapse = (
+            rating == Rating.Again and mastery.fsrs_state == FSRSState.REVIEW.value
+        )
+
         updates = {
             "cached_retrievability": new_retrievability,
             "last_updated": now,
@@ -167,10 +208,13 @@ class MasteryLogic:
             "fsrs_difficulty": new_card.difficulty,
             "due_date": new_card.due,
             "last_review": now,
-            # Append log helper
+            "review_count": (mastery.review_count or 0) + 1,
+            "lapse_count": (mastery.lapse_count or 0) + int(is_lapse),
+            "first_review": mastery.first_review or now,
+            # Appended to review_events by the service
             "review_log_entry": {
                 "rating": rating.value,
-                "review_datetime": now.isoformat(),
+                "review_datetime": now,
                 "state_after": new_fsrs_state_enum.value,
                 "step": new_card.step,
             },
@@ -227,6 +271,100 @@ class MasteryLogic:
             "last_review": now,
         }
 
+    @classmethod
+    def calculate_implicit_review_updates(
+        cls, masteries: Sequence[UserMastery], now: datetime
+    ) -> list[dict[str, Any]]:
+        """Batch version of calculate_implicit_review_update.
+
+        Runs one vectorized FSRS review ('Good') over all records instead of
+        rebuilding a Card and calling the scheduler per record.
+
+        Args:
+            masteries: UserMastery records to update.
+            now: Current timestamp.
+
+        Returns:
+            List[Dict[str, Any]]: One update dictionary per record, in input order.
+        """
+        if not masteries:
+            return []
+
+        cards = cls.build_fsrs_card_batch(masteries)
+        new_cards = cls._fsrs_batch_scheduler.review(cards, Rating.Good, now)
+        retrievabilities = cls._fsrs_batch_scheduler.get_retrievability(
+            new_cards, now
+        )
+
+        states = [
+            cls.map_fsrs_state_to_enum(State(state)).value
+            for state in new_cards.state.tolist()
+        ]
+        due_dates = from_datetime64(new_cards.due)
+        return [
+            {
+                "cached_retrievability": retrievability,
+                "last_updated": now,
+                "fsrs_state": state,
+                "fsrs_stability": stability,
+                "fsrs_difficulty": difficulty,
+                "due_date": due_date,
+                "last_review": now,
+            }
+            for retrievability, state, stability, difficulty, due_date in zip(
+                retrievabilities.tolist(),
+                states,
+                new_cards.stability.tolist(),
+                new_cards.difficulty.tolist(),
+                due_dates,
+                strict=True,
+            )
+        ]
+
+    @classmethod
+    def get_current_retrievabilities(
+        cls, masteries: Sequence[UserMastery], now: datetime | None = None
+    ) -> np.ndarray:
+        """Calculate dynamic R(t) for many mastery records at once.
+
+        Args:
+            masteries: UserMastery records.
+            now: Optional timestamp, defaults to the current time.
+
+        Returns:
+            np.ndarray: Retrievability per record (0.0-1.0), in input order.
+        """
+        cards = cls.build_fsrs_card_batch(masteries)
+        return cls._fsrs_batch_scheduler.get_retrievability(cards, now or get_now())
+
+    @classmethod
+    def calculate_retrievabilities(
+        cls,
+        stabilities: Sequence[float | None],
+        last_reviews: Sequence[datetime | None],
+        now: datetime,
+    ) -> np.ndarray:
+        """Calculate R(t) from raw FSRS columns without building UserMastery objects.
+
+        Used by bulk jobs that stream (stability, last_review) pairs straight
+        from the database. Never-reviewed rows get 0.0, like a fresh Card.
+
+        Args:
+            stabilities: fsrs_stability per row.
+            last_reviews: last_review per row.
+            now: Timestamp to evaluate R(t) at.
+
+        Returns:
+            np.ndarray: Retrievability per row (0.0-1.0), in input order.
+        """
+        cards = FSRSCardBatch.empty(len(stabilities))
+        reviewed = np.array([lr is not None for lr in last_reviews], dtype=bool)
+        cards.stability = np.where(
+            reviewed, np.array([s or 0.0 for s in stabilities], dtype=np.float64), np.nan
+        )
+        cards.last_review = to_datetime64(list(last_reviews))
+        return cls._fsrs_batch_scheduler.get_retrievability(cards, now)
+
     @classmethod
     def get_current_retrievability(cls, mastery: UserMastery) -> float:
         """Calculate dynamic R(t) for a mastery record.
@@ -0,0 +1,150 @@
+"""
+Mastery Snapshot - Compact in-memory view of one user's mastery in one graph.
+
+The recommendation phases only need four values per mastery row: which node
+it belongs to, the FSRS stability, the due date and the cached R(t). Keeping
+them as parallel NumPy arrays (struct-of-arrays) instead of ORM objects makes
+a snapshot cheap to hold in a per-process cache and lets "which nodes are
+due" run as one vectorized comparison.
+
+Pure data structure (no DB access); see app/services/mastery_snapshot_cache.py.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import numpy as np
+
+# due_us value of rows without a due date (never due)
+NO_DUE = np.iinfo(np.int64).max
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# (node_id, fsrs_stability, due_date, cached_retrievability)
+SnapshotRow = tuple[UUID, float | None, datetime | None, float]
+
+
+def _to_us(value: datetime | None) -> int:
+    if value is None:
+        return NO_DUE
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+@dataclass
+class MasterySnapshot:
+    """
+    Struct-of-arrays mastery state, row i describing node_ids[i].
+
+    Attributes:
+        node_ids: Node UUID per row
+        index: {node_id: row}
+        stability: FSRS stability (NaN = never reviewed)
+        due_us: Due date in epoch microseconds (NO_DUE = none)
+        retrievability: Cached R(t)
+    """
+
+    node_ids: list[UUID] = field(default_factory=list)
+    index: dict[UUID, int] = field(default_factory=dict)
+    stability: np.ndarray = field(default_factory=lambda: np.empty(0))
+    due_us: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    retrievability: np.ndarray = field(default_factory=lambda: np.empty(0))
+    _digest: str | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[SnapshotRow]) -> "MasterySnapshot":
+        rows = list(rows)
+        node_ids = [row[0] for row in rows]
+        return cls(
+            node_ids=node_ids,
+            index={node_id: i for i, node_id in enumerate(node_ids)},
+            stability=np.array(
+                [np.nan if row[1] is None else row[1] for row in rows],
+                dtype=np.float64,
+            ),
+            due_us=np.array([_to_us(row[2]) for row in rows], dtype=np.int64),
+            retrievability=np.array([row[3] for row in rows], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: UUID) -> bool:
+        return node_id in self.index
+
+    # ==================== Reads ====================
+
+    def due_node_ids(self, now: datetime) -> list[UUID]:
+        """Nodes whose due date is at or before `now`."""
+        rows = np.flatnonzero(self.due_us <= _to_us(now))
+        return [self.node_ids[i] for i in rows.tolist()]
+
+    def due_date(self, node_id: UUID) -> datetime | None:
+        due_us = int(self.due_us[self.index[node_id]])
+        if due_us == NO_DUE:
+            return None
+        return _EPOCH + timedelta(microseconds=due_us)
+
+    def cached_retrievability(self, node_id: UUID, default: float) -> float:
+        i = self.index.get(node_id)
+        return default if i is None else float(self.retrievability[i])
+
+    def stability_map(self, node_ids: Iterable[UUID]) -> dict[UUID, float | None]:
+        """{node_id: stability} for the given nodes that have a row."""
+        result = {}
+        for node_id in node_ids:
+            i = self.index.get(node_id)
+            if i is not None:
+                value = float(self.stability[i])
+                result[node_id] = None if np.isnan(value) else value
+        return result
+
+    def digest(self) -> str:
+        """
+        Short hash of the snapshot state, independent of row order.
+
+        Two snapshots of the same rows (in any process) share a digest, so
+        it can key HTTP caches (ETags). Memoized until the next apply().
+        """
+        if self._digest is None:
+            order = np.array(
+                sorted(range(len(self.node_ids)), key=self.node_ids.__getitem__),
+                dtype=np.intp,
+            )
+            h = hashlib.blake2b(digest_size=8)
+            for i in order.tolist():
+                h.update(self.node_ids[i].bytes)
+            for column in (self.stability, self.due_us, self.retrievability):
+                h.update(np.ascontiguousarray(column[order]).tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    # ==================== Write-through ====================
+
+    def apply(self, rows: Iterable[SnapshotRow]) -> None:
+        """Update existing rows in place and append new ones."""
+        self._digest = None
+        appended: dict[UUID, SnapshotRow] = {}
+        for row in rows:
+            i = self.index.get(row[0])
+            if i is None:
+                appended[row[0]] = row
+                continue
+            self.stability[i] = np.nan if row[1] is None else row[1]
+            self.due_us[i] = _to_us(row[2])
+            self.retrievability[i] = row[3]
+
+        if appended:
+            tail = MasterySnapshot.from_rows(appended.values())
+            offset = len(self.node_ids)
+            self.node_ids.extend(tail.node_ids)
+            self.index.update(
+                (node_id, offset + i) for node_id, i in tail.index.items()
+            )
+            self.stability = np.concatenate([self.stability, tail.stability])
+            self.due_us = np.concatenate([self.due_us, tail.due_us])
+            self.retrievability = np.concatenate(
+                [self.retrievability, tail.retrievability]
+            )
@@ -104,7 +104,8 @@ class QuestionRecLogic:
             stabilities = []
 
             for pid in prereq_ids:
-                stability = stability_map.get(pid, 0.0)  # Default to 0 if not found
+                # Default to 0 if not found (or never reviewed)
+                stability = stability_map.get(pid) or 0.0
                 if stability < threshold:
                     all_learned = False
                     break
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -7,6 +8,8 @@ import app.models as models
 from app.core.config import settings
 from app.core.database import db_manager
 from app.routes import answer, knowledge_node, my_graphs, public_graph, question, user
+from app.services.auth_cache import user_cache
+from app.services.graph_content_cache import graph_content_cache
 
 
 # define lifespan
@@ -16,13 +19,25 @@ async def lifespan(app: FastAPI):
     try:
         await db_manager.initialize()
         await db_manager.create_all_tables(models.Base)
+        if settings.USER_CACHE_REDIS:
+            user_cache.redis_client = db_manager.redis_client
+        if settings.GRAPH_CONTENT_CACHE_REDIS:
+            graph_content_cache.redis_client = db_manager.redis_client
         print("✅ All databases initialized")
     except Exception as e:
         print(f"⚠️  Warning: Database initialization failed: {e}")
         print("⚠️  Application will start anyway (database endpoints may not work)")
 
+    pool_logger = None
+    if settings.DB_POOL_METRICS_LOG_INTERVAL > 0:
+        pool_logger = asyncio.create_task(
+            db_manager.log_pool_metrics(settings.DB_POOL_METRICS_LOG_INTERVAL)
+        )
+
     yield
     print("🌙 Application shutting down...")
+    if pool_logger is not None:
+        pool_logger.cancel()
 
     try:
         await db_manager.close()
@@ -65,6 +80,18 @@ async def health_check():
     }
 
 
+@app.get("/health/pool")
+async def pool_health():
+    """SQL connection pool gauges and checkout wait metrics of this instance."""
+    return db_manager.pool_status()
+
+
+@app.get("/health/graph-content-cache")
+async def graph_content_cache_health():
+    """Size and hit/miss counters of this instance's shared graph content cache."""
+    return graph_content_cache.stats()
+
+
 @app.get("/")
 async def root():
     return {"message": "FastAPI + PostgreSQL run successfully"}
@@ -2,9 +2,15 @@
 from app.models.base import Base
 from app.models.enrollment import GraphEnrollment
 from app.models.knowledge_graph import KnowledgeGraph
-from app.models.knowledge_node import KnowledgeNode, Prerequisite
+from app.models.knowledge_node import (
+    KnowledgeNode,
+    Prerequisite,
+    PrerequisiteClosure,
+)
+from app.models.processed_task import ProcessedTask
 from app.models.question import Question
 from app.models.quiz import SubmissionAnswer
+from app.models.review_event import ReviewEvent
 from app.models.user import User, UserMastery
 
 __all__ = [
@@ -15,6 +21,9 @@ __all__ = [
     "KnowledgeGraph",
     "KnowledgeNode",
     "Prerequisite",
+    "PrerequisiteClosure",
+    "ProcessedTask",
     "Question",
+    "ReviewEvent",
     "SubmissionAnswer",
 ]
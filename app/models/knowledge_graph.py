@@ -90,9 +90,19 @@ class KnowledgeGraph(Base):
         is_public: Whether visible to all users
         is_template: Whether this is an official template
         enrollment_count: Number of active learners
+        node_count / question_count / prerequisite_count: Denormalized row
+            counts, maintained in the same transaction as every insert
+            (reconcile with app/services/graph_counter_reconciliation.py)
         forked_from_id: Parent graph (reserved for future fork feature)
         allow_fork: Allow forking (reserved for future feature)
         allow_pr: Allow pull requests (reserved for future feature)
+        structure_version: Bumped whenever nodes or prerequisites are added
+            (invalidates in-process topology caches)
+        content_version: Bumped whenever nodes, prerequisites, questions or
+            node topology change (a superset of structure_version; drives
+            the ETags of content/visualization responses)
+        content_updated_at: When content_version was last bumped
+            (Last-Modified of content responses)
     """
 
     __tablename__ = "knowledge_graphs"
@@ -115,6 +125,21 @@ class KnowledgeGraph(Base):
 
     # Statistics
     enrollment_count = Column(Integer, default=0, nullable=False)
+    node_count = Column(Integer, default=0, server_default="0", nullable=False)
+    question_count = Column(Integer, default=0, server_default="0", nullable=False)
+    prerequisite_count = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
+    # Cache invalidation: bumped in the same transaction as structure changes
+    structure_version = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # HTTP validators: bumped with every node/edge/question write
+    content_version = Column(Integer, default=0, server_default="0", nullable=False)
+    content_updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
 
     # Future extensibility: Fork support (reserved for future use)
     forked_from_id = Column(
@@ -4,6 +4,7 @@ Knowledge Graph Content Layer - Nodes, edges, questions, and user mastery.
 This module defines the CONTENT layer that belongs to KnowledgeGraph containers:
 - KnowledgeNode: Concepts and topics (belongs to graph_id)
 - Prerequisite: Dependencies between nodes (graph_id scoped)
+- PrerequisiteClosure: Transitive ancestor index over Prerequisite
 - Subtopic: Hierarchical decomposition (graph_id scoped)
 - Question: Assessment items (graph_id scoped)
 - UserMastery: User learning progress (user_id + graph_id + node_id)
@@ -216,3 +217,59 @@ class Prerequisite(Base):
         return (
             f"<Prerequisite {self.from_node_id} -> {self.to_node_id} (w={self.weight})>"
         )
+
+
+class PrerequisiteClosure(Base):
+    """
+    Transitive closure of the prerequisite graph (materialized ancestor index).
+
+    One row per (ancestor, descendant) pair connected by a prerequisite path,
+    storing the length of the shortest path. Pairs further apart than
+    settings.PREREQUISITE_CLOSURE_MAX_DEPTH are not stored (their implicit
+    review probability 0.5**depth is negligible). Self pairs (from cycles) are
+    never stored.
+
+    Attributes:
+        graph_id: Which graph this pair belongs to
+        descendant_id: The node that depends on ancestor_id
+        ancestor_id: A direct or transitive prerequisite of descendant_id
+        min_depth: Shortest path length (1 = direct prerequisite)
+
+    Maintenance:
+        Updated incrementally by the prerequisite CRUD functions on every edge
+        insert; rebuilt per graph by app/services/prerequisite_closure.py.
+    """
+
+    __tablename__ = "prerequisite_closure"
+
+    graph_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("knowledge_graphs.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    descendant_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False)
+    ancestor_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False)
+    min_depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["graph_id", "descendant_id"],
+            ["knowledge_nodes.graph_id", "knowledge_nodes.id"],
+            ondelete="CASCADE",
+        ),
+        ForeignKeyConstraint(
+            ["graph_id", "ancestor_id"],
+            ["knowledge_nodes.graph_id", "knowledge_nodes.id"],
+            ondelete="CASCADE",
+        ),
+        CheckConstraint("min_depth >= 1", name="ck_closure_min_depth"),
+        # PK covers lookups by descendant; this one covers lookups by ancestor
+        Index("idx_closure_graph_ancestor", "graph_id", "ancestor_id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<PrerequisiteClosure {self.ancestor_id} -> {self.descendant_id} "
+            f"(depth={self.min_depth})>"
+        )
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class ProcessedTask(Base):
+    """
+    Idempotency record for background tasks.
+
+    A task claims its idempotency key in the same transaction as its writes,
+    so a redelivered task (worker restart, manual DLQ replay, inline fallback
+    racing the worker) finds the key taken and skips instead of applying its
+    effects twice.
+
+    Attributes:
+        idempotency_key: Unique key chosen by the enqueuer
+        task_type: Registered task type (see app/worker/config.py)
+        processed_at: When the task's effects were committed
+    """
+
+    __tablename__ = "processed_tasks"
+
+    idempotency_key = Column(String(255), primary_key=True)
+    task_type = Column(String(100), nullable=False)
+    processed_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<ProcessedTask {self.task_type} key={self.idempotency_key}>"
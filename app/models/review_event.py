@@ -0,0 +1,76 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKeyConstraint,
+    Identity,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.models.base import Base
+
+
+class ReviewEvent(Base):
+    """
+    One explicit FSRS review of a user's mastery node (append-only).
+
+    Replaces the former UserMastery.review_log JSONB array, which was
+    rewritten in full (TOAST included) on every answer. Rows are only ever
+    inserted; UserMastery.last_step keeps the one value the scheduler needs.
+    Only the most recent REVIEW_HISTORY_MAX_EVENTS rows per mastery are kept;
+    older ones are trimmed and survive as UserMastery.review_count,
+    lapse_count and first_review.
+
+    Attributes:
+        id: Monotonic id (tie-breaker for reviews with the same timestamp)
+        user_id / graph_id / node_id: The reviewed UserMastery row
+        rating: FSRS rating (1=Again .. 4=Easy)
+        state_after: FSRS state after the review (FSRSState value)
+        step: FSRS (re)learning step after the review
+        reviewed_at: Review time
+    """
+
+    __tablename__ = "review_events"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    graph_id = Column(UUID(as_uuid=True), nullable=False)
+    node_id = Column(UUID(as_uuid=True), nullable=False)
+    rating = Column(SmallInteger, nullable=False)
+    state_after = Column(String, nullable=False)
+    step = Column(Integer)
+    reviewed_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Many-to-one only (no collection on UserMastery, which would load the
+    # history); also orders the INSERT after a pending mastery row
+    mastery = relationship("UserMastery")
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["user_id", "graph_id", "node_id"],
+            [
+                "user_mastery.user_id",
+                "user_mastery.graph_id",
+                "user_mastery.node_id",
+            ],
+            ondelete="CASCADE",
+        ),
+        Index(
+            "idx_review_events_mastery",
+            "user_id",
+            "graph_id",
+            "node_id",
+            "reviewed_at",
+        ),
+    )
+
+    def __repr__(self):
+        return (
+            f"<ReviewEvent node={self.node_id} rating={self.rating} "
+            f"at={self.reviewed_at}>"
+        )
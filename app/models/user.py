@@ -11,9 +11,10 @@ from sqlalchemy import (
     ForeignKey,
     ForeignKeyConstraint,
     Index,
+    Integer,
     String,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -85,7 +86,10 @@ class UserMastery(Base):
     - fsrs_difficulty: Learning difficulty (1.0-10.0)
     - due_date: When next review is due
     - cached_retrievability: Snapshot of R(t) at last update (for visualization)
-    - review_log: Complete history for FSRS algorithm
+    - last_step: FSRS learning step after the last explicit review
+      (the recent history is append-only in review_events, see ReviewEvent)
+    - review_count / lapse_count / first_review: Lifetime summary of the
+      history, kept when old review_events are trimmed
 
     Architecture Decision:
     - FSRS used for: ALL review scheduling (from first answer onwards)
@@ -102,7 +106,10 @@ class UserMastery(Base):
         fsrs_difficulty: FSRS difficulty (1.0-10.0)
         due_date: Next review due date
         last_review: Last review timestamp
-        review_log: FSRS review history (JSONB array)
+        last_step: FSRS (re)learning step after the last explicit review
+        review_count: Total explicit reviews
+        lapse_count: Reviews rated Again while in the review state
+        first_review: First explicit review timestamp
         last_updated: Last update timestamp
     """
 
@@ -136,7 +143,14 @@ class UserMastery(Base):
     fsrs_difficulty = Column(Float)  # None until first review, range [1.0, 10.0]
     due_date = Column(DateTime(timezone=True), index=True)
     last_review = Column(DateTime(timezone=True))
-    review_log = Column(JSONB, default=list, nullable=False)  # Array of review records
+    # Only the step of the last review is needed to rebuild the FSRS card;
+    # the history itself lives in review_events (append-only)
+    last_step = Column(Integer)  # None until first explicit review
+    # Lifetime summary; review_events only keeps the most recent reviews
+    # (REVIEW_HISTORY_MAX_EVENTS), so totals are counted here
+    review_count = Column(Integer, default=0, server_default="0", nullable=False)
+    lapse_count = Column(Integer, default=0, server_default="0", nullable=False)
+    first_review = Column(DateTime(timezone=True))
 
     last_updated = Column(
         DateTime(timezone=True),
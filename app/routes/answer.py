@@ -7,23 +7,41 @@ this allows immediate feedback and adaptive learning.
 
 Key features:
 - Submit single answer
+- Submit a batch of answers (offline sync)
 - Immediate grading
 - Automatic mastery update
-- Background propagation (optional)
+- Background propagation (MASTERY_PROPAGATION_ASYNC: enqueued after commit)
 - Next question recommendation (future)
 """
 
 import logging
+from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_active_user, get_db
+from app.core.config import settings
+from app.core.deps import get_current_active_user, get_db, get_redis_client
+from app.crud import question as question_crud
+from app.models.knowledge_node import KnowledgeNode
 from app.models.quiz import SubmissionAnswer
 from app.models.user import User
-from app.schemas.quiz import SingleAnswerSubmitRequest, SingleAnswerSubmitResponse
-from app.services.grade_answer import GradingService
+from app.schemas.quiz import (
+    BatchAnswerItem,
+    BatchAnswerResult,
+    BatchAnswerSubmitRequest,
+    BatchAnswerSubmitResponse,
+    SingleAnswerSubmitRequest,
+    SingleAnswerSubmitResponse,
+)
+from app.services.grade_answer import GradingResult, GradingService
 from app.services.mastery import MasteryService
+from app.worker.config import PROPAGATE_MASTERY_TASK, enqueue_task
+from app.worker.handlers import propagation_idempotency_key
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +60,7 @@ async def submit_single_answer(
     answer_data: SingleAnswerSubmitRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Submit a single answer for immediate grading and mastery update.
@@ -50,16 +69,16 @@ async def submit_single_answer(
     1. Validates the question exists
     2. Grades the answer
     3. Saves the answer record
-    4. Updates user's mastery level (including propagation)
-    5. (Future) Recommends next question
-
-    Note: The mastery service handles propagation internally, updating
-    related nodes in the knowledge graph automatically.
+    4. Updates user's mastery level
+    5. Propagates to prerequisites: inline, or (MASTERY_PROPAGATION_ASYNC)
+       enqueued for the worker after commit
+    6. (Future) Recommends next question
 
     Args:
         answer_data: The answer submission data
         db: Database session
         current_user: Authenticated user
+        redis_client: Task queue client (used only with MASTERY_PROPAGATION_ASYNC)
 
     Returns:
         SingleAnswerSubmitResponse with grading result and mastery update status
@@ -76,18 +95,13 @@ async def submit_single_answer(
     grading_service = GradingService(db)
 
     # Extract the actual answer value based on question type
-    user_answer_dict = answer_data.user_answer.model_dump()
-    if user_answer_dict.get("question_type") == "multiple_choice":
-        answer_value = user_answer_dict.get("selected_option")
-    elif user_answer_dict.get("question_type") == "fill_in_the_blank":
-        answer_value = user_answer_dict.get("text_answer")
-    elif user_answer_dict.get("question_type") == "calculation":
-        answer_value = user_answer_dict.get("numeric_answer")
-    else:
-        answer_value = user_answer_dict
+    answer_value = _extract_answer_value(answer_data.user_answer.model_dump())
 
+    # Also preloads the node and the user's mastery row for Step 3
     grading_result = await grading_service.fetch_and_grade(
-        question_id=answer_data.question_id, user_answer={"user_answer": answer_value}
+        question_id=answer_data.question_id,
+        user_answer={"user_answer": answer_value},
+        user_id=current_user.id,
     )
 
     if not grading_result:
@@ -112,9 +126,11 @@ async def submit_single_answer(
     )
     db.add(submission_answer)
 
-    # Step 3: Update mastery level (propagation handled internally)
+    # Step 3: Update mastery level (propagation inline unless deferred)
     mastery_service = MasteryService()
     mastery_updated = False
+    defer_propagation = settings.MASTERY_PROPAGATION_ASYNC
+    knowledge_node_result = None
 
     try:
         knowledge_node_result = await mastery_service.update_mastery_from_grading(
@@ -122,6 +138,7 @@ async def submit_single_answer(
             user=current_user,
             question_id=answer_data.question_id,
             grading_result=grading_result,
+            propagate=not defer_propagation,
         )
 
         if knowledge_node_result:
@@ -157,9 +174,225 @@ async def submit_single_answer(
             detail="Failed to save answer",
         ) from e
 
+    # Step 5: Enqueue propagation only after the mastery row is committed
+    if defer_propagation and mastery_updated and grading_result.is_correct:
+        await _enqueue_propagation(
+            db,
+            redis_client,
+            mastery_service,
+            current_user,
+            knowledge_node_result,
+            grading_result,
+            propagation_idempotency_key(submission_answer.id),
+        )
+
     return SingleAnswerSubmitResponse(
         answer_id=submission_answer.id,
         is_correct=grading_result.is_correct,
         mastery_updated=mastery_updated,
         correct_answer=grading_result.correct_answer,
     )
+
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BatchAnswerSubmitResponse,
+)
+async def submit_answer_batch(
+    batch: BatchAnswerSubmitRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    redis_client: Redis = Depends(get_redis_client),
+):
+    """
+    Submit many answers at once (e.g. an offline client flushing its queue).
+
+    Same effect as calling POST /answer once per answer, in a fixed number of
+    queries:
+    1. Loads all questions with their nodes in one query
+    2. Grades every answer in memory
+    3. Saves all answer records with one multi-row INSERT
+    4. Loads/creates all mastery rows in bulk and applies FSRS updates in
+       answered_at order
+    5. Propagates correct answers (inline, or enqueued after commit)
+    6. Commits once
+
+    Answers whose question does not exist are reported with an error and
+    not saved; the rest of the batch is still processed.
+
+    Args:
+        batch: The answers, each with an optional answered_at timestamp
+        db: Database session
+        current_user: Authenticated user
+        redis_client: Task queue client (used only with MASTERY_PROPAGATION_ASYNC)
+
+    Returns:
+        BatchAnswerSubmitResponse with one result per answer, in request order
+
+    Raises:
+        HTTPException 500: Saving the answers failed
+    """
+    now = datetime.now(UTC)
+    answers = batch.answers
+    logger.info(f"User {current_user.id} submitting a batch of {len(answers)} answers")
+
+    # Step 1: Bulk load questions + nodes
+    questions = await question_crud.get_questions_with_nodes(
+        db, [answer.question_id for answer in answers]
+    )
+
+    # Step 2: Grade in memory
+    grading_service = GradingService(db)
+    results = [BatchAnswerResult(question_id=a.question_id) for a in answers]
+    graded: list[tuple[int, KnowledgeNode, GradingResult, datetime]] = []
+    for i, answer in enumerate(answers):
+        loaded = questions.get(answer.question_id)
+        if loaded is None:
+            results[i].error = f"Question {answer.question_id} not found"
+            continue
+        question, node = loaded
+        answer_value = _extract_answer_value(answer.user_answer.model_dump())
+        try:
+            grading_result = grading_service.grade_question(
+                question, {"user_answer": answer_value}
+            )
+        except Exception as e:
+            logger.error(f"Grading failed for {answer.question_id}: {e}", exc_info=True)
+            results[i].error = f"Question {answer.question_id} could not be graded"
+            continue
+        results[i].is_correct = grading_result.is_correct
+        results[i].correct_answer = grading_result.correct_answer
+        graded.append((i, node, grading_result, _normalize_answered_at(answer, now)))
+
+    if not graded:
+        return BatchAnswerSubmitResponse(results=results)
+
+    # Step 3: Save all answer records (one multi-row INSERT)
+    submission_rows = [
+        {
+            "id": uuid4(),
+            "user_id": current_user.id,
+            "graph_id": answers[i].graph_id,
+            "question_id": answers[i].question_id,
+            "user_answer": answers[i].user_answer.model_dump(),
+            "is_correct": grading_result.is_correct,
+            "created_at": answered_at,
+        }
+        for i, _, grading_result, answered_at in graded
+    ]
+    await db.execute(insert(SubmissionAnswer).values(submission_rows))
+    for (i, *_), row in zip(graded, submission_rows, strict=True):
+        results[i].answer_id = row["id"]
+
+    # Step 4: Bulk mastery update
+    mastery_service = MasteryService()
+    defer_propagation = settings.MASTERY_PROPAGATION_ASYNC
+    mastery_updated = False
+    try:
+        async with db.begin_nested():
+            await mastery_service.update_masteries_from_batch(
+                db,
+                current_user,
+                [(node, result, at) for _, node, result, at in graded],
+                propagate=not defer_propagation,
+            )
+        mastery_updated = True
+    except Exception as e:
+        logger.error(f"Batch mastery update failed: {e}", exc_info=True)
+
+    # Step 5: Commit once
+    try:
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Failed to save answer batch: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save answers",
+        ) from e
+
+    for i, *_ in graded:
+        results[i].mastery_updated = mastery_updated
+
+    # Step 6: Enqueue propagation only after the mastery rows are committed
+    if defer_propagation and mastery_updated:
+        for i, node, grading_result, _ in graded:
+            if grading_result.is_correct:
+                await _enqueue_propagation(
+                    db,
+                    redis_client,
+                    mastery_service,
+                    current_user,
+                    node,
+                    grading_result,
+                    propagation_idempotency_key(results[i].answer_id),
+                )
+
+    return BatchAnswerSubmitResponse(results=results)
+
+
+def _extract_answer_value(user_answer_dict: dict[str, Any]) -> Any:
+    """Extract the graded value from an answer based on its question type."""
+    question_type = user_answer_dict.get("question_type")
+    if question_type == "multiple_choice":
+        return user_answer_dict.get("selected_option")
+    if question_type == "fill_in_the_blank":
+        return user_answer_dict.get("text_answer")
+    if question_type == "calculation":
+        return user_answer_dict.get("numeric_answer")
+    return user_answer_dict
+
+
+def _normalize_answered_at(answer: BatchAnswerItem, now: datetime) -> datetime:
+    """Timezone-aware answer time, never in the future (naive = UTC)."""
+    answered_at = answer.answered_at or now
+    if answered_at.tzinfo is None:
+        answered_at = answered_at.replace(tzinfo=UTC)
+    return min(answered_at, now)
+
+
+async def _enqueue_propagation(
+    db: AsyncSession,
+    redis_client: Redis,
+    mastery_service: MasteryService,
+    user: User,
+    knowledge_node: KnowledgeNode,
+    grading_result: GradingResult,
+    idempotency_key: str,
+) -> None:
+    """
+    Hand propagation to the worker; fall back to running it inline if the
+    queue is unavailable. Never fails the request (the answer is saved).
+    """
+    try:
+        await enqueue_task(
+            redis_client,
+            PROPAGATE_MASTERY_TASK,
+            {
+                "user_id": str(user.id),
+                "node_id": str(knowledge_node.id),
+                "is_correct": grading_result.is_correct,
+                "p_g": grading_result.p_g,
+                "p_s": grading_result.p_s,
+            },
+            idempotency_key=idempotency_key,
+        )
+        return
+    except Exception as e:
+        logger.warning(f"Enqueue failed, propagating inline: {e}")
+
+    try:
+        await mastery_service.propagate_mastery_once(
+            db,
+            user,
+            knowledge_node,
+            grading_result.is_correct,
+            grading_result.p_g,
+            grading_result.p_s,
+            idempotency_key,
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Inline propagation failed: {e}", exc_info=True)
@@ -8,7 +8,18 @@ All endpoints require the user to be the owner of the graph.
 import logging
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,6 +30,7 @@ from app.crud.knowledge_graph import (
     get_graph_by_owner_and_slug,
     get_graphs_by_owner,
 )
+from app.domain.graph_binary import MEDIA_TYPE as GRAPH_BINARY_MEDIA_TYPE
 from app.models.enrollment import GraphEnrollment
 from app.models.knowledge_node import KnowledgeNode
 from app.models.user import User
@@ -35,8 +47,10 @@ from app.schemas.knowledge_graph import (
 )
 from app.schemas.questions import GenerateQuestionsRequest
 from app.services.ai.question_generation import generate_questions_for_graph
+from app.services.mastery_snapshot_cache import mastery_snapshot_cache
 from app.services.pipeline.node_generation_pipeline import NodeGenerationService
 from app.services.pipeline.pdf_pipeline import PDFPipeline
+from app.utils.http_cache import accepts, cache_headers, not_modified
 from app.utils.slug import slugify
 from app.utils.storage import save_upload_file
 
@@ -113,17 +127,23 @@ async def get_my_graph(
     summary="Get visualization data for your own knowledge graph",
 )
 async def get_my_graph_visualization(
+    request: Request,
+    response: Response,
     knowledge_graph=Depends(get_owned_graph),
+    stream: bool = Query(False, description="Stream the JSON document in chunks"),
     db_session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> GraphVisualization:
+) -> GraphVisualization | StreamingResponse:
     """
     Get visualization data for a knowledge graph you own.
 
     Returns all nodes with mastery scores and all edges for rendering.
 
     Args:
+        request: Incoming request (Accept / If-None-Match / If-Modified-Since)
+        response: Outgoing response (ETag / Last-Modified are set on it)
         knowledge_graph: Owned knowledge graph (injected by get_owned_graph dependency)
+        stream: Stream the JSON document in chunks instead of building it
         db_session: Database session
         current_user: Authenticated user
 
@@ -131,10 +151,43 @@ async def get_my_graph_visualization(
         HTTPException 404: If the knowledge graph doesn't exist
         HTTPException 403: If you are not the owner
     """
+    snapshot = await mastery_snapshot_cache.get(
+        db_session, current_user.id, knowledge_graph.id
+    )
+    from app.services.graph_content import GraphContentService
+
+    graph_service = GraphContentService()
+    binary = accepts(request, GRAPH_BINARY_MEDIA_TYPE)
+    etag = graph_service.visualization_etag(knowledge_graph, snapshot, binary, stream)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    headers = cache_headers(etag)
+
+    if binary:
+        return Response(
+            content=await graph_service.get_graph_visualization_binary(
+                db_session, knowledge_graph.id, snapshot
+            ),
+            media_type=GRAPH_BINARY_MEDIA_TYPE,
+            headers=headers,
+        )
+    if stream:
+        return StreamingResponse(
+            graph_service.stream_graph_visualization(
+                db_session, knowledge_graph.id, snapshot
+            ),
+            media_type="application/json",
+            headers=headers,
+        )
     visualization = await get_graph_visualization(
-        db_session=db_session, graph_id=knowledge_graph.id, user_id=current_user.id
+        db_session=db_session,
+        graph_id=knowledge_graph.id,
+        user_id=current_user.id,
+        snapshot=snapshot,
     )
 
+    response.headers.update(headers)
     return visualization
 
 
@@ -145,10 +198,13 @@ async def get_my_graph_visualization(
     summary="Get complete content of a knowledge graph",
 )
 async def get_my_graph_content(
+    request: Request,
+    response: Response,
     knowledge_graph=Depends(get_owned_graph),
+    stream: bool = Query(False, description="Stream the JSON document in chunks"),
     db_session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> GraphContentResponse:
+) -> GraphContentResponse | StreamingResponse:
     """
     Get complete content of a knowledge graph including all nodes and relations.
 
@@ -158,7 +214,10 @@ async def get_my_graph_content(
         - prerequisites: All prerequisite relationships
 
     Args:
+        request: Incoming request (Accept / If-None-Match / If-Modified-Since)
+        response: Outgoing response (ETag / Last-Modified are set on it)
         knowledge_graph: Owned knowledge graph (injected by get_owned_graph dependency)
+        stream: Stream the JSON document in chunks instead of building it
         db_session: Database session
         current_user: Authenticated user
 
@@ -170,11 +229,45 @@ async def get_my_graph_content(
     from app.services.graph_content import GraphContentService
 
     graph_service = GraphContentService()
-    return await graph_service.get_graph_full_content(
+    binary = accepts(request, GRAPH_BINARY_MEDIA_TYPE)
+    # Revalidate before reading any node or prerequisite
+    is_enrolled = await graph_service.is_user_enrolled(
+        db_session, knowledge_graph.id, current_user.id
+    )
+    etag, last_modified = graph_service.content_validators(
+        knowledge_graph, is_enrolled, binary, stream
+    )
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    headers = cache_headers(etag, last_modified)
+
+    if binary:
+        graph_response = await graph_service.enrich_graph_with_metadata(
+            db_session=db_session, graph=knowledge_graph, user_id=current_user.id
+        )
+        return Response(
+            content=await graph_service.get_graph_content_binary(
+                db_session, graph_response
+            ),
+            media_type=GRAPH_BINARY_MEDIA_TYPE,
+            headers=headers,
+        )
+    if stream:
+        return StreamingResponse(
+            graph_service.stream_graph_full_content(
+                db_session, knowledge_graph, current_user.id
+            ),
+            media_type="application/json",
+            headers=headers,
+        )
+    content = await graph_service.get_graph_full_content(
         db_session=db_session,
         graph=knowledge_graph,
         user_id=current_user.id,
     )
+    response.headers.update(headers)
+    return content
 
 
 @router.post(
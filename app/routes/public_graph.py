@@ -6,10 +6,19 @@ Public graphs can be accessed by any authenticated user for learning purposes.
 """
 
 import logging
-import random
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,8 +27,9 @@ from app.crud.graph_structure import get_graph_visualization
 from app.crud.knowledge_graph import (
     get_all_template_graphs,
     get_graph_by_id,
+    get_template_graph_versions,
 )
-from app.crud.question import get_questions_by_node
+from app.domain.graph_binary import MEDIA_TYPE as GRAPH_BINARY_MEDIA_TYPE
 from app.models.enrollment import GraphEnrollment
 from app.models.user import User
 from app.routes.question import NextQuestionResponse, _convert_question_to_schema
@@ -29,7 +39,9 @@ from app.schemas.knowledge_graph import (
     GraphVisualization,
     KnowledgeGraphResponse,
 )
+from app.services.mastery_snapshot_cache import mastery_snapshot_cache
 from app.services.question_rec import QuestionService
+from app.utils.http_cache import accepts, cache_headers, not_modified
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +58,8 @@ router = APIRouter(
     summary="Get all template knowledge graphs",
 )
 async def get_template_graphs(
+    request: Request,
+    response: Response,
     db_session: AsyncSession = Depends(get_db),
     current_user: User | None = Depends(get_optional_user),
 ):
@@ -71,10 +85,21 @@ async def get_template_graphs(
     - Browsing available official curricula
     - Checking enrollment status across all templates
     - Selecting a template to enroll in
+
+    Conditional requests (If-None-Match / If-Modified-Since) are answered
+    with 304 from the templates' versions, before node counts are computed.
     """
-    templates = await get_all_template_graphs(
-        db_session=db_session, user_id=current_user.id if current_user else None
-    )
+    from app.services.graph_content import GraphContentService
+
+    user_id = current_user.id if current_user else None
+    versions = await get_template_graph_versions(db_session, user_id=user_id)
+    etag, last_modified = GraphContentService.template_listing_validators(versions)
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+
+    templates = await get_all_template_graphs(db_session=db_session, user_id=user_id)
+    response.headers.update(cache_headers(etag, last_modified))
     return templates
 
 
@@ -253,7 +278,7 @@ async def get_next_question_in_enrolled_graph(
     question_service = QuestionService()
 
     try:
-        selection_result = await question_service.select_next_node(
+        selection_result = await question_service.select_next_question(
             db_session=db_session, user_id=current_user.id, graph_id=graph_id
         )
         if not selection_result.knowledge_node:
@@ -270,12 +295,10 @@ async def get_next_question_in_enrolled_graph(
 
         node_id = selection_result.knowledge_node.id
 
-        # Get all questions for this node from CRUD layer
-        questions = await get_questions_by_node(
-            db_session=db_session, graph_id=graph_id, node_id=node_id
-        )
+        # The question was picked in the same query as the node
+        question_model = selection_result.question
 
-        if not questions:
+        if question_model is None:
             logger.warning(
                 f"Node {node_id} was selected but has no questions. "
                 f"This should not happen."
@@ -287,9 +310,6 @@ async def get_next_question_in_enrolled_graph(
                 priority_score=selection_result.priority_score,
             )
 
-        # Randomly select one question from the list
-        question_model = random.choice(questions)
-
         # Convert Question model to AnyQuestion schema
         question_schema = _convert_question_to_schema(question_model)
 
@@ -325,10 +345,13 @@ async def get_next_question_in_enrolled_graph(
     summary="Get knowledge graph visualization data",
 )
 async def get_graph_visualization_endpoint(
+    request: Request,
+    response: Response,
     graph_id: UUID = Path(..., description="Knowledge graph UUID"),
+    stream: bool = Query(False, description="Stream the JSON document in chunks"),
     db_session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> GraphVisualization:
+) -> GraphVisualization | StreamingResponse:
     """
     Get visualization data for a knowledge graph.
 
@@ -336,7 +359,10 @@ async def get_graph_visualization_endpoint(
     for rendering a knowledge graph visualization.
 
     Args:
+        request: Incoming request (Accept / If-None-Match / If-Modified-Since)
+        response: Outgoing response (ETag / Last-Modified are set on it)
         graph_id: Knowledge graph UUID
+        stream: Stream the JSON document in chunks instead of building it
         db_session: Database session
         current_user: Authenticated user
 
@@ -373,10 +399,50 @@ async def get_graph_visualization_endpoint(
             )
 
     # Get visualization data
+    snapshot = await mastery_snapshot_cache.get(
+        db_session, current_user.id, graph_id
+    )
+    from app.services.graph_content import GraphContentService
+
+    graph_service = GraphContentService()
+    binary = accepts(request, GRAPH_BINARY_MEDIA_TYPE)
+    etag = graph_service.visualization_etag(knowledge_graph, snapshot, binary, stream)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    headers = cache_headers(etag)
+
+    if binary:
+        return Response(
+            content=await graph_service.get_graph_visualization_binary(
+                db_session, graph_id, snapshot
+            ),
+            media_type=GRAPH_BINARY_MEDIA_TYPE,
+            headers=headers,
+        )
+    if stream:
+        return StreamingResponse(
+            graph_service.stream_graph_visualization(db_session, graph_id, snapshot),
+            media_type="application/json",
+            headers=headers,
+        )
+    if knowledge_graph.is_public or knowledge_graph.is_template:
+        # Shared by every learner: only the mastery scores are encoded per user
+        return Response(
+            content=await graph_service.get_shared_graph_visualization(
+                db_session, knowledge_graph, snapshot
+            ),
+            media_type="application/json",
+            headers=headers,
+        )
     visualization = await get_graph_visualization(
-        db_session=db_session, graph_id=graph_id, user_id=current_user.id
+        db_session=db_session,
+        graph_id=graph_id,
+        user_id=current_user.id,
+        snapshot=snapshot,
     )
 
+    response.headers.update(headers)
     return visualization
 
 
@@ -387,10 +453,12 @@ async def get_graph_visualization_endpoint(
     summary="Get complete content of a public or template knowledge graph",
 )
 async def get_public_graph_content(
+    request: Request,
     graph_id: UUID = Path(..., description="Knowledge graph UUID"),
+    stream: bool = Query(False, description="Stream the JSON document in chunks"),
     db_session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> GraphContentResponse:
+) -> Response:
     """
     Get complete content of a public or template knowledge graph.
 
@@ -425,8 +493,43 @@ async def get_public_graph_content(
     from app.services.graph_content import GraphContentService
 
     graph_service = GraphContentService()
-    return await graph_service.get_graph_full_content(
-        db_session=db_session,
-        graph=knowledge_graph,
-        user_id=current_user.id,
+    binary = accepts(request, GRAPH_BINARY_MEDIA_TYPE)
+    # Revalidate before reading any node or prerequisite
+    is_enrolled = await graph_service.is_user_enrolled(
+        db_session, knowledge_graph.id, current_user.id
+    )
+    etag, last_modified = graph_service.content_validators(
+        knowledge_graph, is_enrolled, binary, stream
+    )
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    headers = cache_headers(etag, last_modified)
+
+    if binary:
+        graph_response = await graph_service.enrich_graph_with_metadata(
+            db_session=db_session, graph=knowledge_graph, user_id=current_user.id
+        )
+        return Response(
+            content=await graph_service.get_graph_content_binary(
+                db_session, graph_response
+            ),
+            media_type=GRAPH_BINARY_MEDIA_TYPE,
+            headers=headers,
+        )
+    if stream:
+        return StreamingResponse(
+            graph_service.stream_graph_full_content(
+                db_session, knowledge_graph, current_user.id
+            ),
+            media_type="application/json",
+            headers=headers,
+        )
+    # Public/template content is the same for every learner except is_enrolled
+    return Response(
+        content=await graph_service.get_shared_graph_content(
+            db_session, knowledge_graph, is_enrolled
+        ),
+        media_type="application/json",
+        headers=headers,
     )
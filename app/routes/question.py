@@ -8,7 +8,6 @@ Note: Question creation is handled in knowledge_node.py under /me/graphs/{graph_
 """
 
 import logging
-import random
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Path, status
@@ -17,7 +16,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_active_user, get_db
 from app.crud.knowledge_graph import get_graph_by_id
-from app.crud.question import get_questions_by_node
 from app.models.question import Question
 from app.models.user import User
 from app.schemas.questions import AnyQuestion
@@ -115,7 +113,7 @@ async def get_next_question(
     question_service = QuestionService()
 
     try:
-        selection_result = await question_service.select_next_node(
+        selection_result = await question_service.select_next_question(
             db_session=db, user_id=current_user.id, graph_id=graph_id
         )
 
@@ -131,15 +129,12 @@ async def get_next_question(
                 priority_score=None,
             )
 
-        # Get a random question from the selected node
         node_id = selection_result.knowledge_node.id
 
-        # Get all questions for this node from CRUD layer
-        questions = await get_questions_by_node(
-            db_session=db, graph_id=graph_id, node_id=node_id
-        )
+        # The question was picked in the same query as the node
+        question_model = selection_result.question
 
-        if not questions:
+        if question_model is None:
             logger.warning(
                 f"Node {node_id} was selected but has no questions. "
                 f"This should not happen."
@@ -151,9 +146,6 @@ async def get_next_question(
                 priority_score=selection_result.priority_score,
             )
 
-        # Randomly select one question from the list
-        question_model = random.choice(questions)
-
         # Convert Question model to AnyQuestion schema
         question_schema = _convert_question_to_schema(question_model)
 
@@ -1,6 +1,7 @@
+from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.questions import (
     AnyAnswer,
@@ -41,3 +42,53 @@ class SingleAnswerSubmitResponse(BaseModel):
     is_correct: bool
     mastery_updated: bool
     correct_answer: AnyAnswer
+
+
+# ==================== Batch Answer Submission Schemas ====================
+
+MAX_BATCH_ANSWERS = 100
+
+
+class BatchAnswerItem(SingleAnswerSubmitRequest):
+    """One answer in a batch submission.
+
+    Attributes:
+        answered_at: When the user answered (offline clients); defaults to
+            the time the batch is received. Future timestamps are clamped.
+    """
+
+    answered_at: datetime | None = None
+
+
+class BatchAnswerSubmitRequest(BaseModel):
+    """Request schema for submitting many answers at once (offline sync)."""
+
+    answers: list[BatchAnswerItem] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_ANSWERS
+    )
+
+
+class BatchAnswerResult(BaseModel):
+    """Per-answer result of a batch submission, in request order.
+
+    Attributes:
+        question_id: UUID of the answered question
+        answer_id: UUID of the saved answer record (None if not saved)
+        is_correct: Whether the answer was correct
+        mastery_updated: Whether mastery level was updated
+        correct_answer: The correct answer (None if the question was not found)
+        error: Why the answer was not saved, if it was not
+    """
+
+    question_id: UUID
+    answer_id: UUID | None = None
+    is_correct: bool = False
+    mastery_updated: bool = False
+    correct_answer: AnyAnswer | None = None
+    error: str | None = None
+
+
+class BatchAnswerSubmitResponse(BaseModel):
+    """Response schema for batch answer submission."""
+
+    results: list[BatchAnswerResult]
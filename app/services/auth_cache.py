@@ -0,0 +1,264 @@
+"""
+Auth Cache - Short-lived caches for the authentication dependencies.
+
+Every authenticated request used to verify the JWT signature and then load
+the user row from Postgres before the route did any work. Both results are
+stable for a while, so app/core/deps.py consults two per-process caches:
+
+- TokenCache: verified JWT payloads keyed by SHA-256 of the token, kept
+  until the token's own `exp` (LRU-bounded by settings.JWT_CACHE_SIZE)
+- UserCache: the user's column values keyed by user id (the JWT `sub`),
+  kept for settings.USER_CACHE_TTL_SECONDS (LRU-bounded by
+  settings.USER_CACHE_SIZE). With settings.USER_CACHE_REDIS the entries are
+  also shared through Redis, so a fresh process does not start cold
+
+A committed UPDATE/DELETE of a User through the ORM evicts its entry (local
+immediately, Redis best effort). Changes made outside this process's ORM
+are picked up when the TTL expires.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.crud.user import get_user_by_id
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "auth:user"
+
+# Columns kept per user (everything UserRead and the routes need)
+_USER_FIELDS = ("id", "name", "email", "is_active", "is_admin")
+_USER_TIMESTAMPS = ("created_at", "updated_at")
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """LRU cache of {sha256(token): (expires_at, payload)}."""
+
+    def __init__(self, max_size: int = settings.JWT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get(self, token: str) -> dict | None:
+        """Return the cached payload of a verified, not yet expired token."""
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, token: str, payload: dict) -> None:
+        """Remember a verified payload (tokens without `exp` are not cached)."""
+        exp = payload.get("exp")
+        if not isinstance(exp, int | float) or self.max_size <= 0:
+            return
+        key = _token_key(token)
+        self._entries[key] = (float(exp), payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class UserCache:
+    """TTL + LRU cache of {user_id: user column values}, optionally in Redis."""
+
+    def __init__(
+        self,
+        max_size: int = settings.USER_CACHE_SIZE,
+        ttl_seconds: float = settings.USER_CACHE_TTL_SECONDS,
+        redis_client: Redis | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.redis_client = redis_client
+        self._entries: OrderedDict[UUID, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_user(self, db_session: AsyncSession, user_id: UUID) -> User | None:
+        """
+        Get a user, from the cache if possible, else from the database.
+
+        Cached users are returned as detached User instances (a new one per
+        call): column attributes work as usual, relationships are not loaded.
+
+        Args:
+            db_session: Database session (used on a miss)
+            user_id: User UUID
+
+        Returns:
+            User or None if the user does not exist
+        """
+        if not self.enabled:
+            return await get_user_by_id(db=db_session, user_id=user_id)
+
+        fields = self._get_local(user_id)
+        if fields is None:
+            fields = await self._get_redis(user_id)
+            if fields is not None:
+                self._set_local(user_id, fields)
+        if fields is not None:
+            self.hits += 1
+            return _user_from_fields(fields)
+
+        self.misses += 1
+        user = await get_user_by_id(db=db_session, user_id=user_id)
+        if user is not None:
+            fields = _fields_from_user(user)
+            self._set_local(user_id, fields)
+            await self._set_redis(user_id, fields)
+        return user
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a user from both tiers."""
+        self._entries.pop(user_id, None)
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.delete(f"{REDIS_KEY_PREFIX}:{user_id}")
+            except Exception as e:
+                logger.warning(f"User cache invalidation in Redis failed: {e}")
+
+    def discard(self, user_id: UUID) -> None:
+        """Synchronous invalidate (for ORM events): Redis delete is scheduled."""
+        self._entries.pop(user_id, None)
+        if self.redis_client is None:
+            return
+        try:
+            asyncio.get_running_loop().create_task(self.invalidate(user_id))
+        except RuntimeError:
+            pass  # no running loop: the Redis entry expires by TTL
+
+    # ==================== Tiers ====================
+
+    def _get_local(self, user_id: UUID) -> dict[str, Any] | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[1]
+
+    def _set_local(self, user_id: UUID, fields: dict[str, Any]) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, fields)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _get_redis(self, user_id: UUID) -> dict[str, Any] | None:
+        if self.redis_client is None:
+            return None
+        try:
+            data = await self.redis_client.get(f"{REDIS_KEY_PREFIX}:{user_id}")
+        except Exception as e:
+            logger.warning(f"User cache read from Redis failed: {e}")
+            return None
+        return json.loads(data) if data else None
+
+    async def _set_redis(self, user_id: UUID, fields: dict[str, Any]) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.set(
+                f"{REDIS_KEY_PREFIX}:{user_id}",
+                json.dumps(fields),
+                ex=max(1, int(self.ttl_seconds)),
+            )
+        except Exception as e:
+            logger.warning(f"User cache write to Redis failed: {e}")
+
+
+def _fields_from_user(user: User) -> dict[str, Any]:
+    """JSON-serializable column values of a loaded user."""
+    fields = {name: getattr(user, name) for name in _USER_FIELDS}
+    fields["id"] = str(user.id)
+    for name in _USER_TIMESTAMPS:
+        value = getattr(user, name)
+        fields[name] = value.isoformat() if value is not None else None
+    return fields
+
+
+def _user_from_fields(fields: dict[str, Any]) -> User:
+    """Rebuild a detached User (adding it to a session will not INSERT it)."""
+    values = {name: fields[name] for name in _USER_FIELDS}
+    values["id"] = UUID(fields["id"])
+    for name in _USER_TIMESTAMPS:
+        value = fields.get(name)
+        values[name] = datetime.fromisoformat(value) if value else None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+# Shared per-process instances
+token_cache = TokenCache()
+user_cache = UserCache()
+
+
+# ==================== Invalidation ====================
+# Ids are collected at flush and evicted only once the change is committed,
+# so a concurrent request cannot re-cache the old row in between.
+
+_PENDING_KEY = "auth_cache_invalidate"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = {
+        obj.id
+        for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    }
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.discard(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -148,67 +148,88 @@ class GradingService:
                 f"Internal grading error for question {question.id}"
             ) from e
 
+    def grade_question(self, question: Question, user_answer: dict) -> GradingResult:
+        """Grade an answer against an already loaded question.
+
+        Grading errors do not raise: they produce is_correct=False so the
+        user doesn't get points for a system error.
+
+        Args:
+            question: The Question model (already fetched)
+            user_answer: Dictionary containing the user's answer
+
+        Returns:
+            GradingResult with BKT parameters
+        """
+        try:
+            is_correct, p_g, p_s = self.grade_answer(question, user_answer)
+        except GradingError as e:
+            logging.error(f"Failed to grade question {question.id}: {e}", exc_info=True)
+            # Return a default GradingResult indicating failure but not crashing
+            # The is_correct=False ensures user doesn't get points for system error
+            correct_answer = GradingLogic.build_correct_answer_schema(
+                question.question_type, question.details
+            )
+            return GradingResult(
+                question_id=str(question.id),
+                is_correct=False,
+                correct_answer=correct_answer,
+                p_g=0.0,
+                p_s=0.1,
+            )
+
+        # Build correct answer schema using GradingLogic
+        correct_answer = GradingLogic.build_correct_answer_schema(
+            question.question_type, question.details
+        )
+
+        return GradingResult(
+            question_id=str(question.id),
+            is_correct=is_correct,
+            correct_answer=correct_answer,
+            p_g=p_g,
+            p_s=p_s,
+        )
+
     async def fetch_and_grade(
-        self, question_id: UUID, user_answer: dict
+        self, question_id: UUID, user_answer: dict, user_id: UUID | None = None
     ) -> GradingResult | None:
         """Fetch question from PostgreSQL and grade the answer.
 
         This is the main entry point for grading a single answer.
         It handles:
-        1. Fetching the question from PostgreSQL
+        1. Fetching the question (with its node) from PostgreSQL
         2. Grading the answer via GradingLogic
         3. Packaging the result with BKT parameters
 
+        The question, its node and (if user_id is given) the user's mastery
+        row are loaded in one query and kept in the per-request identity
+        cache, so a following MasteryService.update_mastery_from_grading on the same
+        session does not fetch them again.
+
         Args:
             question_id: UUID of the question to grade
             user_answer: Dictionary containing the user's answer
+            user_id: Answering user, to preload their mastery row
 
         Returns:
             GradingResult if question exists, None if not found
         """
         try:
             # Fetch question from PostgreSQL using CRUD layer
-            question = await crud_question.get_question_by_id(self.db, question_id)
+            loaded = await crud_question.get_question_with_node(
+                self.db, question_id, user_id=user_id
+            )
 
-            if not question:
+            if not loaded:
                 logging.warning(
                     f"Question {question_id} not found in PostgreSQL database, "
                     f"cannot grade answer"
                 )
                 return None
 
-            # Grade the answer
-            try:
-                is_correct, p_g, p_s = self.grade_answer(question, user_answer)
-            except GradingError as e:
-                logging.error(
-                    f"Failed to grade question {question_id}: {e}", exc_info=True
-                )
-                # Return a default GradingResult indicating failure but not crashing
-                # The is_correct=False ensures user doesn't get points for system error
-                correct_answer = GradingLogic.build_correct_answer_schema(
-                    question.question_type, question.details
-                )
-                return GradingResult(
-                    question_id=str(question_id),
-                    is_correct=False,
-                    correct_answer=correct_answer,
-                    p_g=0.0,
-                    p_s=0.1,
-                )
-
-            # Build correct answer schema using GradingLogic
-            correct_answer = GradingLogic.build_correct_answer_schema(
-                question.question_type, question.details
-            )
-
-            return GradingResult(
-                question_id=str(question_id),
-                is_correct=is_correct,
-                correct_answer=correct_answer,
-                p_g=p_g,
-                p_s=p_s,
-            )
+            question, _ = loaded
+            return self.grade_question(question, user_answer)
 
         except Exception as e:
             logging.error(
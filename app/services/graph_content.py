@@ -3,24 +3,41 @@ Graph Content Service
 
 This service handles retrieval and enrichment of knowledge graph content,
 providing methods to fetch complete graph data and compute metadata.
+
+The stream_* methods produce the same JSON documents as the list-building
+methods, encoded batch by batch from server-side cursors, so peak memory
+does not grow with the size of the graph. The *_binary methods encode the
+same data in the compact columnar format of app/domain/graph_binary.py.
+The get_shared_* methods build public/template graph documents from the
+user-independent parts kept in app/services/graph_content_cache.py.
 """
 
+import hashlib
+import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.crud import graph_structure as graph_structure_crud
 from app.crud.knowledge_node import get_nodes_by_graph
 from app.crud.prerequisite import get_prerequisites_by_graph
+from app.domain.graph_binary import GraphBinaryWriter
+from app.domain.mastery_snapshot import MasterySnapshot
 from app.models.enrollment import GraphEnrollment
 from app.models.knowledge_graph import KnowledgeGraph
-from app.models.knowledge_node import KnowledgeNode
 from app.schemas.knowledge_graph import (
     GraphContentNode,
     GraphContentPrerequisite,
     GraphContentResponse,
     KnowledgeGraphResponse,
 )
+from app.services.graph_content_cache import graph_content_cache
 
 
 class GraphContentService:
@@ -36,7 +53,7 @@ class GraphContentService:
         Enrich a knowledge graph with computed metadata.
 
         Adds:
-        - node_count: Number of nodes in the graph
+        - node_count: Number of nodes in the graph (maintained on the graph row)
         - is_enrolled: Whether the user is enrolled in the graph
 
         Args:
@@ -47,22 +64,16 @@ class GraphContentService:
         Returns:
             KnowledgeGraphResponse with all metadata populated
         """
-        # Count nodes in this graph
-        node_count_stmt = select(func.count(KnowledgeNode.id)).where(
-            KnowledgeNode.graph_id == graph.id
-        )
-        node_count_result = await db_session.execute(node_count_stmt)
-        node_count = node_count_result.scalar() or 0
-
         # Check if user is enrolled in this graph
-        enrollment_stmt = select(GraphEnrollment).where(
-            GraphEnrollment.user_id == user_id,
-            GraphEnrollment.graph_id == graph.id,
-        )
-        enrollment_result = await db_session.execute(enrollment_stmt)
-        is_enrolled = enrollment_result.scalar_one_or_none() is not None
+        is_enrolled = await self.is_user_enrolled(db_session, graph.id, user_id)
 
         # Build and return response
+        return self._graph_response(graph, graph.node_count, is_enrolled)
+
+    @staticmethod
+    def _graph_response(
+        graph: KnowledgeGraph, node_count: int, is_enrolled: bool
+    ) -> KnowledgeGraphResponse:
         return KnowledgeGraphResponse(
             id=graph.id,
             name=graph.name,
@@ -78,6 +89,18 @@ class GraphContentService:
             created_at=graph.created_at,
         )
 
+    @staticmethod
+    async def is_user_enrolled(
+        db_session: AsyncSession, graph_id: UUID, user_id: UUID
+    ) -> bool:
+        """Whether the user is enrolled in the graph."""
+        enrollment_stmt = select(GraphEnrollment.graph_id).where(
+            GraphEnrollment.user_id == user_id,
+            GraphEnrollment.graph_id == graph_id,
+        )
+        enrollment_result = await db_session.execute(enrollment_stmt)
+        return enrollment_result.scalar_one_or_none() is not None
+
     async def get_graph_full_content(
         self,
         db_session: AsyncSession,
@@ -128,3 +151,464 @@ class GraphContentService:
             nodes=nodes_response,
             prerequisites=prerequisites_response,
         )
+
+    # ==================== HTTP validators ====================
+    #
+    # Strong ETags built only from columns loaded with the graph (plus the
+    # caller's enrollment / mastery snapshot), so a revalidation is answered
+    # before any node or prerequisite is read. The representation (JSON,
+    # streamed JSON, binary) is part of the tag: the encodings are not
+    # byte-identical.
+
+    @staticmethod
+    def content_validators(
+        graph: KnowledgeGraph,
+        is_enrolled: bool,
+        binary: bool = False,
+        stream: bool = False,
+    ) -> tuple[str, datetime]:
+        """
+        ETag and Last-Modified of a graph content response.
+
+        content_version covers nodes, prerequisites, questions and topology;
+        updated_at and enrollment_count cover the graph metadata.
+        """
+        metadata = _digest(graph.updated_at, graph.enrollment_count, is_enrolled)
+        etag = (
+            f'"content-{_representation(binary, stream)}-{graph.id.hex}'
+            f'-{graph.content_version}-{metadata}"'
+        )
+        return etag, _last_modified(graph)
+
+    @staticmethod
+    def visualization_etag(
+        graph: KnowledgeGraph,
+        snapshot: MasterySnapshot,
+        binary: bool = False,
+        stream: bool = False,
+    ) -> str:
+        """ETag of a visualization: graph content + the user's mastery snapshot."""
+        return (
+            f'"viz-{_representation(binary, stream)}-{graph.id.hex}'
+            f'-{graph.content_version}-{snapshot.digest()}"'
+        )
+
+    @staticmethod
+    def template_listing_validators(
+        versions: Sequence[tuple[UUID, int, datetime, int, bool | None]],
+    ) -> tuple[str, datetime | None]:
+        """
+        ETag and Last-Modified of the template listing.
+
+        Args:
+            versions: Rows of knowledge_graph_crud.get_template_graph_versions
+        """
+        etag = f'"templates-{_digest(*(value for row in versions for value in row))}"'
+        return etag, max((row[2] for row in versions), default=None)
+
+    # ==================== Shared cache ====================
+    #
+    # The node and prerequisite JSON is the same for every learner; it is
+    # kept in graph_content_cache keyed by content_version, and only the
+    # per-user fields are encoded per request.
+
+    async def get_shared_graph_content(
+        self,
+        db_session: AsyncSession,
+        graph: KnowledgeGraph,
+        is_enrolled: bool,
+    ) -> bytes:
+        """
+        Encode a GraphContentResponse document from the shared cache.
+
+        Args:
+            db_session: Database session (used on a cache miss)
+            graph: Knowledge graph to fetch content for
+            is_enrolled: Whether the requesting user is enrolled
+
+        Returns:
+            UTF-8 encoded JSON
+        """
+        node_count, nodes, prerequisites = await graph_content_cache.get_or_build(
+            ("content", graph.id, graph.content_version),
+            lambda: self._build_shared_content(db_session, graph.id),
+        )
+        graph_response = self._graph_response(graph, int(node_count), is_enrolled)
+        return b'{"graph":%s,"nodes":%s,"prerequisites":%s}' % (
+            graph_response.model_dump_json().encode(),
+            nodes,
+            prerequisites,
+        )
+
+    async def get_shared_graph_visualization(
+        self,
+        db_session: AsyncSession,
+        graph: KnowledgeGraph,
+        snapshot: MasterySnapshot,
+    ) -> bytes:
+        """
+        Encode a GraphVisualization document from the shared cache.
+
+        Each node is cached as its JSON up to the mastery score, which is
+        appended from the user's snapshot.
+
+        Args:
+            db_session: Database session (used on a cache miss)
+            graph: Knowledge graph to visualize
+            snapshot: The user's mastery snapshot for this graph
+
+        Returns:
+            UTF-8 encoded JSON
+        """
+        edges, node_ids, *node_prefixes = await graph_content_cache.get_or_build(
+            ("visualization", graph.id, graph.content_version),
+            lambda: self._build_shared_visualization(db_session, graph.id),
+        )
+        nodes = b",".join(
+            b"%s%s}"
+            % (
+                prefix,
+                json.dumps(
+                    snapshot.cached_retrievability(
+                        UUID(bytes=node_ids[16 * i : 16 * i + 16]), default=0.1
+                    )
+                ).encode(),
+            )
+            for i, prefix in enumerate(node_prefixes)
+        )
+        return b'{"nodes":[%s],"edges":%s}' % (nodes, edges)
+
+    async def _build_shared_content(
+        self, db_session: AsyncSession, graph_id: UUID
+    ) -> list[bytes]:
+        """[node count, nodes JSON array, prerequisites JSON array]"""
+        nodes = await _collect(
+            graph_structure_crud.stream_content_nodes(
+                db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+            )
+        )
+        prerequisites = await _collect(
+            graph_structure_crud.stream_prerequisites(
+                db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+            )
+        )
+        return [
+            str(len(nodes)).encode(),
+            _json_list(nodes, _content_node),
+            _json_list(prerequisites, _content_prerequisite),
+        ]
+
+    async def _build_shared_visualization(
+        self, db_session: AsyncSession, graph_id: UUID
+    ) -> list[bytes]:
+        """[edges JSON array, node ids (16 bytes each), one prefix per node]"""
+        nodes = await _collect(
+            graph_structure_crud.stream_visualization_nodes(
+                db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+            )
+        )
+        edges = await _collect(
+            graph_structure_crud.stream_prerequisites(
+                db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+            )
+        )
+        prefixes = [
+            _json_bytes(
+                {
+                    "id": str(row.id),
+                    "name": row.node_name,
+                    "description": row.description,
+                }
+            )[:-1]
+            + b',"mastery_score":'
+            for row in nodes
+        ]
+        return [
+            _json_list(edges, _visualization_edge),
+            b"".join(row.id.bytes for row in nodes),
+            *prefixes,
+        ]
+
+    # ==================== Compact binary ====================
+
+    async def get_graph_visualization_binary(
+        self,
+        db_session: AsyncSession,
+        graph_id: UUID,
+        snapshot: MasterySnapshot,
+    ) -> bytes:
+        """
+        Encode a graph visualization in the compact binary format.
+
+        Columns: nodes.id, nodes.name, nodes.description, nodes.mastery_score
+        (float32), edges.source / edges.target (int32 node row indexes).
+
+        Args:
+            db_session: Database session
+            graph_id: Knowledge graph UUID
+            snapshot: The user's mastery snapshot for this graph
+
+        Returns:
+            Encoded buffer
+        """
+        node_ids, names, descriptions = [], [], []
+        async for batch in graph_structure_crud.stream_visualization_nodes(
+            db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+        ):
+            for row in batch:
+                node_ids.append(row.id)
+                names.append(row.node_name)
+                descriptions.append(row.description)
+        sources, targets, _ = await self._edge_indexes(db_session, graph_id, node_ids)
+
+        return (
+            GraphBinaryWriter()
+            .uuids("nodes.id", node_ids)
+            .strings("nodes.name", names)
+            .strings("nodes.description", descriptions)
+            .float32(
+                "nodes.mastery_score",
+                [snapshot.cached_retrievability(i, default=0.1) for i in node_ids],
+            )
+            .int32("edges.source", sources)
+            .int32("edges.target", targets)
+            .to_bytes()
+        )
+
+    async def get_graph_content_binary(
+        self,
+        db_session: AsyncSession,
+        graph_response: KnowledgeGraphResponse,
+    ) -> bytes:
+        """
+        Encode complete graph content in the compact binary format.
+
+        Columns: graph (JSON, the KnowledgeGraphResponse), nodes.id,
+        nodes.node_id_str, nodes.node_name, nodes.description, nodes.level,
+        nodes.dependents_count (int32), prerequisites.from / prerequisites.to
+        (int32 node row indexes), prerequisites.weight (float32).
+
+        Args:
+            db_session: Database session
+            graph_response: Graph metadata (see enrich_graph_with_metadata)
+
+        Returns:
+            Encoded buffer
+        """
+        columns: dict[str, list] = {
+            "id": [],
+            "node_id_str": [],
+            "node_name": [],
+            "description": [],
+            "level": [],
+            "dependents_count": [],
+        }
+        async for batch in graph_structure_crud.stream_content_nodes(
+            db_session, graph_response.id, settings.GRAPH_STREAM_BATCH_SIZE
+        ):
+            for row in batch:
+                for name, values in columns.items():
+                    values.append(getattr(row, name))
+        sources, targets, weights = await self._edge_indexes(
+            db_session, graph_response.id, columns["id"]
+        )
+
+        return (
+            GraphBinaryWriter()
+            .json("graph", graph_response.model_dump(mode="json"))
+            .uuids("nodes.id", columns["id"])
+            .strings("nodes.node_id_str", columns["node_id_str"])
+            .strings("nodes.node_name", columns["node_name"])
+            .strings("nodes.description", columns["description"])
+            .int32("nodes.level", columns["level"])
+            .int32("nodes.dependents_count", columns["dependents_count"])
+            .int32("prerequisites.from", sources)
+            .int32("prerequisites.to", targets)
+            .float32("prerequisites.weight", weights)
+            .to_bytes()
+        )
+
+    @staticmethod
+    async def _edge_indexes(
+        db_session: AsyncSession, graph_id: UUID, node_ids: list[UUID]
+    ) -> tuple[list[int], list[int], list[float]]:
+        """Prerequisite edges as (source rows, target rows, weights)."""
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        sources, targets, weights = [], [], []
+        async for batch in graph_structure_crud.stream_prerequisites(
+            db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+        ):
+            for row in batch:
+                sources.append(index[row.from_node_id])
+                targets.append(index[row.to_node_id])
+                weights.append(row.weight)
+        return sources, targets, weights
+
+    # ==================== Streaming ====================
+
+    async def stream_graph_full_content(
+        self,
+        db_session: AsyncSession,
+        graph: KnowledgeGraph,
+        user_id: UUID,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a GraphContentResponse document as JSON chunks.
+
+        Args:
+            db_session: Database session (closed once the stream ends)
+            graph: Knowledge graph to fetch content for
+            user_id: User ID to check enrollment for
+
+        Yields:
+            UTF-8 encoded JSON, one chunk per batch of rows
+        """
+        try:
+            graph_response = await self.enrich_graph_with_metadata(
+                db_session=db_session, graph=graph, user_id=user_id
+            )
+            yield b'{"graph":%s,"nodes":' % graph_response.model_dump_json().encode()
+            async for chunk in _json_array(
+                graph_structure_crud.stream_content_nodes(
+                    db_session, graph.id, settings.GRAPH_STREAM_BATCH_SIZE
+                ),
+                _content_node,
+            ):
+                yield chunk
+            yield b',"prerequisites":'
+            async for chunk in _json_array(
+                graph_structure_crud.stream_prerequisites(
+                    db_session, graph.id, settings.GRAPH_STREAM_BATCH_SIZE
+                ),
+                _content_prerequisite,
+            ):
+                yield chunk
+            yield b"}"
+        finally:
+            await db_session.close()
+
+    async def stream_graph_visualization(
+        self,
+        db_session: AsyncSession,
+        graph_id: UUID,
+        snapshot: MasterySnapshot,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a GraphVisualization document as JSON chunks.
+
+        Args:
+            db_session: Database session (closed once the stream ends)
+            graph_id: Knowledge graph UUID
+            snapshot: The user's mastery snapshot for this graph
+
+        Yields:
+            UTF-8 encoded JSON, one chunk per batch of rows
+        """
+
+        def node(row: Row) -> dict[str, Any]:
+            return {
+                "id": str(row.id),
+                "name": row.node_name,
+                "description": row.description,
+                "mastery_score": snapshot.cached_retrievability(row.id, default=0.1),
+            }
+
+        try:
+            yield b'{"nodes":'
+            async for chunk in _json_array(
+                graph_structure_crud.stream_visualization_nodes(
+                    db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+                ),
+                node,
+            ):
+                yield chunk
+            yield b',"edges":'
+            async for chunk in _json_array(
+                graph_structure_crud.stream_prerequisites(
+                    db_session, graph_id, settings.GRAPH_STREAM_BATCH_SIZE
+                ),
+                _visualization_edge,
+            ):
+                yield chunk
+            yield b"}"
+        finally:
+            await db_session.close()
+
+
+# ==================== JSON encoding helpers ====================
+#
+# Rows are encoded field by field in schema order (same keys and JSON as
+# the Pydantic models), without building one model per row.
+
+
+def _content_node(row: Row) -> dict[str, Any]:
+    return {
+        "id": str(row.id),
+        "node_id_str": row.node_id_str,
+        "node_name": row.node_name,
+        "description": row.description,
+        "level": row.level,
+        "dependents_count": row.dependents_count,
+    }
+
+
+def _content_prerequisite(row: Row) -> dict[str, Any]:
+    return {
+        "from_node_id": str(row.from_node_id),
+        "to_node_id": str(row.to_node_id),
+        "weight": row.weight,
+    }
+
+
+def _visualization_edge(row: Row) -> dict[str, Any]:
+    return {"source_id": str(row.from_node_id), "target_id": str(row.to_node_id)}
+
+
+def _json_bytes(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _json_list(rows: Sequence[Row], encode: Callable[[Row], dict[str, Any]]) -> bytes:
+    return _json_bytes([encode(row) for row in rows])
+
+
+async def _collect(batches: AsyncIterator[Sequence[Row]]) -> list[Row]:
+    return [row async for batch in batches for row in batch]
+
+
+async def _json_array(
+    batches: AsyncIterator[Sequence[Row]], encode: Callable[[Row], dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """Encode batches of rows as one JSON array, one chunk per batch."""
+    separator = b"["
+    async for batch in batches:
+        if not batch:
+            continue
+        body = ",".join(
+            json.dumps(encode(row), ensure_ascii=False, separators=(",", ":"))
+            for row in batch
+        )
+        yield separator + body.encode()
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+# ==================== HTTP validator helpers ====================
+
+
+def _digest(*values: Any) -> str:
+    """Short stable hash of a sequence of plain values."""
+    return hashlib.blake2b(repr(values).encode(), digest_size=8).hexdigest()
+
+
+def _representation(binary: bool, stream: bool) -> str:
+    return "binary" if binary else "stream" if stream else "json"
+
+
+def _last_modified(graph: KnowledgeGraph) -> datetime:
+    """Latest of the graph's content and metadata modification times."""
+    return max(
+        stamp
+        for stamp in (graph.content_updated_at, graph.updated_at, graph.created_at)
+        if stamp is not None
+    )
@@ -0,0 +1,171 @@
+"""
+Graph Content Cache - Shared, user-independent parts of graph responses.
+
+Public and template graphs are read by every enrolled learner but change
+rarely, so rebuilding their node and prerequisite lists per request is
+wasted work. This cache keeps the serialized parts of the content and
+visualization responses that are the same for every user; the per-user
+fields (is_enrolled, mastery scores) are merged in by GraphContentService.
+
+- Keyed by (kind, graph_id, content_version): every node/edge/question
+  write bumps the version, so entries are never invalidated, superseded
+  versions simply age out
+- Local tier: LRU bounded by settings.GRAPH_CONTENT_CACHE_BYTES of payload
+- With settings.GRAPH_CONTENT_CACHE_REDIS the entries are also shared
+  through Redis (expiring after settings.GRAPH_CONTENT_CACHE_REDIS_TTL_SECONDS),
+  so other instances and fresh processes do not rebuild them
+
+Values are lists of byte strings; what they hold is up to the caller.
+"""
+
+import logging
+import struct
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "graph:content"
+
+ContentKey = tuple[str, UUID, int]  # (kind, graph_id, content_version)
+
+
+class GraphContentCache:
+    """LRU cache of {(kind, graph_id, content_version): parts}, optionally in Redis."""
+
+    def __init__(
+        self,
+        max_bytes: int = settings.GRAPH_CONTENT_CACHE_BYTES,
+        redis_client: Redis | None = None,
+        redis_ttl_seconds: int = settings.GRAPH_CONTENT_CACHE_REDIS_TTL_SECONDS,
+    ):
+        self.max_bytes = max_bytes
+        self.redis_client = redis_client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._entries: OrderedDict[ContentKey, list[bytes]] = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._nbytes = 0
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters of this process's cache."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+    async def get_or_build(
+        self, key: ContentKey, build: Callable[[], Awaitable[list[bytes]]]
+    ) -> list[bytes]:
+        """
+        Get the cached parts for `key`, building (and caching) them on a miss.
+
+        Args:
+            key: (kind, graph_id, content_version)
+            build: Produces the parts from the database; only awaited on a miss
+
+        Returns:
+            The cached or freshly built parts
+        """
+        if not self.enabled:
+            return await build()
+
+        parts = self._entries.get(key)
+        if parts is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return parts
+
+        parts = await self._get_redis(key)
+        if parts is not None:
+            self.redis_hits += 1
+            self._set_local(key, parts)
+            return parts
+
+        self.misses += 1
+        parts = await build()
+        self._set_local(key, parts)
+        await self._set_redis(key, parts)
+        return parts
+
+    # ==================== Tiers ====================
+
+    def _set_local(self, key: ContentKey, parts: list[bytes]) -> None:
+        size = sum(len(part) for part in parts)
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._nbytes -= sum(len(part) for part in previous)
+        self._entries[key] = parts
+        self._nbytes += size
+        while self._nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= sum(len(part) for part in evicted)
+
+    async def _get_redis(self, key: ContentKey) -> list[bytes] | None:
+        if self.redis_client is None:
+            return None
+        try:
+            data = await self.redis_client.get(_redis_key(key))
+        except Exception as e:
+            logger.warning(f"Graph content cache read from Redis failed: {e}")
+            return None
+        return _unpack(data) if data else None
+
+    async def _set_redis(self, key: ContentKey, parts: list[bytes]) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.set(
+                _redis_key(key), _pack(parts), ex=max(1, self.redis_ttl_seconds)
+            )
+        except Exception as e:
+            logger.warning(f"Graph content cache write to Redis failed: {e}")
+
+
+def _redis_key(key: ContentKey) -> str:
+    kind, graph_id, version = key
+    return f"{REDIS_KEY_PREFIX}:{kind}:{graph_id}:{version}"
+
+
+def _pack(parts: list[bytes]) -> bytes:
+    """uint32 count, uint32 length per part, then the parts back to back."""
+    header = struct.pack(f"<I{len(parts)}I", len(parts), *map(len, parts))
+    return header + b"".join(parts)
+
+
+def _unpack(data: bytes) -> list[bytes]:
+    (count,) = struct.unpack_from("<I", data)
+    lengths = struct.unpack_from(f"<{count}I", data, 4)
+    offset = 4 + 4 * count
+    parts = []
+    for length in lengths:
+        parts.append(data[offset : offset + length])
+        offset += length
+    return parts
+
+
+# Shared per-process instance
+graph_content_cache = GraphContentCache()
@@ -0,0 +1,120 @@
+"""
+Graph Counter Reconciliation - Recount the denormalized graph counters.
+
+knowledge_graphs.node_count / question_count / prerequisite_count are
+maintained in the same transaction as every insert (app/crud), so they only
+drift when rows are written around the application (raw SQL, restores,
+manual fixes). This job:
+
+1. Adds the counter and version columns to knowledge_graphs (if missing),
+   for databases created before they existed
+2. Walks all graphs in primary key order and recounts them, one short
+   transaction per batch; drifted graphs are corrected and get a new
+   content version so cached responses are rebuilt
+
+Run it once after upgrading an existing database (the counters start at 0),
+and whenever the counters are suspected to be wrong.
+
+Usage:
+    python -m app.services.graph_counter_reconciliation --batch-size 500
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import DatabaseManager
+from app.crud import knowledge_graph as graph_crud
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+_GRAPH_COLUMNS = (
+    "ADD COLUMN IF NOT EXISTS structure_version INTEGER NOT NULL DEFAULT 0",
+    "ADD COLUMN IF NOT EXISTS content_version INTEGER NOT NULL DEFAULT 0",
+    "ADD COLUMN IF NOT EXISTS content_updated_at TIMESTAMP WITH TIME ZONE "
+    "NOT NULL DEFAULT now()",
+    "ADD COLUMN IF NOT EXISTS node_count INTEGER NOT NULL DEFAULT 0",
+    "ADD COLUMN IF NOT EXISTS question_count INTEGER NOT NULL DEFAULT 0",
+    "ADD COLUMN IF NOT EXISTS prerequisite_count INTEGER NOT NULL DEFAULT 0",
+)
+
+
+@dataclass
+class GraphCounterReconciliationReport:
+    """Progress report for one reconciliation run."""
+
+    graphs_scanned: int = 0
+    graphs_fixed: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"scanned={self.graphs_scanned} fixed={self.graphs_fixed} "
+            f"batches={self.batches} elapsed={self.elapsed_seconds:.2f}s"
+        )
+
+
+class GraphCounterReconciliationService:
+    def __init__(self, db_manager: DatabaseManager, batch_size: int | None = None):
+        self.db_manager = db_manager
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+
+    async def run(self) -> GraphCounterReconciliationReport:
+        started = time.perf_counter()
+        report = GraphCounterReconciliationReport()
+
+        async with self.db_manager.sql_engine.begin() as conn:
+            for column in _GRAPH_COLUMNS:
+                await conn.execute(text(f"ALTER TABLE knowledge_graphs {column}"))
+
+        after = None
+        while True:
+            async with self.db_manager.get_sql_session() as session:
+                graph_ids = await graph_crud.get_graph_ids_page(
+                    session, self.batch_size, after
+                )
+                if not graph_ids:
+                    break
+                fixed = await graph_crud.reconcile_graph_counters(session, graph_ids)
+
+            after = graph_ids[-1]
+            report.graphs_scanned += len(graph_ids)
+            report.graphs_fixed += len(fixed)
+            report.batches += 1
+            if fixed:
+                logger.info(f"Fixed counters of graphs {fixed}")
+            logger.info(f"Reconciled graph counters: {report}")
+
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"Graph counter reconciliation finished: {report}")
+        return report
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recount node/question/prerequisite counters of all graphs."
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(settings)
+    try:
+        service = GraphCounterReconciliationService(
+            db_manager, batch_size=args.batch_size
+        )
+        report = await service.run()
+        print(report)
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""
+Graph Topology Cache - In-process LRU cache of prerequisite structure.
+
+Graph structure changes far less often than answers arrive, so re-reading the
+prerequisites table (or running a recursive CTE) per answer is wasted work.
+This cache keeps one CSRGraph per knowledge graph:
+
+- Keyed by graph_id, validated against KnowledgeGraph.structure_version
+  (one primary-key lookup per access)
+- The version is bumped by create_prerequisite, bulk_insert_prerequisites_tx
+  and bulk_insert_nodes_tx in the same transaction as the change, so every
+  process sees a stale entry as soon as the change commits
+- LRU-bounded by settings.GRAPH_TOPOLOGY_CACHE_SIZE
+"""
+
+import logging
+from collections import OrderedDict
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import knowledge_graph as graph_crud
+from app.crud import prerequisite as prerequisite_crud
+from app.domain.graph_csr import CSRGraph
+
+logger = logging.getLogger(__name__)
+
+
+class GraphTopologyCache:
+    """LRU cache of {graph_id: (structure_version, CSRGraph)}."""
+
+    def __init__(self, max_size: int = settings.GRAPH_TOPOLOGY_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[UUID, tuple[int, CSRGraph]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get(self, db_session: AsyncSession, graph_id: UUID) -> CSRGraph:
+        """
+        Get the CSR topology of a graph, reloading it if the version changed.
+
+        Args:
+            db_session: Database session
+            graph_id: Knowledge graph UUID
+
+        Returns:
+            CSRGraph (empty if the graph does not exist)
+        """
+        version = await graph_crud.get_graph_structure_version(db_session, graph_id)
+        if version is None:
+            return CSRGraph.from_edges([], [])
+
+        entry = self._entries.get(graph_id)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(graph_id)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        # Edges are read after the version, so they are never older than it
+        edges = await prerequisite_crud.get_prerequisite_edges(db_session, graph_id)
+        topology = CSRGraph.from_edges([], edges)
+        logger.debug(
+            f"Loaded topology for graph {graph_id} (version {version}, "
+            f"{topology.num_edges} edges)"
+        )
+
+        self._entries[graph_id] = (version, topology)
+        self._entries.move_to_end(graph_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return topology
+
+    async def get_prerequisite_depths(
+        self, db_session: AsyncSession, graph_id: UUID, node_id: UUID
+    ) -> dict[UUID, int]:
+        """
+        In-memory replacement for mastery_crud.get_prerequisite_roots_to_bonus.
+
+        Returns:
+            Dict mapping {prerequisite_node_id: min_depth}
+        """
+        topology = await self.get(db_session, graph_id)
+        return topology.ancestor_depths(node_id)
+
+
+# Shared per-process instance
+graph_topology_cache = GraphTopologyCache()
@@ -14,13 +14,20 @@ from typing import Any
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.config import settings
 from app.crud import mastery as mastery_crud
+from app.crud import processed_task as processed_task_crud
 from app.crud import question as question_crud
+from app.crud import review_event as review_event_crud
 from app.domain.mastery_logic import MasteryLogic
 from app.models.knowledge_node import KnowledgeNode
+from app.models.review_event import ReviewEvent
 from app.models.user import FSRSState, User, UserMastery
+from app.services import mastery_snapshot_cache as snapshot_cache
 from app.services.grade_answer import GradingResult
+from app.worker.config import PROPAGATE_MASTERY_TASK
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +41,17 @@ class MasteryService:
         user: User,
         question_id: UUID,
         grading_result: GradingResult,
+        propagate: bool = True,
     ) -> KnowledgeNode | None:
         """
         Orchestrates the update process:
         Fetch Data -> Calculate Logic -> Save DB -> Trigger Propagation
+
+        Pass propagate=False when the caller enqueues propagation as a
+        background task after committing (see POST /answer).
+
+        The question/node/mastery lookups are identity-cache hits when the
+        grading ran on the same session (GradingService.fetch_and_grade).
         """
         # 1. Fetch Data
         question_in_db = await question_crud.get_question_by_id(db_session, question_id)
@@ -62,16 +76,16 @@ class MasteryService:
             grading_result.p_s,
         )
 
-        # 3. Trigger Propagation (Ideally this should be a background task!)
-        # For now, we keep it inline but call the modularized version
-        await self.propagate_mastery(
-            db_session,
-            user,
-            knowledge_node,
-            grading_result.is_correct,
-            grading_result.p_g,
-            grading_result.p_s,
-        )
+        # 3. Trigger Propagation (inline unless the caller defers it)
+        if propagate:
+            await self.propagate_mastery(
+                db_session,
+                user,
+                knowledge_node,
+                grading_result.is_correct,
+                grading_result.p_g,
+                grading_result.p_s,
+            )
 
         return knowledge_node
 
@@ -84,36 +98,169 @@ class MasteryService:
         p_g: float,
         p_s: float,
     ) -> None:
-        """Helper to update a single node's mastery."""
+        """
+        Helper to update a single node's mastery.
+
+        A first answer creates the row with the review already applied in a
+        single upsert. If another request created the row first, the upsert
+        waits for it, returns that row locked and the review is applied to it.
+        """
         now = datetime.now(UTC)
+        graph_id, node_id = knowledge_node.graph_id, knowledge_node.id
 
-        # Get or create DB Record
-        # If creating, calculate initial R(t) using FSRS
-        initial_retrievability = MasteryLogic.get_initial_retrievability()
-        mastery_rel, _ = await mastery_crud.get_or_create_mastery(
-            db_session,
-            user.id,
-            knowledge_node.graph_id,
-            knowledge_node.id,
-            cached_retrievability=initial_retrievability,
+        mastery_rel = mastery_crud.get_loaded_mastery(
+            db_session, user.id, graph_id, node_id
         )
+        created = False
+        if mastery_rel is None:
+            # Call Pure Logic on a fresh (transient) record, then create it
+            new_mastery = UserMastery(
+                user_id=user.id,
+                graph_id=graph_id,
+                node_id=node_id,
+                cached_retrievability=MasteryLogic.get_initial_retrievability(),
+            )
+            updates = MasteryLogic.calculate_next_state(
+                mastery=new_mastery, is_correct=is_correct, p_g=p_g, p_s=p_s, now=now
+            )
+            upserted = await mastery_crud.upsert_masteries(
+                db_session, user.id, [self._new_row_values(graph_id, node_id, updates)]
+            )
+            mastery_rel, created = upserted[(graph_id, node_id)]
+            if created:
+                self._add_review_event(
+                    db_session, mastery_rel, updates["review_log_entry"]
+                )
+                snapshot_cache.stage(db_session, [mastery_rel])
 
-        # Call Pure Logic
-        updates = MasteryLogic.calculate_next_state(
-            mastery=mastery_rel, is_correct=is_correct, p_g=p_g, p_s=p_s, now=now
-        )
+        if not created:
+            # Call Pure Logic
+            updates = MasteryLogic.calculate_next_state(
+                mastery=mastery_rel, is_correct=is_correct, p_g=p_g, p_s=p_s, now=now
+            )
 
-        # Apply Updates to DB Model
-        self._apply_updates_to_model(mastery_rel, updates)
+            # Apply Updates to DB Model
+            self._apply_updates_to_model(db_session, mastery_rel, updates)
 
         await db_session.flush()
+        await self._trim_review_history(db_session, [mastery_rel])
         logger.info(
             f"Updated mastery for node {knowledge_node.id}, "
             f"Cached R(t): {updates['cached_retrievability']:.2f}"
         )
 
+    async def update_masteries_from_batch(
+        self,
+        db_session: AsyncSession,
+        user: User,
+        graded_answers: list[tuple[KnowledgeNode, GradingResult, datetime]],
+        propagate: bool = True,
+    ) -> None:
+        """
+        Batch version of update_mastery_from_grading (offline answer sync).
+
+        1. One query for all existing mastery rows, one upsert for new rows
+        2. FSRS updates applied in answer-time order, so repeated answers on
+           the same node are reviewed in the order they happened
+        3. Propagation for each correct answer (unless the caller defers it)
+
+        Args:
+            db_session: Database session
+            user: User who answered
+            graded_answers: (node, grading result, answered_at) per answer
+            propagate: Run propagation inline
+        """
+        if not graded_answers:
+            return
+
+        keys = list({(node.graph_id, node.id) for node, _, _ in graded_answers})
+        mastery_map = await mastery_crud.get_masteries_by_keys(
+            db_session, user.id, keys
+        )
+
+        now = datetime.now(UTC)
+        missing = [key for key in keys if key not in mastery_map]
+        if missing:
+            initial_retrievability = MasteryLogic.get_initial_retrievability()
+            upserted = await mastery_crud.upsert_masteries(
+                db_session,
+                user.id,
+                [
+                    {
+                        "graph_id": graph_id,
+                        "node_id": node_id,
+                        "cached_retrievability": initial_retrievability,
+                        "last_updated": now,
+                    }
+                    for graph_id, node_id in missing
+                ],
+            )
+            mastery_map.update(
+                (key, mastery) for key, (mastery, _) in upserted.items()
+            )
+
+        ordered = sorted(graded_answers, key=lambda item: item[2])
+        for node, grading_result, answered_at in ordered:
+            mastery_rel = mastery_map[(node.graph_id, node.id)]
+            # Never review before the last recorded review (negative elapsed)
+            review_time = max(answered_at, mastery_rel.last_review or answered_at)
+            updates = MasteryLogic.calculate_next_state(
+                mastery=mastery_rel,
+                is_correct=grading_result.is_correct,
+                p_g=grading_result.p_g,
+                p_s=grading_result.p_s,
+                now=review_time,
+            )
+            self._apply_updates_to_model(db_session, mastery_rel, updates)
+
+        await db_session.flush()
+        await self._trim_review_history(db_session, list(mastery_map.values()))
+        logger.info(f"Updated mastery for {len(ordered)} batched answers")
+
+        if propagate:
+            for node, grading_result, _ in ordered:
+                await self.propagate_mastery(
+                    db_session,
+                    user,
+                    node,
+                    grading_result.is_correct,
+                    grading_result.p_g,
+                    grading_result.p_s,
+                )
+
     # === Propagation Flow ===
 
+    async def propagate_mastery_once(
+        self,
+        db_session: AsyncSession,
+        user: User,
+        node_answered: KnowledgeNode,
+        is_correct: bool,
+        p_g: float,
+        p_s: float,
+        idempotency_key: str,
+    ) -> bool:
+        """
+        Idempotent propagation for background tasks.
+
+        Claims the idempotency key in the same transaction as the implicit
+        review writes, so a redelivered task is a no-op. Does NOT commit.
+
+        Returns:
+            True if propagation ran, False if the key was already processed
+        """
+        claimed = await processed_task_crud.claim_idempotency_key(
+            db_session, idempotency_key, PROPAGATE_MASTERY_TASK
+        )
+        if not claimed:
+            logger.info(f"Skipping already processed propagation {idempotency_key}")
+            return False
+
+        await self.propagate_mastery(
+            db_session, user, node_answered, is_correct, p_g, p_s
+        )
+        return True
+
     async def propagate_mastery(
         self,
         db_session: AsyncSession,
@@ -125,48 +272,44 @@ class MasteryService:
     ) -> None:
         """
         Handles bulk propagation:
-        1. Identify IDs
-        2. Bulk Fetch
-        3. Calculate Logic (Loop)
-        4. Save
+        1. Fetch ancestors + masteries (closure table, single query)
+        2. Calculate Logic (Batch)
+        3. Save (one upsert for new rows, one UPDATE for existing rows)
         """
         logger.info(f"Starting propagation for user {user.id}")
 
-        # 1. FETCH IDs PHASE - Only prerequisite roots for implicit review
-        leaf_ids_to_bonus_with_depth = {}
+        # 1. FETCH PHASE - Prerequisite ancestors and their masteries in one
+        # indexed lookup on the closure table
+        ancestors = {}
         if is_correct:
-            leaf_ids_to_bonus_with_depth = (
-                await mastery_crud.get_prerequisite_roots_to_bonus(
-                    db_session, node_answered.graph_id, node_answered.id
-                )
+            ancestors = await mastery_crud.get_prerequisite_ancestors_with_masteries(
+                db_session, user.id, node_answered.graph_id, node_answered.id
             )
 
-        if not leaf_ids_to_bonus_with_depth:
+        if not ancestors:
             return
 
-        # 2. FETCH DATA PHASE - Only masteries for prerequisite nodes
-        mastery_map = await mastery_crud.get_masteries_by_nodes(
-            db_session,
-            user.id,
-            node_answered.graph_id,
-            list(leaf_ids_to_bonus_with_depth.keys()),
-        )
-
         now = datetime.now(UTC)
 
-        # 3. BACKWARD PROPAGATION (Implicit Review)
+        # 2. BACKWARD PROPAGATION (Implicit Review)
         # Apply bonus to prerequisite nodes based on correct answer
-        for leaf_id, depth in leaf_ids_to_bonus_with_depth.items():
+        triggered: list[UserMastery] = []
+        new_masteries: list[UserMastery] = []
+        for leaf_id, (depth, mastery_rel) in ancestors.items():
             # Use Logic class to check probability
             if not MasteryLogic.should_trigger_implicit_review(depth):
                 continue
 
-            mastery_rel = mastery_map.get(leaf_id)
-            if not mastery_rel:
-                # Initialize with complete FSRS state
-                # Calculate initial R(t) using FSRS
-                initial_rt = MasteryLogic.get_initial_retrievability()
-                mastery_rel = UserMastery(
+            if mastery_rel:
+                triggered.append(mastery_rel)
+                continue
+
+            # Initialize with complete FSRS state (transient: the row is
+            # created below with the implicit review already applied)
+            # Calculate initial R(t) using FSRS
+            initial_rt = MasteryLogic.get_initial_retrievability()
+            new_masteries.append(
+                UserMastery(
                     user_id=user.id,
                     graph_id=node_answered.graph_id,
                     node_id=leaf_id,
@@ -177,13 +320,51 @@ class MasteryService:
                     fsrs_stability=0.0,
                     fsrs_difficulty=0.0,
                 )
-                db_session.add(mastery_rel)
-                mastery_map[leaf_id] = mastery_rel
+            )
 
-            # Call Pure Logic
-            updates = MasteryLogic.calculate_implicit_review_update(mastery_rel, now)
-            self._apply_updates_to_model(mastery_rel, updates)
-            logger.debug(f"Implicit Review applied for {leaf_id}")
+        # Create all missing rows in one upsert; rows another request created
+        # since the ancestor lookup come back locked and are reviewed below
+        if new_masteries:
+            new_updates = MasteryLogic.calculate_implicit_review_updates(
+                new_masteries, now
+            )
+            upserted = await mastery_crud.upsert_masteries(
+                db_session,
+                user.id,
+                [
+                    self._new_row_values(mastery.graph_id, mastery.node_id, updates)
+                    for mastery, updates in zip(
+                        new_masteries, new_updates, strict=True
+                    )
+                ],
+            )
+            triggered.extend(
+                mastery for mastery, created in upserted.values() if not created
+            )
+            snapshot_cache.stage(
+                db_session,
+                (mastery for mastery, created in upserted.values() if created),
+            )
+
+        # Call Pure Logic once for the whole batch (vectorized FSRS), then
+        # write all results with one UPDATE instead of one per ancestor
+        if triggered:
+            updates_batch = MasteryLogic.calculate_implicit_review_updates(
+                triggered, now
+            )
+            await mastery_crud.bulk_apply_implicit_reviews(
+                db_session,
+                user.id,
+                node_answered.graph_id,
+                [mastery_rel.node_id for mastery_rel in triggered],
+                updates_batch,
+            )
+            for mastery_rel, updates in zip(triggered, updates_batch, strict=True):
+                self._sync_model(mastery_rel, updates)
+            snapshot_cache.stage(db_session, triggered)
+        logger.debug(
+            f"Implicit Review applied for {len(triggered) + len(new_masteries)} nodes"
+        )
 
         await db_session.flush()
 
@@ -204,15 +385,80 @@ class MasteryService:
     # === Utilities ===
 
     @staticmethod
-    def _apply_updates_to_model(model: UserMastery, updates: dict[str, Any]) -> None:
-        """Helper to apply dictionary updates to SQLAlchemy model."""
+    async def _trim_review_history(
+        db_session: AsyncSession, masteries: list[UserMastery]
+    ) -> None:
+        """
+        Keep at most REVIEW_HISTORY_MAX_EVENTS review events per mastery row.
+
+        Only rows whose lifetime review_count exceeds the cap can hold more,
+        so new and light learners never pay for the extra DELETE.
+        """
+        keep = settings.REVIEW_HISTORY_MAX_EVENTS
+        if keep <= 0:
+            return
+        keys = [
+            (mastery.user_id, mastery.graph_id, mastery.node_id)
+            for mastery in masteries
+            if (mastery.review_count or 0) > keep
+        ]
+        if keys:
+            await review_event_crud.trim_review_events(db_session, keys, keep)
+
+    @staticmethod
+    def _new_row_values(
+        graph_id: UUID, node_id: UUID, updates: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Column values for a new row created with `updates` already applied."""
+        values: dict[str, Any] = {"graph_id": graph_id, "node_id": node_id}
+        for key, value in updates.items():
+            if key == "review_log_entry":
+                values["last_step"] = value["step"]
+            else:
+                values[key] = value
+        return values
+
+    @classmethod
+    def _apply_updates_to_model(
+        cls, db_session: AsyncSession, model: UserMastery, updates: dict[str, Any]
+    ) -> None:
+        """
+        Helper to apply dictionary updates to SQLAlchemy model.
+
+        A review log entry becomes a new ReviewEvent row (append-only, no
+        rewrite of earlier history); its step is kept on the model.
+        """
         review_log_entry = updates.pop("review_log_entry", None)
 
         for key, value in updates.items():
             setattr(model, key, value)
 
         if review_log_entry:
-            if model.review_log is None:
-                model.review_log = []
-            # Create a new list to ensure SQLAlchemy detects change
-            model.review_log = model.review_log + [review_log_entry]
+            model.last_step = review_log_entry["step"]
+            cls._add_review_event(db_session, model, review_log_entry)
+
+    @staticmethod
+    def _sync_model(model: UserMastery, updates: dict[str, Any]) -> None:
+        """
+        Mirror values already written by a bulk statement onto a loaded model.
+
+        Set as committed (not dirty), so the next flush does not write them
+        again row by row.
+        """
+        for key, value in updates.items():
+            set_committed_value(model, key, value)
+
+    @staticmethod
+    def _add_review_event(
+        db_session: AsyncSession, model: UserMastery, review_log_entry: dict[str, Any]
+    ) -> None:
+        """Append one explicit review to the model's review_events."""
+        db_session.add(
+            ReviewEvent(
+                mastery=model,
+                rating=review_log_entry["rating"],
+                state_after=review_log_entry["state_after"],
+                step=review_log_entry["step"],
+                reviewed_at=review_log_entry["review_datetime"],
+            )
+        )
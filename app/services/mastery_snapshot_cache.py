@@ -0,0 +1,213 @@
+"""
+Mastery Snapshot Cache - Per-(user, graph) mastery state kept in memory.
+
+Recommendation (QuestionService phases 1-3) and the graph visualization all
+read the same user's mastery rows for the same graph within seconds of each
+other. This cache keeps one MasterySnapshot per (user_id, graph_id):
+
+- Loaded with one query on a miss, kept for settings.MASTERY_SNAPSHOT_TTL_SECONDS
+  and LRU-bounded by settings.MASTERY_SNAPSHOT_CACHE_SIZE
+- Written through when a session that changed mastery rows commits: ORM
+  flushes are picked up automatically, set-based writes (upserts, bulk
+  UPDATEs) are staged by MasteryService with stage()
+- A rollback drops the staged rows; deleted rows evict the whole entry
+
+Changes made outside this process's sessions (the background worker, other
+instances, raw SQL jobs) are picked up when the TTL expires.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import mastery as mastery_crud
+from app.domain.mastery_snapshot import MasterySnapshot, SnapshotRow
+from app.models.user import UserMastery
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = tuple[UUID, UUID]  # (user_id, graph_id)
+
+
+class MasterySnapshotCache:
+    """TTL + LRU cache of {(user_id, graph_id): (loaded_at, MasterySnapshot)}."""
+
+    def __init__(
+        self,
+        max_size: int = settings.MASTERY_SNAPSHOT_CACHE_SIZE,
+        ttl_seconds: float = settings.MASTERY_SNAPSHOT_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[SnapshotKey, tuple[float, MasterySnapshot]] = (
+            OrderedDict()
+        )
+        # Sequence number of the last write per key, so a snapshot loaded
+        # while a write committed is not cached (it may predate the write)
+        self._write_seq = 0
+        self._last_write: OrderedDict[SnapshotKey, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._last_write.clear()
+
+    async def get(
+        self, db_session: AsyncSession, user_id: UUID, graph_id: UUID
+    ) -> MasterySnapshot:
+        """
+        Get a user's mastery snapshot for a graph, loading it on a miss.
+
+        Args:
+            db_session: Database session
+            user_id: User UUID
+            graph_id: Knowledge graph UUID
+
+        Returns:
+            MasterySnapshot (empty if the user has no mastery rows)
+        """
+        key = (user_id, graph_id)
+        # A session with its own uncommitted mastery writes reads (and must
+        # not cache) rows the cache cannot see yet
+        own_writes = _has_uncommitted_writes(db_session, key)
+        entry = self._entries.get(key)
+        if (
+            not own_writes
+            and entry is not None
+            and time.monotonic() - entry[0] < self.ttl_seconds
+        ):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        seq_before = self._write_seq
+        rows = await mastery_crud.get_mastery_snapshot_rows(
+            db_session, user_id, graph_id
+        )
+        snapshot = MasterySnapshot.from_rows(rows)
+
+        if (
+            self.enabled
+            and not _has_uncommitted_writes(db_session, key)
+            and self._last_write.get(key, -1) <= seq_before
+        ):
+            self._entries[key] = (time.monotonic(), snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def apply(self, key: SnapshotKey, rows: Iterable[SnapshotRow]) -> None:
+        """Write committed row values through to a cached snapshot."""
+        self._mark_written(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[1].apply(rows)
+
+    def discard(self, key: SnapshotKey) -> None:
+        self._mark_written(key)
+        self._entries.pop(key, None)
+
+    def _mark_written(self, key: SnapshotKey) -> None:
+        self._write_seq += 1
+        self._last_write[key] = self._write_seq
+        self._last_write.move_to_end(key)
+        while len(self._last_write) > max(self.max_size, 1):
+            self._last_write.popitem(last=False)
+
+
+# Shared per-process instance
+mastery_snapshot_cache = MasterySnapshotCache()
+
+
+# ==================== Write-through on commit ====================
+
+_PENDING_KEY = "mastery_snapshot_pending"
+_DISCARD_KEY = "mastery_snapshot_discard"
+# SnapshotRow value order
+_SNAPSHOT_COLUMNS = ("fsrs_stability", "due_date", "cached_retrievability")
+
+
+def stage(
+    db_session: AsyncSession | Session, masteries: Iterable[UserMastery]
+) -> None:
+    """
+    Queue mastery rows written outside the ORM flush (upserts, bulk UPDATEs).
+
+    Their current attribute values are applied to the cache when the session
+    commits, and dropped if it rolls back. Values are read without loading:
+    a row with an expired snapshot column evicts the whole snapshot instead.
+    """
+    pending = db_session.info.setdefault(_PENDING_KEY, {})
+    for mastery in masteries:
+        loaded = inspect(mastery).dict
+        if all(column in loaded for column in _SNAPSHOT_COLUMNS):
+            pending[(mastery.user_id, mastery.graph_id, mastery.node_id)] = tuple(
+                loaded[column] for column in _SNAPSHOT_COLUMNS
+            )
+        else:
+            db_session.info.setdefault(_DISCARD_KEY, set()).add(
+                (mastery.user_id, mastery.graph_id)
+            )
+
+
+def _has_uncommitted_writes(
+    db_session: AsyncSession | Session, key: SnapshotKey
+) -> bool:
+    """Whether the session has flushed or pending mastery writes for `key`."""
+    if key in db_session.info.get(_DISCARD_KEY, ()):
+        return True
+    if any(staged[:2] == key for staged in db_session.info.get(_PENDING_KEY, ())):
+        return True
+    return any(
+        isinstance(obj, UserMastery) and (obj.user_id, obj.graph_id) == key
+        for obj in (*db_session.new, *db_session.dirty, *db_session.deleted)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_masteries(session: Session, flush_context) -> None:
+    flushed = (*session.new, *session.dirty)
+    stage(session, (obj for obj in flushed if isinstance(obj, UserMastery)))
+    deleted = {
+        (obj.user_id, obj.graph_id)
+        for obj in session.deleted
+        if isinstance(obj, UserMastery)
+    }
+    if deleted:
+        session.info.setdefault(_DISCARD_KEY, set()).update(deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _write_through_masteries(session: Session) -> None:
+    by_snapshot: dict[SnapshotKey, list[SnapshotRow]] = {}
+    for (user_id, graph_id, node_id), values in session.info.pop(
+        _PENDING_KEY, {}
+    ).items():
+        by_snapshot.setdefault((user_id, graph_id), []).append((node_id, *values))
+    for key, rows in by_snapshot.items():
+        mastery_snapshot_cache.apply(key, rows)
+    for key in session.info.pop(_DISCARD_KEY, ()):
+        mastery_snapshot_cache.discard(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_staged_masteries(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_DISCARD_KEY, None)
@@ -0,0 +1,94 @@
+"""
+Prerequisite Closure Service - Full rebuild of the transitive ancestor index.
+
+The prerequisite_closure table is maintained incrementally on every edge
+insert (see app/crud/prerequisite.py). A full rebuild is needed to:
+
+- Backfill graphs whose edges were created before the table existed
+- Re-index after PREREQUISITE_CLOSURE_MAX_DEPTH changes
+
+The closure is computed in memory from the graph's cached CSR topology (one
+BFS per node, bounded by max depth) and written back in batches.
+
+Usage:
+    python -m app.services.prerequisite_closure            # all graphs
+    python -m app.services.prerequisite_closure --graph-id <uuid>
+"""
+
+import argparse
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import DatabaseManager
+from app.crud import prerequisite_closure as closure_crud
+from app.domain.graph_csr import CSRGraph
+from app.models.knowledge_graph import KnowledgeGraph
+from app.services.graph_topology_cache import graph_topology_cache
+
+logger = logging.getLogger(__name__)
+
+
+def compute_closure_rows(
+    topology: CSRGraph, max_depth: int
+) -> list[tuple[UUID, UUID, int]]:
+    """
+    Compute all (descendant_id, ancestor_id, min_depth) pairs up to max_depth.
+    """
+    rows = []
+    for node_id in topology.node_ids:
+        for ancestor_id, depth in topology.ancestor_depths(node_id, max_depth).items():
+            rows.append((node_id, ancestor_id, depth))
+    return rows
+
+
+async def rebuild_graph_closure(
+    db_session: AsyncSession, graph_id: UUID, max_depth: int | None = None
+) -> int:
+    """
+    Recompute the closure of one graph from its prerequisite edges.
+
+    Does NOT commit.
+
+    Returns:
+        Number of closure rows written
+    """
+    if max_depth is None:
+        max_depth = settings.PREREQUISITE_CLOSURE_MAX_DEPTH
+
+    topology = await graph_topology_cache.get(db_session, graph_id)
+    rows = compute_closure_rows(topology, max_depth)
+    return await closure_crud.replace_graph_closure(db_session, graph_id, rows)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild the prerequisite closure table."
+    )
+    parser.add_argument("--graph-id", type=UUID, default=None)
+    parser.add_argument("--max-depth", type=int, default=None)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(settings)
+    try:
+        async with db_manager.get_sql_session() as session:
+            if args.graph_id is not None:
+                graph_ids = [args.graph_id]
+            else:
+                result = await session.execute(select(KnowledgeGraph.id))
+                graph_ids = list(result.scalars().all())
+
+        for graph_id in graph_ids:
+            async with db_manager.get_sql_session() as session:
+                rows = await rebuild_graph_closure(session, graph_id, args.max_depth)
+            logger.info(f"Rebuilt closure for graph {graph_id}: {rows} rows")
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
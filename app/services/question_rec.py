@@ -13,13 +13,30 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Select,
+    all_,
+    and_,
+    case,
+    func,
+    literal,
+    null,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.domain.question_rec_logic import QuestionRecLogic
 from app.models.knowledge_node import KnowledgeNode, Prerequisite
 from app.models.question import Question
 from app.models.user import UserMastery
+from app.services.mastery_snapshot_cache import mastery_snapshot_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +49,13 @@ class NodeSelectionResult:
         - knowledge_node: The selected knowledge node (or None if no suitable node found)
         - selection_reason: Why this node was selected (e.g., "fsrs_due_review", "new_learning")
         - priority_score: Optional priority score used for selection/logging
+        - question: A random question of the selected node (single-query path only)
     """
 
     knowledge_node: KnowledgeNode | None
     selection_reason: str
     priority_score: float | None = None
+    question: Question | None = None
 
 
 class QuestionService:
@@ -76,6 +95,13 @@ class QuestionService:
         """
         now = datetime.now(UTC)
 
+        # Due dates come from the cached mastery snapshot; the DB is only
+        # asked for the due nodes themselves
+        snapshot = await mastery_snapshot_cache.get(db_session, user_id, graph_id)
+        due_node_ids = snapshot.due_node_ids(now)
+        if not due_node_ids:
+            return []
+
         # Subquery: Only consider nodes that actually have questions.
         # We should not recommend a node for review if it has no content.
         has_questions_subq = (
@@ -84,36 +110,27 @@ class QuestionService:
             .exists()
         )
 
-        # Query: Find all nodes with mastery records that are due
+        # Query: Find the due nodes that have questions
         stmt = (
-            select(KnowledgeNode, UserMastery)
-            .join(
-                UserMastery,
-                and_(
-                    UserMastery.node_id == KnowledgeNode.id,
-                    UserMastery.graph_id == KnowledgeNode.graph_id,
-                ),
-            )
+            select(KnowledgeNode)
             .where(
-                UserMastery.user_id == user_id,
-                UserMastery.graph_id == graph_id,
-                UserMastery.due_date.isnot(None),
-                UserMastery.due_date <= now,
+                KnowledgeNode.graph_id == graph_id,
+                KnowledgeNode.id.in_(due_node_ids),
                 has_questions_subq,
             )
+            # Deterministic tie-breaking (Phase 2 sort is stable)
+            .order_by(KnowledgeNode.id)
         )
 
         result = await db_session.execute(stmt)
-        rows = result.all()
 
         nodes_with_data = []
-        for row in rows:
-            node = row[0]
-            mastery = row[1]
+        for node in result.scalars().all():
             mastery_data = {
-                "cached_retrievability": mastery.cached_retrievability,  # Cached R(t)
-                "due_date": mastery.due_date,
-                "fsrs_state": mastery.fsrs_state,
+                "cached_retrievability": snapshot.cached_retrievability(
+                    node.id, default=0.0
+                ),  # Cached R(t)
+                "due_date": snapshot.due_date(node.id),
                 "level": node.level,
                 "dependents_count": node.dependents_count,
             }
@@ -256,21 +273,11 @@ class QuestionService:
             prereq_map[to_node_id].append(from_node_id)
             all_relevant_prereq_ids.add(from_node_id)
 
-        # 2. Batch fetch mastery stability for these parents
+        # 2. Mastery stability for these parents (from the cached snapshot)
         stability_map = {}
         if all_relevant_prereq_ids:
-            stmt_all_mastery = select(
-                UserMastery.node_id, UserMastery.fsrs_stability
-            ).where(
-                UserMastery.user_id == user_id,
-                UserMastery.graph_id == graph_id,
-                UserMastery.node_id.in_(list(all_relevant_prereq_ids)),
-            )
-            result_mastery = await db_session.execute(stmt_all_mastery)
-            stability_map = dict(result_mastery)
-            # stability_map = {
-            #     node_id: stability for node_id, stability in result_mastery
-            # }
+            snapshot = await mastery_snapshot_cache.get(db_session, user_id, graph_id)
+            stability_map = snapshot.stability_map(all_relevant_prereq_ids)
 
         # 3. Use Logic layer to filter candidates
         valid_candidate_tuples = QuestionRecLogic.filter_by_stability(
@@ -312,12 +319,8 @@ class QuestionService:
             f"Phase 3 (Stability-based New): Starting new knowledge search for user {user_id}"
         )
 
-        # Subquery: Nodes already mastered by user
-        mastered_nodes_subq = (
-            select(UserMastery.node_id)
-            .where(UserMastery.user_id == user_id, UserMastery.graph_id == graph_id)
-            .scalar_subquery()
-        )
+        # Nodes already mastered by user (from the cached snapshot)
+        snapshot = await mastery_snapshot_cache.get(db_session, user_id, graph_id)
 
         # Subquery: Nodes that have questions
         has_questions_subq = (
@@ -327,10 +330,17 @@ class QuestionService:
         )
 
         # Step 1: Get ALL candidates (Not Mastered + Has Questions)
-        candidates_stmt = select(KnowledgeNode).where(
-            KnowledgeNode.graph_id == graph_id,
-            ~KnowledgeNode.id.in_(mastered_nodes_subq),
-            has_questions_subq,
+        candidates_stmt = (
+            select(KnowledgeNode)
+            .where(
+                KnowledgeNode.graph_id == graph_id,
+                # One array parameter, however many nodes are mastered
+                KnowledgeNode.id
+                != all_(literal(snapshot.node_ids, ARRAY(PG_UUID(as_uuid=True)))),
+                has_questions_subq,
+            )
+            # Deterministic tie-breaking (selection sorts are stable)
+            .order_by(KnowledgeNode.id)
         )
 
         result = await db_session.execute(candidates_stmt)
@@ -430,3 +440,223 @@ class QuestionService:
         return NodeSelectionResult(
             knowledge_node=None, selection_reason="none_available"
         )
+
+    # ==================== Single Round-Trip Selection ====================
+
+    async def select_next_question(
+        self,
+        db_session: AsyncSession,
+        user_id: UUID,
+        graph_id: UUID,
+        now: datetime | None = None,
+    ) -> NodeSelectionResult:
+        """Select the next node AND a random question for it in one SQL statement.
+
+        Same selection rules as select_next_node (Phases 1-3 plus fallback),
+        but composed into a single statement so the recommendation costs one
+        database round trip instead of six or more.
+
+        Args:
+            db_session: Database session
+            user_id: User UUID
+            graph_id: Knowledge graph UUID
+            now: Optional timestamp for due/urgency checks (defaults to now)
+
+        Returns:
+            NodeSelectionResult with `question` populated when a node is found
+        """
+        stmt = self._build_next_question_stmt(user_id, graph_id, now or datetime.now(UTC))
+        row = (await db_session.execute(stmt)).first()
+
+        if row is None:
+            logger.warning(f"No suitable knowledge nodes found for user {user_id}")
+            return NodeSelectionResult(
+                knowledge_node=None, selection_reason="none_available"
+            )
+
+        knowledge_node, question, selection_reason, priority_score = row
+        logger.info(
+            f"Selected node {knowledge_node.node_name} ({selection_reason}) "
+            f"in a single query for user {user_id}"
+        )
+        return NodeSelectionResult(
+            knowledge_node=knowledge_node,
+            selection_reason=selection_reason,
+            priority_score=priority_score,
+            question=question,
+        )
+
+    def _build_next_question_stmt(
+        self, user_id: UUID, graph_id: UUID, now: datetime
+    ) -> Select:
+        """Compose Phases 1-3 and the question pick into one statement.
+
+        Every phase yields at most one row tagged with its phase number; the
+        lowest phase wins. Ties are broken by node id, which matches the
+        stable sorts in the multi-query path.
+        """
+        now_param = literal(now, DateTime(timezone=True))
+
+        def has_questions(node_id_column):
+            return (
+                select(1)
+                .where(Question.graph_id == graph_id, Question.node_id == node_id_column)
+                .exists()
+            )
+
+        # Phase 1: due nodes
+        due = (
+            select(
+                KnowledgeNode.id,
+                KnowledgeNode.level,
+                UserMastery.cached_retrievability,
+                UserMastery.due_date,
+            )
+            .join(
+                UserMastery,
+                and_(
+                    UserMastery.node_id == KnowledgeNode.id,
+                    UserMastery.graph_id == KnowledgeNode.graph_id,
+                ),
+            )
+            .where(
+                UserMastery.user_id == user_id,
+                UserMastery.graph_id == graph_id,
+                UserMastery.due_date.isnot(None),
+                UserMastery.due_date <= now_param,
+                has_questions(KnowledgeNode.id),
+            )
+            .cte("due_nodes")
+        )
+
+        # Phase 2: prerequisite flag + urgency tier, see QuestionRecLogic
+        due_ids = select(due.c.id)
+        due_prerequisites = (
+            select(Prerequisite.from_node_id)
+            .where(
+                Prerequisite.graph_id == graph_id,
+                Prerequisite.from_node_id.in_(due_ids),
+                Prerequisite.to_node_id.in_(due_ids),
+            )
+            .cte("due_prerequisites")
+        )
+        is_prerequisite = due.c.id.in_(select(due_prerequisites.c.from_node_id))
+        hours_overdue = func.extract("epoch", now_param - due.c.due_date) / 3600
+        urgency_tier = case((hours_overdue > 72, 0), (hours_overdue > 24, 1), else_=2)
+        best_due = (
+            select(
+                due.c.id.label("node_id"),
+                literal("fsrs_due_review").label("reason"),
+                case(
+                    (is_prerequisite, 1000), else_=100 - func.coalesce(due.c.level, 0)
+                )
+                .cast(Float)
+                .label("score"),
+                literal(1).label("phase"),
+            )
+            .order_by(
+                case((is_prerequisite, 0), else_=1),
+                urgency_tier,
+                func.coalesce(due.c.level, 999),
+                due.c.cached_retrievability,
+                due.c.id,
+            )
+            .limit(1)
+            .cte("best_due")
+        )
+
+        # Phase 3: unmastered nodes with questions (only when nothing is due)
+        is_mastered = (
+            select(1)
+            .where(
+                UserMastery.user_id == user_id,
+                UserMastery.graph_id == graph_id,
+                UserMastery.node_id == KnowledgeNode.id,
+            )
+            .exists()
+        )
+        candidates = (
+            select(
+                KnowledgeNode.id, KnowledgeNode.level, KnowledgeNode.dependents_count
+            )
+            .where(
+                KnowledgeNode.graph_id == graph_id,
+                ~select(best_due).exists(),
+                ~is_mastered,
+                has_questions(KnowledgeNode.id),
+            )
+            .cte("candidate_nodes")
+        )
+        # A candidate is blocked by any prerequisite (that has questions)
+        # whose stability is below the threshold (missing mastery = 0)
+        parent_mastery = aliased(UserMastery)
+        is_blocked = (
+            select(1)
+            .select_from(Prerequisite)
+            .outerjoin(
+                parent_mastery,
+                and_(
+                    parent_mastery.user_id == user_id,
+                    parent_mastery.graph_id == graph_id,
+                    parent_mastery.node_id == Prerequisite.from_node_id,
+                ),
+            )
+            .where(
+                Prerequisite.graph_id == graph_id,
+                Prerequisite.to_node_id == candidates.c.id,
+                has_questions(Prerequisite.from_node_id),
+                func.coalesce(parent_mastery.fsrs_stability, 0.0)
+                < self.STABILITY_THRESHOLD,
+            )
+            .exists()
+        )
+        best_new = (
+            select(
+                candidates.c.id.label("node_id"),
+                literal("new_learning").label("reason"),
+                null().cast(Float).label("score"),
+                literal(2).label("phase"),
+            )
+            .where(~is_blocked)
+            .order_by(
+                func.coalesce(candidates.c.level, 999),
+                func.coalesce(candidates.c.dependents_count, 0).desc(),
+                candidates.c.id,
+            )
+            .limit(1)
+            .cte("best_new")
+        )
+        # Fallback (deadlock breaker): lowest level, prerequisites ignored
+        best_fallback = (
+            select(
+                candidates.c.id.label("node_id"),
+                literal("new_learning").label("reason"),
+                null().cast(Float).label("score"),
+                literal(3).label("phase"),
+            )
+            .order_by(func.coalesce(candidates.c.level, 999), candidates.c.id)
+            .limit(1)
+            .cte("best_fallback")
+        )
+
+        phases = union_all(
+            select(best_due), select(best_new), select(best_fallback)
+        ).subquery("phases")
+        chosen = select(phases).order_by(phases.c.phase).limit(1).cte("chosen")
+
+        # Random question of the chosen node
+        picked = (
+            select(Question)
+            .where(Question.graph_id == graph_id, Question.node_id == chosen.c.node_id)
+            .order_by(func.random())
+            .limit(1)
+            .lateral("picked_question")
+        )
+        picked_question = aliased(Question, picked)
+
+        return (
+            select(KnowledgeNode, picked_question, chosen.c.reason, chosen.c.score)
+            .select_from(chosen)
+            .join(KnowledgeNode, KnowledgeNode.id == chosen.c.node_id)
+            .outerjoin(picked, true())
+        )
@@ -0,0 +1,177 @@
+"""
+Retrievability Refresh Service - Background recomputation of cached R(t).
+
+UserMastery.cached_retrievability is only refreshed when a user answers a
+question, so every reader of the cached value (visualization, due-node
+sorting) drifts as time passes. This job walks the whole user_mastery table
+and rewrites the cached value:
+
+- Keyset pagination on the primary key (one page in memory per in-flight batch)
+- Vectorized R(t) via MasteryLogic.calculate_retrievabilities
+- One set-based UPDATE per batch, each batch in its own short transaction
+- Configurable batch size and number of concurrent writers
+
+Usage:
+    python -m app.services.retrievability_refresh --batch-size 5000 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from app.core.config import settings
+from app.core.database import DatabaseManager
+from app.crud import mastery as mastery_crud
+from app.domain.mastery_logic import MasteryLogic
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetrievabilityRefreshReport:
+    """Throughput report for one refresh run."""
+
+    rows_scanned: int = 0
+    rows_updated: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rows_scanned / self.elapsed_seconds
+
+    def __str__(self) -> str:
+        return (
+            f"scanned={self.rows_scanned} updated={self.rows_updated} "
+            f"batches={self.batches} elapsed={self.elapsed_seconds:.2f}s "
+            f"throughput={self.rows_per_second:.0f} rows/s"
+        )
+
+
+class RetrievabilityRefreshService:
+    """
+    Recompute cached_retrievability for every mastery row.
+
+    A single reader pages through the table by primary key and hands pages
+    to `concurrency` writer tasks through a bounded queue, so at most
+    `concurrency + 1` pages are held in memory at any time.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+    ):
+        self.db_manager = db_manager
+        self.batch_size = batch_size or settings.RETRIEVABILITY_REFRESH_BATCH_SIZE
+        self.concurrency = concurrency or settings.RETRIEVABILITY_REFRESH_CONCURRENCY
+        if self.batch_size < 1 or self.concurrency < 1:
+            raise ValueError("batch_size and concurrency must be positive")
+
+    async def run(self, now: datetime | None = None) -> RetrievabilityRefreshReport:
+        """
+        Run a full refresh pass.
+
+        Args:
+            now: Timestamp to evaluate R(t) at (defaults to the current time)
+
+        Returns:
+            RetrievabilityRefreshReport with row counts and throughput
+        """
+        now = now or datetime.now(UTC)
+        report = RetrievabilityRefreshReport()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        started = time.perf_counter()
+
+        writers = [
+            asyncio.create_task(self._write_batches(queue, now, report))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            await self._read_pages(queue, report)
+            for _ in writers:
+                await queue.put(None)
+            await asyncio.gather(*writers)
+        except BaseException:
+            for writer in writers:
+                writer.cancel()
+            await asyncio.gather(*writers, return_exceptions=True)
+            raise
+
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"Retrievability refresh finished: {report}")
+        return report
+
+    async def _read_pages(
+        self, queue: asyncio.Queue, report: RetrievabilityRefreshReport
+    ) -> None:
+        """Producer: stream keyset pages into the queue."""
+        after_key = None
+        while True:
+            async with self.db_manager.get_sql_session() as session:
+                rows = await mastery_crud.get_mastery_fsrs_page(
+                    session, after_key, self.batch_size
+                )
+            if not rows:
+                return
+
+            report.rows_scanned += len(rows)
+            last = rows[-1]
+            after_key = (last.user_id, last.graph_id, last.node_id)
+            await queue.put(rows)
+
+            if len(rows) < self.batch_size:
+                return
+
+    async def _write_batches(
+        self,
+        queue: asyncio.Queue,
+        now: datetime,
+        report: RetrievabilityRefreshReport,
+    ) -> None:
+        """Consumer: compute R(t) for a page and write it back in one UPDATE."""
+        while (rows := await queue.get()) is not None:
+            retrievabilities = MasteryLogic.calculate_retrievabilities(
+                [row.fsrs_stability for row in rows],
+                [row.last_review for row in rows],
+                now,
+            )
+            keys = [(row.user_id, row.graph_id, row.node_id) for row in rows]
+
+            async with self.db_manager.get_sql_session() as session:
+                updated = await mastery_crud.bulk_update_cached_retrievability(
+                    session, keys, retrievabilities.tolist(), now
+                )
+
+            report.rows_updated += updated
+            report.batches += 1
+            logger.debug(f"Refreshed batch of {len(rows)} rows ({updated} changed)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute cached_retrievability for all mastery rows."
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(settings)
+    try:
+        service = RetrievabilityRefreshService(
+            db_manager, batch_size=args.batch_size, concurrency=args.concurrency
+        )
+        report = await service.run()
+        print(report)
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Review History Compaction - Trim review_events down to the newest N per row.
+
+New reviews trim their own mastery row inline (MasteryService), but rows
+reviewed before the cap existed (or before it was lowered) keep their full
+history until this batch job runs:
+
+1. Adds user_mastery.review_count / lapse_count / first_review (if missing)
+   and derives them from review_events for rows not yet summarised, so the
+   lifetime totals survive the trim
+2. Walks the oversized mastery rows in primary key order and deletes all
+   but the newest --keep events of each, one short transaction per batch
+
+Run it after app/services/review_log_backfill.py on databases that had the
+legacy review_log column.
+
+Usage:
+    python -m app.services.review_history_compaction --keep 100 --batch-size 500
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import DatabaseManager
+from app.crud import review_event as review_event_crud
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+_SUMMARY_COLUMNS = (
+    "ADD COLUMN IF NOT EXISTS review_count INTEGER NOT NULL DEFAULT 0",
+    "ADD COLUMN IF NOT EXISTS lapse_count INTEGER NOT NULL DEFAULT 0",
+    "ADD COLUMN IF NOT EXISTS first_review TIMESTAMP WITH TIME ZONE",
+)
+
+
+@dataclass
+class ReviewHistoryCompactionReport:
+    """Progress report for one compaction run."""
+
+    rows_summarised: int = 0
+    rows_scanned: int = 0
+    events_deleted: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"summarised={self.rows_summarised} scanned={self.rows_scanned} "
+            f"deleted={self.events_deleted} batches={self.batches} "
+            f"elapsed={self.elapsed_seconds:.2f}s"
+        )
+
+
+class ReviewHistoryCompactionService:
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        keep: int | None = None,
+        batch_size: int | None = None,
+    ):
+        self.db_manager = db_manager
+        self.keep = keep if keep is not None else settings.REVIEW_HISTORY_MAX_EVENTS
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+
+    async def run(self) -> ReviewHistoryCompactionReport:
+        if self.keep <= 0:
+            raise ValueError("keep must be positive (0 means keep everything)")
+
+        started = time.perf_counter()
+        report = ReviewHistoryCompactionReport()
+
+        async with self.db_manager.sql_engine.begin() as conn:
+            for column in _SUMMARY_COLUMNS:
+                await conn.execute(text(f"ALTER TABLE user_mastery {column}"))
+
+        async with self.db_manager.get_sql_session() as session:
+            report.rows_summarised = await review_event_crud.backfill_review_summary(
+                session
+            )
+
+        after = None
+        while True:
+            async with self.db_manager.get_sql_session() as session:
+                keys = await review_event_crud.get_oversized_mastery_keys(
+                    session, self.keep, self.batch_size, after
+                )
+                if not keys:
+                    break
+                deleted = await review_event_crud.trim_review_events(
+                    session, keys, self.keep
+                )
+
+            after = keys[-1]
+            report.rows_scanned += len(keys)
+            report.events_deleted += deleted
+            report.batches += 1
+            logger.info(f"Compacted review history: {report}")
+
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"Review history compaction finished: {report}")
+        return report
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Trim review_events to the newest N events per mastery row."
+    )
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=None,
+        help="Events kept per row (default: REVIEW_HISTORY_MAX_EVENTS)",
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(settings)
+    try:
+        service = ReviewHistoryCompactionService(
+            db_manager, keep=args.keep, batch_size=args.batch_size
+        )
+        report = await service.run()
+        print(report)
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
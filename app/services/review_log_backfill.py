@@ -0,0 +1,144 @@
+"""
+Review Log Backfill - Move user_mastery.review_log into review_events.
+
+The FSRS review history used to be a JSONB array on every UserMastery row,
+rewritten in full on each answer. It now lives in the append-only
+review_events table, with UserMastery.last_step holding the one value the
+scheduler reads. This one-off migration upgrades an existing database:
+
+1. Adds user_mastery.last_step and creates review_events (if missing), and
+   gives the legacy review_log column a default so rows inserted by the new
+   code (which no longer sets it) are accepted during the rollout
+2. Moves the logs in batches, each in its own short transaction (resumable:
+   migrated rows are left with an empty review_log)
+3. With --drop-column, drops review_log once every row is migrated
+
+Run step 1 (any invocation) before deploying code that writes review_events;
+--drop-column once no old instances are left.
+
+Usage:
+    python -m app.services.review_log_backfill --batch-size 1000 [--drop-column]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import DatabaseManager
+from app.crud import review_event as review_event_crud
+from app.models.review_event import ReviewEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class ReviewLogBackfillReport:
+    """Progress report for one backfill run."""
+
+    rows_migrated: int = 0
+    events_inserted: int = 0
+    batches: int = 0
+    column_dropped: bool = False
+    elapsed_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"rows={self.rows_migrated} events={self.events_inserted} "
+            f"batches={self.batches} column_dropped={self.column_dropped} "
+            f"elapsed={self.elapsed_seconds:.2f}s"
+        )
+
+
+class ReviewLogBackfillService:
+    def __init__(self, db_manager: DatabaseManager, batch_size: int | None = None):
+        self.db_manager = db_manager
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+
+    async def run(self, drop_column: bool = False) -> ReviewLogBackfillReport:
+        started = time.perf_counter()
+        report = ReviewLogBackfillReport()
+
+        async with self.db_manager.get_sql_session() as session:
+            has_legacy_column = await review_event_crud.legacy_review_log_exists(
+                session
+            )
+        await self._prepare_schema(has_legacy_column)
+
+        if has_legacy_column:
+            while True:
+                async with self.db_manager.get_sql_session() as session:
+                    rows, events = (
+                        await review_event_crud.migrate_legacy_review_log_batch(
+                            session, self.batch_size
+                        )
+                    )
+                if rows == 0:
+                    break
+                report.rows_migrated += rows
+                report.events_inserted += events
+                report.batches += 1
+                logger.info(f"Migrated review logs: {report}")
+
+            if drop_column:
+                async with self.db_manager.sql_engine.begin() as conn:
+                    await conn.execute(
+                        text("ALTER TABLE user_mastery DROP COLUMN review_log")
+                    )
+                report.column_dropped = True
+
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"Review log backfill finished: {report}")
+        return report
+
+    async def _prepare_schema(self, has_legacy_column: bool) -> None:
+        """Bring an existing database to the new schema (idempotent)."""
+        async with self.db_manager.sql_engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "ALTER TABLE user_mastery ADD COLUMN IF NOT EXISTS last_step INTEGER"
+                )
+            )
+            await conn.run_sync(
+                lambda sync_conn: ReviewEvent.__table__.create(
+                    sync_conn, checkfirst=True
+                )
+            )
+            if has_legacy_column:
+                await conn.execute(
+                    text(
+                        "ALTER TABLE user_mastery "
+                        "ALTER COLUMN review_log SET DEFAULT '[]'::jsonb"
+                    )
+                )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move user_mastery.review_log into the review_events table."
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument(
+        "--drop-column",
+        action="store_true",
+        help="Drop user_mastery.review_log after migrating every row",
+    )
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(settings)
+    try:
+        service = ReviewLogBackfillService(db_manager, batch_size=args.batch_size)
+        report = await service.run(drop_column=args.drop_column)
+        print(report)
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+def accepts(request: Request, media_type: str) -> bool:
+    """Whether the Accept header explicitly lists `media_type`."""
+    return any(
+        part.split(";")[0].strip() == media_type
+        for part in request.headers.get("accept", "").split(",")
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether If-None-Match names `etag` (weak comparison, as RFC 9110 requires
+    for If-None-Match), or is "*".
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    bare = etag.removeprefix("W/")
+    return any(
+        tag.strip() == "*" or tag.strip().removeprefix("W/") == bare
+        for tag in header.split(",")
+    )
+
+
+def unmodified_since(request: Request, last_modified: datetime) -> bool:
+    """Whether If-Modified-Since is at or after `last_modified` (1 s precision)."""
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    """Validator headers sent with both 200 and 304 responses."""
+    headers = {"ETag": etag, "Vary": "Accept", "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(UTC), usegmt=True
+        )
+    return headers
+
+
+def not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> Response | None:
+    """
+    A 304 response if the client's copy is current, else None.
+
+    If-None-Match takes precedence; If-Modified-Since is only evaluated when
+    the request carries no If-None-Match (RFC 9110 section 13.2.2).
+    """
+    if "if-none-match" in request.headers:
+        fresh = etag_matches(request, etag)
+    else:
+        fresh = last_modified is not None and unmodified_since(request, last_modified)
+    if not fresh:
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag, last_modified),
+    )
+
@@ -1,5 +1,11 @@
-from collections.abc import Callable
+import json
+import uuid
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+from redis.asyncio import Redis
 
 from app.core.database import DatabaseManager
 
@@ -7,7 +13,16 @@ MAX_RETRIES = 3
 RETRY_DELAY_BASE = 2  # in seconds
 MAIN_QUEUE_NAME = "general_task_queue"
 DLQ_NAME = "general_task_dlq"  # The name for our Dead-Letter Queue
-TASK_HANDLERS: dict[str, Callable] = {}
+# Tasks in flight are parked here until acked, so a crashed worker can
+# re-queue them on restart (redelivery is made safe by idempotency keys)
+PROCESSING_QUEUE_PREFIX = f"{MAIN_QUEUE_NAME}:processing"
+
+# Registered task types
+PROPAGATE_MASTERY_TASK = "propagate_mastery"
+
+# handler(payload, ctx, idempotency_key)
+TaskHandler = Callable[[dict[str, Any], "WorkerContext", str], Awaitable[None]]
+TASK_HANDLERS: dict[str, TaskHandler] = {}
 
 
 class WorkerContext:
@@ -15,11 +30,7 @@ class WorkerContext:
         self.db_manager = db_mng
 
     @property
-    # def neo4j_driver(self):
-    #     return self.db_manager.neo4j_driver
-
-    @property
-    def redis_client(self):
+    def redis_client(self) -> Redis:
         return self.db_manager.redis_client
 
     @asynccontextmanager
@@ -34,3 +45,34 @@ def register_handler(task_type: str):
         return func
 
     return decorator
+
+
+async def enqueue_task(
+    redis_client: Redis,
+    task_type: str,
+    payload: dict[str, Any],
+    idempotency_key: str | None = None,
+    queue_name: str = MAIN_QUEUE_NAME,
+) -> str:
+    """
+    Push a task onto the worker queue.
+
+    Args:
+        redis_client: Redis client
+        task_type: Registered task type (key of TASK_HANDLERS)
+        payload: JSON-serializable task arguments
+        idempotency_key: Key that makes redelivery safe (defaults to a new UUID)
+        queue_name: Target queue
+
+    Returns:
+        The task's idempotency key
+    """
+    idempotency_key = idempotency_key or str(uuid.uuid4())
+    task = {
+        "task_type": task_type,
+        "payload": payload,
+        "idempotency_key": idempotency_key,
+        "enqueued_at": datetime.now(UTC).isoformat(),
+    }
+    await redis_client.lpush(queue_name, json.dumps(task))
+    return idempotency_key
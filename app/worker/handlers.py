@@ -0,0 +1,50 @@
+"""
+Task handlers for the background worker.
+
+Each handler is registered in TASK_HANDLERS via @register_handler and is
+called as handler(payload, ctx, idempotency_key). A handler runs in its own
+SQL transaction; raising makes the worker retry (and eventually DLQ) it.
+"""
+
+import logging
+from uuid import UUID
+
+from app.crud.knowledge_node import get_node_by_id
+from app.models.user import User
+from app.services.mastery import MasteryService
+from app.worker.config import PROPAGATE_MASTERY_TASK, WorkerContext, register_handler
+
+logger = logging.getLogger(__name__)
+
+
+def propagation_idempotency_key(answer_id: UUID) -> str:
+    """One propagation per submitted answer."""
+    return f"{PROPAGATE_MASTERY_TASK}:{answer_id}"
+
+
+@register_handler(PROPAGATE_MASTERY_TASK)
+async def handle_propagate_mastery(
+    payload: dict, ctx: WorkerContext, idempotency_key: str
+) -> None:
+    """
+    Apply implicit reviews to the prerequisites of a correctly answered node.
+
+    Payload:
+        user_id, node_id, is_correct, p_g, p_s
+    """
+    async with ctx.sql_session() as session:
+        user = await session.get(User, UUID(payload["user_id"]))
+        node = await get_node_by_id(session, UUID(payload["node_id"]))
+        if user is None or node is None:
+            logger.warning(f"Skipping propagation {idempotency_key}: user/node gone")
+            return
+
+        await MasteryService().propagate_mastery_once(
+            session,
+            user,
+            node,
+            is_correct=payload["is_correct"],
+            p_g=payload["p_g"],
+            p_s=payload["p_s"],
+            idempotency_key=idempotency_key,
+        )
@@ -1,181 +1,261 @@
-# import asyncio
-# import json
-# import traceback
-# from datetime import UTC, datetime
-
-# from app.core.database import DatabaseManager, db_manager
-# from app.worker.config import (
-#     DLQ_NAME,
-#     MAIN_QUEUE_NAME,
-#     MAX_RETRIES,
-#     TASK_HANDLERS,
-#     WorkerContext,
-# )
-
-
-# async def move_to_dlq(
-#     redis_client, task: dict, error_message: str, retry_count: int = 0
-# ):
-#     dlq_payload = {
-#         "original_task": task,
-#         "error_message": error_message,
-#         "retry_count": retry_count,
-#         "failed_at": datetime.now(UTC).isoformat(),
-#         "traceback": traceback.format_exc(),
-#     }
-
-#     await redis_client.lpush(DLQ_NAME, json.dumps(dlq_payload))
-#     # task_type = task.get("task_type", "unknown")
-#     print(f"🚨 Task move to DLQ: {task.get("task_type")}")
-
-
-# async def process_task(task_data: str, ctx: WorkerContext, max_retries: int = 3):
-#     task = json.loads(task_data)
-#     task_type = task.get("task_type")
-#     payload = task.get("payload", {})
-
-#     handler = TASK_HANDLERS.get(task_type)
-#     if not handler:
-#         print(f"⚠️ Unknow task type: {task_type}. Move to DLQ")
-#         await move_to_dlq(ctx.redis_client, task, "Unknow task type")
-#         return
-
-#     for attempt in range(MAX_RETRIES):
-#         try:
-#             await handler(payload, ctx)
-#             print(f"✅ Successfully processed task of type: {task_type}")
-#             return
-#         except Exception as e:
-#             print(
-#                 f"❌ Attempt #{attempt + 1}/{max_retries} failed for task '{task_type}': {e}"
-#             )
-#             if attempt + 1 == max_retries:
-#                 await move_to_dlq(ctx.redis_client, task, str(e))
-
-#             else:
-#                 await asyncio.sleep(2**attempt)
-
-
-# class WorkerStats:
-
-#     def __init__(self):
-#         self.processed_count = 0
-#         self.failed_count = 0
-#         self.start_time = datetime.now(UTC)
-
-#     def increment_processed(self):
-#         self.processed_count += 1
-
-#     def increment_failed(self):
-#         self.failed_count += 1
-
-#     def get_stats(self) -> dict:
-#         runtime = (datetime.now() - self.start_time).total_seconds()
-#         return {
-#             "processed_count": self.processed_count,
-#             "failed_count": self.failed_count,
-#             "runtime": runtime,
-#             "throughput": self.processed_count / runtime if runtime > 0 else 0,
-#             "start_time": self.start_time.isoformat(),
-#         }
-
-#     def print_stats(self):
-#         stats = self.get_stats()
-#         print(f"\n{'=' * 50}")
-#         print("📊 Worker Statistics")
-#         print(f"{'=' * 50}")
-#         print(f"✅ Processed: {stats['processed']}")
-#         print(f"❌ Failed: {stats['failed']}")
-#         print(f"⏱️  Runtime: {stats['runtime_seconds']:.2f}s")
-#         print(f"🚀 Throughput: {stats['throughput']:.2f} tasks/sec")
-#         print(f"{'=' * 50}\n")
-
-
-# class AsyncWorker:
-
-#     def __init__(self, db_mng: DatabaseManager, queue_name: str = MAIN_QUEUE_NAME):
-#         self.db_manager = db_mng
-#         self.queue_name = queue_name
-#         self.ctx = WorkerContext(db_mng)
-#         self.stats = WorkerStats()
-#         self.running = False
-
-#     async def start(self):
-#         """Start the worker."""
-#         print(f"\n{'='*50}")
-#         print("🚀 Starting Worker")
-#         print(f"{'=' * 50}")
-#         print(f"📥 Listening on queue: {self.queue_name}")
-#         print(f"📊 DLQ: {DLQ_NAME}")
-#         print(f"🔄 Max retries: {MAX_RETRIES}")
-#         print(f"📝 Registered handlers: {len(TASK_HANDLERS)}")
-#         for task_type in TASK_HANDLERS.keys():
-#             print(f"   - {task_type}")
-#         print(f"{'=' * 50}\n")
-
-#         await self.db_manager.initialize()
-
-#         self.running = True
-
-#         try:
-#             await self._run_loop()
-#         except KeyboardInterrupt:
-#             print("\n⚠️ Received shutdown signal...")
-#         finally:
-#             await self.shutdown()
-
-#     async def _run_loop(self):
-#         """
-#         main loop
-#         """
-#         while self.running:
-#             try:
-#                 result = await self.ctx.redis_client.brpop(self.queue_name, timeout=1)
-
-#                 if result is None:
-#                     continue
-
-#                 _, task_data = result
-
-#                 try:
-#                     await process_task(task_data, self.ctx)
-#                     self.stats.increment_processed()
-#                 except Exception as e:
-#                     print(f"🚨 Critical error processing task: {e}")
-#                     self.stats.increment_failed()
-
-#                 if self.stats.processed_count % 100 == 0:
-#                     self.stats.print_stats()
-
-#             except Exception as e:
-#                 print(f"🚨 Worker loop error: {e}")
-#                 await asyncio.sleep(1)
-
-#     async def shutdown(self):
-#         """
-#         showdown the worker
-#         """
-#         print("\n Shutting down worker")
-#         self.running = False
-#         self.stats.print_stats()
-#         await db_manager.close()
-#         print("✅ Worker shutdown complete\n")
-
-
-# async def main():
-#     """Main entry point for the worker."""
-#     worker = AsyncWorker(db_manager)
-#     await worker.start()
-
-
-# # Auto-start the worker when this module is run
-# if __name__ == "__main__":
-#     asyncio.run(main())
-# else:
-#     # When run as a module (python -m app.worker.worker), also start
-#     import sys
-
-#     if "app.worker.worker" in sys.modules:
-#         # Check if we're being run as the main module
-#         if sys.argv[0].endswith("worker.py") or sys.argv[0].endswith("-m"):
-#             asyncio.run(main())
+"""
+Async Worker - Redis-backed background task consumer.
+
+Tasks are JSON envelopes pushed by app.worker.config.enqueue_task:
+
+    {"task_type": ..., "payload": {...}, "idempotency_key": ..., "enqueued_at": ...}
+
+Delivery:
+- BLMOVE from the main queue into a per-worker processing list; the task is
+  removed from that list (acked) only after it finished or went to the DLQ
+- On startup, anything left in the processing list by a crashed run is
+  moved back to the main queue (handlers must therefore be idempotent)
+- Up to settings.WORKER_CONCURRENCY tasks run concurrently
+- Each task is retried MAX_RETRIES times with exponential backoff, then
+  moved to the DLQ together with the error and traceback
+
+Usage:
+    python -m app.worker
+"""
+
+import asyncio
+import json
+import logging
+import signal
+import socket
+import traceback
+from datetime import UTC, datetime
+
+from app.core.config import settings
+from app.core.database import DatabaseManager, db_manager
+from app.worker import handlers  # noqa: F401  (registers TASK_HANDLERS)
+from app.worker.config import (
+    DLQ_NAME,
+    MAIN_QUEUE_NAME,
+    MAX_RETRIES,
+    PROCESSING_QUEUE_PREFIX,
+    RETRY_DELAY_BASE,
+    TASK_HANDLERS,
+    WorkerContext,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def move_to_dlq(
+    redis_client, task: dict, error_message: str, retry_count: int = 0
+):
+    dlq_payload = {
+        "original_task": task,
+        "error_message": error_message,
+        "retry_count": retry_count,
+        "failed_at": datetime.now(UTC).isoformat(),
+        "traceback": traceback.format_exc(),
+    }
+
+    await redis_client.lpush(DLQ_NAME, json.dumps(dlq_payload))
+    logger.error(f"🚨 Task moved to DLQ: {task.get('task_type')} ({error_message})")
+
+
+async def process_task(
+    task_data: str, ctx: WorkerContext, max_retries: int = MAX_RETRIES
+) -> bool:
+    """
+    Run one task with retries.
+
+    Returns:
+        True if the handler succeeded, False if the task went to the DLQ
+    """
+    try:
+        task = json.loads(task_data)
+    except json.JSONDecodeError as e:
+        await move_to_dlq(ctx.redis_client, {"raw": task_data}, f"Invalid JSON: {e}")
+        return False
+
+    task_type = task.get("task_type")
+    payload = task.get("payload", {})
+    idempotency_key = task.get("idempotency_key")
+
+    handler = TASK_HANDLERS.get(task_type)
+    if not handler:
+        logger.warning(f"⚠️ Unknown task type: {task_type}. Moving to DLQ")
+        await move_to_dlq(ctx.redis_client, task, "Unknown task type")
+        return False
+
+    for attempt in range(max_retries):
+        try:
+            await handler(payload, ctx, idempotency_key)
+            logger.info(f"✅ Successfully processed task of type: {task_type}")
+            return True
+        except Exception as e:
+            logger.warning(
+                f"❌ Attempt #{attempt + 1}/{max_retries} failed for task "
+                f"'{task_type}': {e}"
+            )
+            if attempt + 1 == max_retries:
+                await move_to_dlq(ctx.redis_client, task, str(e), attempt + 1)
+            else:
+                await asyncio.sleep(RETRY_DELAY_BASE**attempt)
+    return False
+
+
+class WorkerStats:
+    def __init__(self):
+        self.processed_count = 0
+        self.failed_count = 0
+        self.start_time = datetime.now(UTC)
+
+    def increment_processed(self):
+        self.processed_count += 1
+
+    def increment_failed(self):
+        self.failed_count += 1
+
+    def get_stats(self) -> dict:
+        runtime = (datetime.now(UTC) - self.start_time).total_seconds()
+        return {
+            "processed_count": self.processed_count,
+            "failed_count": self.failed_count,
+            "runtime_seconds": runtime,
+            "throughput": self.processed_count / runtime if runtime > 0 else 0,
+            "start_time": self.start_time.isoformat(),
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(
+            f"📊 Worker stats: processed={stats['processed_count']} "
+            f"failed={stats['failed_count']} "
+            f"runtime={stats['runtime_seconds']:.2f}s "
+            f"throughput={stats['throughput']:.2f} tasks/sec"
+        )
+
+
+class AsyncWorker:
+    def __init__(
+        self,
+        db_mng: DatabaseManager,
+        queue_name: str = MAIN_QUEUE_NAME,
+        concurrency: int | None = None,
+        worker_id: str | None = None,
+    ):
+        self.db_manager = db_mng
+        self.queue_name = queue_name
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        # Stable across restarts, so a restarted worker finds its own list
+        self.worker_id = worker_id or socket.gethostname()
+        self.processing_queue = f"{PROCESSING_QUEUE_PREFIX}:{self.worker_id}"
+        self.ctx = WorkerContext(db_mng)
+        self.stats = WorkerStats()
+        self.running = False
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def start(self):
+        """Start the worker."""
+        logger.info(
+            f"🚀 Starting worker {self.worker_id} on queue '{self.queue_name}' "
+            f"(DLQ: {DLQ_NAME}, max retries: {MAX_RETRIES}, "
+            f"concurrency: {self.concurrency})"
+        )
+        logger.info(f"📝 Registered handlers: {sorted(TASK_HANDLERS)}")
+
+        await self.db_manager.initialize()
+        is_ok, error = await self.db_manager._check_redis()
+        if not is_ok:
+            raise RuntimeError(error)
+
+        await self.requeue_in_flight()
+        self.running = True
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except NotImplementedError:  # pragma: no cover - non-Unix
+                pass
+
+        try:
+            await self._run_loop()
+        finally:
+            await self.shutdown()
+
+    def stop(self):
+        logger.info("⚠️ Received shutdown signal...")
+        self.running = False
+
+    async def requeue_in_flight(self) -> int:
+        """Move tasks left in this worker's processing list back to the queue."""
+        requeued = 0
+        while await self.ctx.redis_client.lmove(
+            self.processing_queue, self.queue_name, "RIGHT", "RIGHT"
+        ):
+            requeued += 1
+        if requeued:
+            logger.warning(f"🔁 Re-queued {requeued} in-flight task(s)")
+        return requeued
+
+    async def _run_loop(self):
+        """
+        main loop
+        """
+        slots = asyncio.Semaphore(self.concurrency)
+        while self.running:
+            await slots.acquire()
+            try:
+                task_data = await self.ctx.redis_client.blmove(
+                    self.queue_name, self.processing_queue, 1, "RIGHT", "LEFT"
+                )
+            except Exception as e:
+                slots.release()
+                logger.error(f"🚨 Worker loop error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if task_data is None:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(self._handle(task_data))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _handle(self, task_data: str):
+        try:
+            if await process_task(task_data, self.ctx):
+                self.stats.increment_processed()
+            else:
+                self.stats.increment_failed()
+        except Exception as e:
+            logger.error(f"🚨 Critical error processing task: {e}", exc_info=True)
+            self.stats.increment_failed()
+            return  # leave it in the processing list for redelivery
+
+        # Ack: the task either succeeded or is in the DLQ
+        await self.ctx.redis_client.lrem(self.processing_queue, 1, task_data)
+
+        if self.stats.processed_count and self.stats.processed_count % 100 == 0:
+            self.stats.log_stats()
+
+    async def shutdown(self):
+        """
+        Shut down the worker
+        """
+        logger.info("Shutting down worker")
+        self.running = False
+        self.stats.log_stats()
+        await self.db_manager.close()
+        logger.info("✅ Worker shutdown complete")
+
+
+async def main():
+    """Main entry point for the worker."""
+    worker = AsyncWorker(db_manager)
+    await worker.start()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
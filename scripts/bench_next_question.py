@@ -0,0 +1,171 @@
+"""
+Benchmark: single round-trip next-question vs. the multi-query reference path.
+
+Seeds a throwaway user + graph, then times QuestionService.select_next_node
+(+ the separate question fetch the route used to do) against
+QuestionService.select_next_question, and checks that both pick the same node.
+
+Usage:
+    uv run python scripts/bench_next_question.py --nodes 2000 --iterations 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, text  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import DatabaseManager  # noqa: E402
+from app.crud.question import get_questions_by_node  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.knowledge_graph import KnowledgeGraph  # noqa: E402
+from app.models.knowledge_node import KnowledgeNode, Prerequisite  # noqa: E402
+from app.models.question import Question, QuestionDifficulty, QuestionType  # noqa: E402
+from app.models.user import FSRSState, User, UserMastery  # noqa: E402
+from app.services.question_rec import QuestionService  # noqa: E402
+
+
+async def seed(db_manager: DatabaseManager, num_nodes: int, due_ratio: float):
+    rng = random.Random(42)
+    now = datetime.now(UTC)
+    async with db_manager.get_sql_session() as session:
+        user = User(email=f"bench-{time.time_ns()}@example.com", name="bench")
+        session.add(user)
+        await session.flush()
+        graph = KnowledgeGraph(
+            owner_id=user.id, name="bench", slug=f"bench-{time.time_ns()}"
+        )
+        session.add(graph)
+        await session.flush()
+
+        nodes = [
+            KnowledgeNode(
+                graph_id=graph.id,
+                node_name=f"n{i}",
+                level=i // 50,
+                dependents_count=rng.randint(0, 5),
+            )
+            for i in range(num_nodes)
+        ]
+        session.add_all(nodes)
+        await session.flush()
+
+        for i, node in enumerate(nodes):
+            for parent in rng.sample(nodes[:i], min(i, 2)):
+                session.add(
+                    Prerequisite(
+                        graph_id=graph.id, from_node_id=parent.id, to_node_id=node.id
+                    )
+                )
+            for _ in range(3):
+                session.add(
+                    Question(
+                        graph_id=graph.id,
+                        node_id=node.id,
+                        question_type=QuestionType.MULTIPLE_CHOICE.value,
+                        text="bench",
+                        details={
+                            "question_type": QuestionType.MULTIPLE_CHOICE.value,
+                            "options": ["a", "b"],
+                            "correct_answer": 0,
+                            "p_g": 0.5,
+                            "p_s": 0.1,
+                        },
+                        difficulty=QuestionDifficulty.EASY.value,
+                    )
+                )
+            if rng.random() < 0.5:
+                overdue = rng.random() < due_ratio
+                session.add(
+                    UserMastery(
+                        user_id=user.id,
+                        graph_id=graph.id,
+                        node_id=node.id,
+                        cached_retrievability=rng.random(),
+                        fsrs_state=FSRSState.REVIEW.value,
+                        fsrs_stability=rng.uniform(0.5, 10.0),
+                        fsrs_difficulty=5.0,
+                        due_date=now
+                        + timedelta(hours=rng.choice([-100, -30, -5]) if overdue else 48),
+                        last_review=now - timedelta(days=2),
+                    )
+                )
+        return user.id, graph.id
+
+
+async def reference_path(session, service, user_id, graph_id):
+    result = await service.select_next_node(session, user_id, graph_id)
+    if result.knowledge_node is not None:
+        questions = await get_questions_by_node(
+            session, graph_id=graph_id, node_id=result.knowledge_node.id
+        )
+        random.choice(questions)
+    return result
+
+
+async def single_query_path(session, service, user_id, graph_id):
+    return await service.select_next_question(session, user_id, graph_id)
+
+
+async def measure(db_manager, fn, user_id, graph_id, iterations):
+    service = QuestionService()
+    timings = []
+    picks = []
+    for _ in range(iterations):
+        async with db_manager.get_sql_session() as session:
+            started = time.perf_counter()
+            result = await fn(session, service, user_id, graph_id)
+            timings.append((time.perf_counter() - started) * 1000)
+            picks.append(result.knowledge_node.id if result.knowledge_node else None)
+    timings.sort()
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    return statistics.median(timings), p95, picks
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument(
+        "--due-ratio",
+        type=float,
+        default=0.3,
+        help="Share of mastery rows that are overdue (0 exercises Phase 3)",
+    )
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(settings)
+    await db_manager.create_all_tables(Base)
+    user_id, graph_id = await seed(db_manager, args.nodes, args.due_ratio)
+    async with db_manager.sql_engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+    try:
+        for label, fn in (
+            ("select_next_node + fetch", reference_path),
+            ("select_next_question", single_query_path),
+        ):
+            p50, p95, picks = await measure(
+                db_manager, fn, user_id, graph_id, args.iterations
+            )
+            print(f"{label:<28} p50={p50:7.2f}ms  p95={p95:7.2f}ms")
+            if fn is reference_path:
+                expected = picks
+            else:
+                mismatches = sum(a != b for a, b in zip(expected, picks, strict=True))
+                print(f"selection mismatches: {mismatches}/{args.iterations}")
+    finally:
+        async with db_manager.get_sql_session() as session:
+            await session.execute(delete(User).where(User.id == user_id))
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
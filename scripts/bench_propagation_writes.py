@@ -0,0 +1,133 @@
+"""
+Benchmark: implicit review write-back, ORM flush vs. one set-based UPDATE.
+
+Seeds a throwaway user + graph with one mastery row per ancestor, then for
+each chain length times the write phase of MasteryService.propagate_mastery:
+the previous path (setattr on every loaded row + unit-of-work flush, one
+UPDATE per ancestor) against mastery_crud.bulk_apply_implicit_reviews (one
+UPDATE ... FROM unnest(...) for the whole chain). Every iteration runs in
+its own transaction and is rolled back, so all runs see the same rows.
+
+Usage:
+    uv run python scripts/bench_propagation_writes.py --lengths 5 25 100 400
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import DatabaseManager  # noqa: E402
+from app.crud import mastery as mastery_crud  # noqa: E402
+from app.domain.mastery_logic import MasteryLogic  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.knowledge_graph import KnowledgeGraph  # noqa: E402
+from app.models.knowledge_node import KnowledgeNode  # noqa: E402
+from app.models.user import FSRSState, User, UserMastery  # noqa: E402
+
+
+async def seed(db_manager: DatabaseManager, num_nodes: int):
+    now = datetime.now(UTC)
+    async with db_manager.get_sql_session() as session:
+        user = User(email=f"bench-{time.time_ns()}@example.com", name="bench")
+        session.add(user)
+        await session.flush()
+        graph = KnowledgeGraph(
+            owner_id=user.id, name="bench", slug=f"bench-{time.time_ns()}"
+        )
+        session.add(graph)
+        await session.flush()
+
+        nodes = [
+            KnowledgeNode(graph_id=graph.id, node_name=f"n{i}")
+            for i in range(num_nodes)
+        ]
+        session.add_all(nodes)
+        await session.flush()
+        session.add_all(
+            UserMastery(
+                user_id=user.id,
+                graph_id=graph.id,
+                node_id=node.id,
+                cached_retrievability=0.8,
+                fsrs_state=FSRSState.REVIEW.value,
+                fsrs_stability=5.0,
+                fsrs_difficulty=5.0,
+                due_date=now + timedelta(days=3),
+                last_review=now - timedelta(days=2),
+            )
+            for node in nodes
+        )
+        return user.id, graph.id, [node.id for node in nodes]
+
+
+async def orm_flush_path(session, user_id, graph_id, masteries, updates):
+    for mastery, values in zip(masteries, updates, strict=True):
+        for key, value in values.items():
+            setattr(mastery, key, value)
+    await session.flush()
+
+
+async def bulk_update_path(session, user_id, graph_id, masteries, updates):
+    await mastery_crud.bulk_apply_implicit_reviews(
+        session, user_id, graph_id, [m.node_id for m in masteries], updates
+    )
+
+
+async def measure(db_manager, fn, user_id, graph_id, node_ids, iterations):
+    timings = []
+    for _ in range(iterations):
+        async with db_manager.get_sql_session() as session:
+            by_node = await mastery_crud.get_masteries_by_nodes(
+                session, user_id, graph_id, node_ids
+            )
+            masteries = [by_node[node_id] for node_id in node_ids]
+            updates = MasteryLogic.calculate_implicit_review_updates(
+                masteries, datetime.now(UTC)
+            )
+            started = time.perf_counter()
+            await fn(session, user_id, graph_id, masteries, updates)
+            timings.append((time.perf_counter() - started) * 1000)
+            await session.rollback()
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[5, 25, 100, 400])
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(settings)
+    await db_manager.create_all_tables(Base)
+    user_id, graph_id, node_ids = await seed(db_manager, max(args.lengths))
+    try:
+        print(f"{'chain':>6}  {'ORM flush':>12}  {'bulk UPDATE':>12}  speedup")
+        for length in args.lengths:
+            chain = node_ids[:length]
+            before = await measure(
+                db_manager, orm_flush_path, user_id, graph_id, chain, args.iterations
+            )
+            after = await measure(
+                db_manager, bulk_update_path, user_id, graph_id, chain, args.iterations
+            )
+            print(
+                f"{length:>6}  {before:>10.2f}ms  {after:>10.2f}ms  "
+                f"{before / after:6.1f}x"
+            )
+    finally:
+        async with db_manager.get_sql_session() as session:
+            await session.execute(delete(User).where(User.id == user_id))
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
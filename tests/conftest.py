@@ -25,8 +25,10 @@ from typing import Any
 # ============================================
 # 2. import the dependency and app
 # ============================================
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -106,6 +108,24 @@ async def test_db(
             await session.close()
 
 
+@pytest.fixture(scope="function")
+def sql_statements(test_db: AsyncSession):
+    """
+    Record every SQL statement sent by the test session's engine.
+
+    Clear the list right before the code under test to count its round trips.
+    """
+    statements: list[str] = []
+    engine = test_db.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(
     test_db: AsyncSession, test_db_manager: DatabaseManager
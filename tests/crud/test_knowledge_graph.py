@@ -8,6 +8,8 @@ These tests verify the core knowledge graph database operations:
 - Listing all template graphs
 - Node count enrichment
 - Enrollment status checks
+- Content versions (HTTP validators)
+- Denormalized node/question/prerequisite counters
 """
 
 from uuid import uuid4
@@ -21,11 +23,16 @@ from app.crud.knowledge_graph import (
     get_graph_by_id,
     get_graph_by_owner_and_slug,
     get_graphs_by_owner,
+    get_template_graph_versions,
 )
+from app.crud.knowledge_node import bulk_insert_nodes_tx, create_knowledge_node
+from app.crud.prerequisite import bulk_insert_prerequisites_tx, create_prerequisite
+from app.crud.question import bulk_create_questions
 from app.models.enrollment import GraphEnrollment
 from app.models.knowledge_graph import KnowledgeGraph
 from app.models.knowledge_node import KnowledgeNode
 from app.models.user import User
+from app.schemas.knowledge_node import KnowledgeNodeWithEmbedding
 
 
 # ==================== Get Graph Tests ====================
@@ -447,3 +454,102 @@ class TestGetAllTemplateGraphs:
         # Should not include non-template graphs
         regular_graphs = [g for g in result if not g["is_template"]]
         assert len(regular_graphs) == 0
+
+
+# ==================== Content Version Tests ====================
+class TestContentVersion:
+    """Test cases for content_version bumps and get_template_graph_versions."""
+
+    @pytest.mark.asyncio
+    async def test_node_write_bumps_content_version(
+        self,
+        test_db: AsyncSession,
+        template_graph_in_db: KnowledgeGraph,
+        user_in_db: User,
+    ):
+        """A node insert is visible in the template versions."""
+        [before] = await get_template_graph_versions(test_db, user_in_db.id)
+
+        await create_knowledge_node(test_db, template_graph_in_db.id, "New node")
+        [after] = await get_template_graph_versions(test_db, user_in_db.id)
+
+        assert before[0] == after[0] == template_graph_in_db.id
+        assert after[1] == before[1] + 1
+        assert after[2] >= before[2]
+        assert after[4] is False
+
+    @pytest.mark.asyncio
+    async def test_versions_without_user(
+        self, test_db: AsyncSession, template_graph_in_db: KnowledgeGraph
+    ):
+        """is_enrolled is None for anonymous listings."""
+        versions = await get_template_graph_versions(test_db)
+
+        assert [row[4] for row in versions] == [None]
+
+
+# ==================== Denormalized Counter Tests ====================
+def _counters(graph: KnowledgeGraph) -> tuple[int, int, int]:
+    return graph.node_count, graph.prerequisite_count, graph.question_count
+
+
+class TestGraphCounters:
+    """Test cases for node_count / question_count / prerequisite_count."""
+
+    @pytest.mark.asyncio
+    async def test_counters_follow_orm_and_bulk_inserts(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Both ORM adds and statement-level bulk inserts move the counters."""
+        graph = await create_knowledge_graph(test_db, user_in_db.id, "G", "g")
+        a = await create_knowledge_node(test_db, graph.id, "A")
+        b = await create_knowledge_node(test_db, graph.id, "B")
+        await create_prerequisite(test_db, graph.id, a.id, b.id)
+
+        inserted = await bulk_insert_nodes_tx(
+            test_db,
+            graph.id,
+            [
+                KnowledgeNodeWithEmbedding(
+                    name=f"Bulk {i}", description="", embedding=[0.0] * 768
+                )
+                for i in range(3)
+            ],
+        )
+        await bulk_insert_prerequisites_tx(test_db, graph.id, [(b.id, a.id, 0.5)])
+        await bulk_create_questions(
+            test_db,
+            graph.id,
+            [
+                {
+                    "node_id": a.id,
+                    "question_type": "multiple_choice",
+                    "text": f"Q{i}",
+                    "details": {},
+                    "difficulty": "easy",
+                }
+                for i in range(2)
+            ],
+        )
+
+        assert inserted == 3
+        # The loaded instance is kept in sync without a refresh
+        assert _counters(graph) == (5, 2, 2)
+        test_db.expire(graph)
+        await test_db.refresh(graph)
+        assert _counters(graph) == (5, 2, 2)
+
+    @pytest.mark.asyncio
+    async def test_listing_does_not_count_nodes(
+        self,
+        test_db: AsyncSession,
+        user_in_db: User,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+        sql_statements: list[str],
+    ):
+        """Listings read the maintained counter instead of scanning nodes."""
+        sql_statements.clear()
+        result = await get_graphs_by_owner(test_db, user_in_db.id)
+
+        assert [graph["node_count"] for graph in result] == [5]
+        assert not any("knowledge_nodes" in sql for sql in sql_statements)
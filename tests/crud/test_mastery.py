@@ -3,17 +3,20 @@ Tests for mastery CRUD operations.
 
 These tests verify the core mastery database operations including:
 - Basic CRUD: get_mastery, create_mastery, get_or_create_mastery
+- Upserts: upsert_masteries (multi-row, concurrent first answers)
 - Batch queries: get_masteries_by_user_and_graph, get_masteries_by_nodes
 - Complex graph traversal: get_all_affected_parent_ids, get_prerequisite_roots_to_bonus
 - Bulk operations: get_all_subtopics_for_parents_bulk
 """
 
+import asyncio
 from datetime import UTC, datetime
 from uuid import uuid4
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import DatabaseManager
 from app.crud.mastery import (
     create_mastery,
     # get_all_affected_parent_ids,
@@ -23,6 +26,7 @@ from app.crud.mastery import (
     get_mastery,
     get_or_create_mastery,
     get_prerequisite_roots_to_bonus,
+    upsert_masteries,
 )
 from app.models.knowledge_graph import KnowledgeGraph
 from app.models.user import User, UserMastery
@@ -242,6 +246,79 @@ class TestGetOrCreateMastery:
         assert mastery.cached_retrievability == 0.5
 
 
+class TestUpsertMasteries:
+    """Test cases for upsert_masteries function."""
+
+    @pytest.mark.asyncio
+    async def test_creates_missing_and_returns_existing_unchanged(
+        self,
+        test_db: AsyncSession,
+        user_in_db: User,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Should insert new rows and leave existing rows as they were."""
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        nodes = list(private_graph_with_few_nodes_and_relations_in_db["nodes"].values())
+        existing, new = nodes[0], nodes[1]
+        test_db.add(
+            UserMastery(
+                user_id=user_in_db.id,
+                graph_id=graph.id,
+                node_id=existing.id,
+                cached_retrievability=0.6,
+            )
+        )
+        await test_db.commit()
+
+        result = await upsert_masteries(
+            test_db,
+            user_in_db.id,
+            [
+                {"graph_id": graph.id, "node_id": node.id, "cached_retrievability": 0.9}
+                for node in (existing, new)
+            ],
+        )
+
+        existing_mastery, existing_created = result[(graph.id, existing.id)]
+        new_mastery, new_created = result[(graph.id, new.id)]
+        assert existing_created is False
+        assert existing_mastery.cached_retrievability == 0.6
+        assert new_created is True
+        assert new_mastery.cached_retrievability == 0.9
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_answers_do_not_conflict(
+        self,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """The second creator waits for the first and gets its row."""
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        node = private_graph_with_few_nodes_and_relations_in_db["nodes"]["chain-rule"]
+        args = (user_in_db.id, graph.id, node.id)
+
+        async with (
+            test_db_manager.get_sql_session() as first,
+            test_db_manager.get_sql_session() as second,
+        ):
+            _, first_created = await get_or_create_mastery(
+                first, *args, cached_retrievability=0.3
+            )
+            racing = asyncio.create_task(
+                get_or_create_mastery(second, *args, cached_retrievability=0.7)
+            )
+            await asyncio.sleep(0.2)
+            assert not racing.done()  # blocked on the first row's lock
+
+            await first.commit()
+            second_mastery, second_created = await racing
+
+        assert first_created is True
+        assert second_created is False
+        assert second_mastery.cached_retrievability == 0.3
+
+
 class TestGetMasteriesByUserAndGraph:
     """Test cases for get_masteries_by_user_and_graph function."""
 
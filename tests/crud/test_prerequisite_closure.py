@@ -0,0 +1,178 @@
+"""
+Tests for the prerequisite closure table.
+
+These tests verify that:
+- Incremental maintenance (create_prerequisite / bulk_insert_prerequisites_tx)
+  yields the same ancestor depths as an in-memory BFS, in any insert order
+- Pairs deeper than the configured max depth are pruned
+- A full rebuild produces the same rows as incremental maintenance
+- The propagation lookup returns depths together with the user's masteries
+"""
+
+import random
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.mastery import get_prerequisite_ancestors_with_masteries
+from app.crud.prerequisite import bulk_insert_prerequisites_tx, create_prerequisite
+from app.crud.prerequisite_closure import get_ancestor_depths
+from app.domain.graph_csr import CSRGraph
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode, PrerequisiteClosure
+from app.models.user import User, UserMastery
+from app.services.prerequisite_closure import rebuild_graph_closure
+
+
+async def _create_graph(
+    test_db: AsyncSession, user: User, num_nodes: int
+) -> tuple[KnowledgeGraph, list[KnowledgeNode]]:
+    graph = KnowledgeGraph(owner_id=user.id, name="Closure", slug="closure")
+    test_db.add(graph)
+    await test_db.flush()
+    nodes = [KnowledgeNode(graph_id=graph.id, node_name=f"N{i}") for i in range(num_nodes)]
+    test_db.add_all(nodes)
+    await test_db.commit()
+    return graph, nodes
+
+
+async def _closure_rows(test_db: AsyncSession, graph_id) -> set[tuple]:
+    result = await test_db.execute(
+        select(
+            PrerequisiteClosure.descendant_id,
+            PrerequisiteClosure.ancestor_id,
+            PrerequisiteClosure.min_depth,
+        ).where(PrerequisiteClosure.graph_id == graph_id)
+    )
+    return set(result.tuples().all())
+
+
+class TestIncrementalClosure:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", range(4))
+    async def test_matches_bfs_in_any_insert_order(
+        self, test_db: AsyncSession, user_in_db: User, seed: int
+    ):
+        """Should index every ancestor with its shortest depth."""
+        rng = random.Random(seed)
+        graph, nodes = await _create_graph(test_db, user_in_db, 12)
+        edges = [
+            (nodes[i].id, nodes[j].id)
+            for i in range(len(nodes))
+            for j in range(i + 1, len(nodes))
+            if rng.random() < 0.2
+        ]
+        rng.shuffle(edges)
+
+        # Half through the route CRUD, half through the pipeline bulk insert
+        half = len(edges) // 2
+        for from_id, to_id in edges[:half]:
+            await create_prerequisite(test_db, graph.id, from_id, to_id)
+        await bulk_insert_prerequisites_tx(
+            test_db, graph.id, [(f, t, 1.0) for f, t in edges[half:]]
+        )
+        await test_db.commit()
+
+        topology = CSRGraph.from_edges([], edges)
+        for node in nodes:
+            expected = topology.ancestor_depths(
+                node.id, settings.PREREQUISITE_CLOSURE_MAX_DEPTH
+            )
+            assert await get_ancestor_depths(test_db, graph.id, node.id) == expected
+
+    @pytest.mark.asyncio
+    async def test_prunes_beyond_max_depth(
+        self, test_db: AsyncSession, user_in_db: User, monkeypatch
+    ):
+        """Should not store pairs further apart than the configured max depth."""
+        monkeypatch.setattr(settings, "PREREQUISITE_CLOSURE_MAX_DEPTH", 2)
+        graph, nodes = await _create_graph(test_db, user_in_db, 4)
+
+        # Insert the chain back to front: N0 -> N1 -> N2 -> N3
+        for i in (2, 1, 0):
+            await create_prerequisite(test_db, graph.id, nodes[i].id, nodes[i + 1].id)
+
+        assert await get_ancestor_depths(test_db, graph.id, nodes[3].id) == {
+            nodes[2].id: 1,
+            nodes[1].id: 2,
+        }
+
+    @pytest.mark.asyncio
+    async def test_cycle_does_not_store_self_pairs(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Should terminate on cycles and never index a node as its own ancestor."""
+        graph, nodes = await _create_graph(test_db, user_in_db, 2)
+        a, b = nodes
+
+        await create_prerequisite(test_db, graph.id, a.id, b.id)
+        await create_prerequisite(test_db, graph.id, b.id, a.id)
+
+        assert await _closure_rows(test_db, graph.id) == {
+            (b.id, a.id, 1),
+            (a.id, b.id, 1),
+        }
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Should rebuild exactly the rows maintained incrementally."""
+        graph, nodes = await _create_graph(test_db, user_in_db, 5)
+        await bulk_insert_prerequisites_tx(
+            test_db,
+            graph.id,
+            [
+                (nodes[0].id, nodes[1].id, 1.0),
+                (nodes[1].id, nodes[2].id, 1.0),
+                (nodes[0].id, nodes[3].id, 1.0),
+                (nodes[3].id, nodes[2].id, 1.0),
+                (nodes[2].id, nodes[4].id, 1.0),
+            ],
+        )
+        await test_db.commit()
+        incremental = await _closure_rows(test_db, graph.id)
+
+        rows = await rebuild_graph_closure(test_db, graph.id)
+        await test_db.commit()
+
+        assert rows == len(incremental)
+        assert await _closure_rows(test_db, graph.id) == incremental
+
+
+class TestGetPrerequisiteAncestorsWithMasteries:
+    @pytest.mark.asyncio
+    async def test_returns_depths_and_masteries(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Should return every ancestor, with the user's mastery where it exists."""
+        graph, nodes = await _create_graph(test_db, user_in_db, 3)
+        a, b, c = nodes
+        await create_prerequisite(test_db, graph.id, a.id, b.id)
+        await create_prerequisite(test_db, graph.id, b.id, c.id)
+        test_db.add(
+            UserMastery(
+                user_id=user_in_db.id,
+                graph_id=graph.id,
+                node_id=b.id,
+                cached_retrievability=0.7,
+            )
+        )
+        await test_db.commit()
+
+        result = await get_prerequisite_ancestors_with_masteries(
+            test_db, user_in_db.id, graph.id, c.id
+        )
+
+        assert set(result) == {a.id, b.id}
+        depth_b, mastery_b = result[b.id]
+        assert depth_b == 1
+        assert mastery_b.cached_retrievability == 0.7
+        assert result[a.id] == (2, None)
+
+        limited = await get_prerequisite_ancestors_with_masteries(
+            test_db, user_in_db.id, graph.id, c.id, max_depth=1
+        )
+        assert set(limited) == {b.id}
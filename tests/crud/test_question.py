@@ -14,6 +14,7 @@ import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.mastery import get_mastery
 from app.crud.question import (
     _apply_question_filters,
     _ensure_uuid,
@@ -21,13 +22,14 @@ from app.crud.question import (
     create_question,
     get_node_by_question,
     get_question_by_id,
+    get_question_with_node,
     get_questions_by_graph,
     get_questions_by_node,
 )
 from app.models.knowledge_graph import KnowledgeGraph
 from app.models.knowledge_node import KnowledgeNode
 from app.models.question import Question, QuestionDifficulty, QuestionType
-from app.models.user import User
+from app.models.user import User, UserMastery
 
 
 # ==================== Helper Functions Tests ====================
@@ -486,6 +488,48 @@ class TestGetNodeByQuestion:
         assert result.graph_id == question_in_db.graph_id
 
 
+class TestGetQuestionWithNode:
+    """Test cases for get_question_with_node and the per-request identity cache."""
+
+    @pytest.mark.asyncio
+    async def test_follow_up_lookups_need_no_query(
+        self,
+        test_db: AsyncSession,
+        question_in_db: Question,
+        user_in_db: User,
+        sql_statements: list[str],
+    ):
+        """Should serve question/node/mastery lookups from the loaded rows."""
+        test_db.add(
+            UserMastery(
+                user_id=user_in_db.id,
+                graph_id=question_in_db.graph_id,
+                node_id=question_in_db.node_id,
+            )
+        )
+        await test_db.commit()
+        question_id = question_in_db.id
+        test_db.expunge_all()
+        sql_statements.clear()
+
+        question, node = await get_question_with_node(
+            test_db, question_id, user_id=user_in_db.id
+        )
+        assert len(sql_statements) == 1
+
+        assert await get_question_by_id(test_db, question_id) is question
+        assert await get_node_by_question(test_db, question) is node
+        assert await get_mastery(
+            test_db, user_in_db.id, node.graph_id, node.id
+        ) is not None
+        assert len(sql_statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_returns_none_for_nonexistent_question(self, test_db: AsyncSession):
+        """Should return None when the question does not exist."""
+        assert await get_question_with_node(test_db, uuid4()) is None
+
+
 # ==================== Create Operations Tests ====================
 class TestCreateQuestion:
     """Test cases for create_question function."""
@@ -6,12 +6,15 @@ Tests cover:
 - Error handling
 """
 
+import json
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.question import Question
 
@@ -114,3 +117,250 @@ class TestSubmitSingleAnswer:
         response = await client.post("/answer", json=payload)
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestSubmitSingleAnswerAsyncPropagation:
+    """Test POST /answer with MASTERY_PROPAGATION_ASYNC enabled."""
+
+    @pytest.fixture
+    def fake_redis(self, monkeypatch):
+        from app.core.config import settings
+        from app.core.deps import get_redis_client
+        from app.main import app
+
+        monkeypatch.setattr(settings, "MASTERY_PROPAGATION_ASYNC", True)
+        redis_client = AsyncMock()
+        app.dependency_overrides[get_redis_client] = lambda: redis_client
+        yield redis_client
+        del app.dependency_overrides[get_redis_client]
+
+    @staticmethod
+    def _payload(question: Question, selected_option: int) -> dict:
+        return {
+            "question_id": str(question.id),
+            "graph_id": str(question.graph_id),
+            "user_answer": {
+                "question_type": "multiple_choice",
+                "selected_option": selected_option,
+            },
+        }
+
+    @pytest.mark.asyncio
+    async def test_correct_answer_enqueues_propagation(
+        self,
+        authenticated_client: AsyncClient,
+        question_in_db: Question,
+        fake_redis: AsyncMock,
+    ):
+        """Should enqueue propagation keyed by the saved answer id."""
+        payload = self._payload(
+            question_in_db, question_in_db.details["correct_answer"]
+        )
+
+        with patch(
+            "app.routes.answer.MasteryService.propagate_mastery",
+            new=AsyncMock(),
+        ) as inline_propagation:
+            response = await authenticated_client.post("/answer", json=payload)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["mastery_updated"] is True
+        inline_propagation.assert_not_awaited()
+
+        _, task_data = fake_redis.lpush.call_args.args
+        task = json.loads(task_data)
+        assert task["task_type"] == "propagate_mastery"
+        assert task["idempotency_key"] == f"propagate_mastery:{data['answer_id']}"
+        assert task["payload"]["node_id"] == str(question_in_db.node_id)
+
+    @pytest.mark.asyncio
+    async def test_wrong_answer_does_not_enqueue(
+        self,
+        authenticated_client: AsyncClient,
+        question_in_db: Question,
+        fake_redis: AsyncMock,
+    ):
+        """Should not enqueue anything (only correct answers propagate)."""
+        wrong = (question_in_db.details["correct_answer"] + 1) % 3
+        response = await authenticated_client.post(
+            "/answer", json=self._payload(question_in_db, wrong)
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        fake_redis.lpush.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_inline_when_queue_unavailable(
+        self,
+        authenticated_client: AsyncClient,
+        question_in_db: Question,
+        fake_redis: AsyncMock,
+        test_db,
+    ):
+        """Should propagate inline (and claim the key) when Redis is down."""
+        from app.models.processed_task import ProcessedTask
+
+        fake_redis.lpush.side_effect = ConnectionError("redis down")
+        payload = self._payload(
+            question_in_db, question_in_db.details["correct_answer"]
+        )
+
+        response = await authenticated_client.post("/answer", json=payload)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        answer_id = response.json()["answer_id"]
+        claim = await test_db.get(ProcessedTask, f"propagate_mastery:{answer_id}")
+        assert claim is not None
+
+
+class TestSubmitAnswerRoundTrips:
+    """Query-count regression for POST /answer (the practice hot path)."""
+
+    @staticmethod
+    def _new_request(test_db: AsyncSession, sql_statements: list[str]) -> None:
+        # The test client reuses one session; make each request start cold
+        test_db.expunge_all()
+        test_db.info.clear()
+        sql_statements.clear()
+
+    @pytest.mark.asyncio
+    async def test_answer_round_trips(
+        self,
+        authenticated_client: AsyncClient,
+        question_in_db: Question,
+        test_db: AsyncSession,
+        sql_statements: list[str],
+    ):
+        """
+        Question, node and mastery are loaded once per answer.
+
+        Before collapsing the duplicate fetches a first answer took 9
+        statements (user, question x2, node, mastery select, answer insert,
+        mastery insert + update, closure) and a repeat answer 8. The review
+        history INSERT (review_events) adds one write to both; a first answer
+        creates the mastery row with its review applied in one upsert.
+        """
+        payload = {
+            "question_id": str(question_in_db.id),
+            "graph_id": str(question_in_db.graph_id),
+            "user_answer": {"question_type": "multiple_choice", "selected_option": 1},
+        }
+
+        self._new_request(test_db, sql_statements)
+        response = await authenticated_client.post("/answer", json=payload)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["mastery_updated"] is True
+        assert len(sql_statements) <= 6
+
+        self._new_request(test_db, sql_statements)
+        response = await authenticated_client.post("/answer", json=payload)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(sql_statements) <= 6
+
+
+class TestSubmitAnswerBatch:
+    """Test POST /answer/batch endpoint."""
+
+    @staticmethod
+    def _answer(question: Question, selected_option: int, answered_at=None) -> dict:
+        answer = {
+            "question_id": str(question.id),
+            "graph_id": str(question.graph_id),
+            "user_answer": {
+                "question_type": "multiple_choice",
+                "selected_option": selected_option,
+            },
+        }
+        if answered_at is not None:
+            answer["answered_at"] = answered_at.isoformat()
+        return answer
+
+    @pytest.mark.asyncio
+    async def test_batch_grades_saves_and_updates_mastery(
+        self,
+        authenticated_client: AsyncClient,
+        question_in_db: Question,
+        user_in_db,
+        test_db,
+    ):
+        """Should return per-answer results and review in answered_at order."""
+        from sqlalchemy import func, select
+
+        from app.crud.review_event import get_review_events
+        from app.models.quiz import SubmissionAnswer
+
+        now = datetime.now(UTC)
+        correct = question_in_db.details["correct_answer"]
+        wrong = (correct + 1) % 3
+        payload = {
+            "answers": [
+                # Sent out of order: the wrong answer happened last
+                self._answer(question_in_db, wrong, now - timedelta(minutes=1)),
+                self._answer(question_in_db, correct, now - timedelta(hours=2)),
+            ]
+        }
+
+        response = await authenticated_client.post("/answer/batch", json=payload)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        results = response.json()["results"]
+        assert [r["is_correct"] for r in results] == [False, True]
+        assert all(r["answer_id"] and r["mastery_updated"] for r in results)
+        assert all(r["error"] is None for r in results)
+
+        saved = await test_db.scalar(
+            select(func.count()).select_from(SubmissionAnswer)
+        )
+        assert saved == 2
+
+        events = await get_review_events(
+            test_db, user_in_db.id, question_in_db.graph_id, question_in_db.node_id
+        )
+        ratings = [event.rating for event in events]
+        assert len(ratings) == 2
+        assert ratings[0] > ratings[1]  # correct (Good) first, then wrong (Again)
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_unknown_questions(
+        self,
+        authenticated_client: AsyncClient,
+        question_in_db: Question,
+    ):
+        """Should save valid answers and report unknown questions individually."""
+        unknown = {
+            "question_id": str(uuid4()),
+            "graph_id": str(question_in_db.graph_id),
+            "user_answer": {"question_type": "multiple_choice", "selected_option": 0},
+        }
+        payload = {
+            "answers": [
+                unknown,
+                self._answer(question_in_db, question_in_db.details["correct_answer"]),
+            ]
+        }
+
+        response = await authenticated_client.post("/answer/batch", json=payload)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        missing, ok = response.json()["results"]
+        assert missing["answer_id"] is None
+        assert "not found" in missing["error"]
+        assert ok["answer_id"] is not None
+        assert ok["is_correct"] is True
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_empty_and_oversized(
+        self, authenticated_client: AsyncClient, question_in_db: Question
+    ):
+        """Should validate batch size."""
+        from app.schemas.quiz import MAX_BATCH_ANSWERS
+
+        empty = await authenticated_client.post("/answer/batch", json={"answers": []})
+        too_many = await authenticated_client.post(
+            "/answer/batch",
+            json={"answers": [self._answer(question_in_db, 0)] * (MAX_BATCH_ANSWERS + 1)},
+        )
+
+        assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert too_many.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -19,9 +19,21 @@ from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.crud.question import create_question
+from app.domain.graph_binary import MEDIA_TYPE as GRAPH_BINARY_MEDIA_TYPE
+from app.domain.graph_binary import decode
 from app.models.knowledge_graph import KnowledgeGraph
 
 
+def _sorted(document: dict) -> dict:
+    """Order every list in a graph response (row order is not part of the API)."""
+    return {
+        key: sorted(value, key=repr) if isinstance(value, list) else value
+        for key, value in document.items()
+    }
+
+
 class TestCreateKnowledgeGraph:
     """Test creating knowledge graphs"""
 
@@ -496,6 +508,128 @@ class TestGetMyGraphVisualization:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    @pytest.mark.asyncio
+    async def test_get_my_graph_visualization_stream_matches_json(
+        self,
+        authenticated_client: AsyncClient,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Test that ?stream=true returns the same document, in chunks"""
+        graph_id = private_graph_with_few_nodes_and_relations_in_db["graph"].id
+        url = f"/me/graphs/{graph_id}/visualization"
+        expected = (await authenticated_client.get(url)).json()
+
+        with patch.object(settings, "GRAPH_STREAM_BATCH_SIZE", 2):
+            response = await authenticated_client.get(url, params={"stream": True})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert len(data["nodes"]) == 5
+        assert _sorted(data) == _sorted(expected)
+
+
+class TestGetMyGraphBinary:
+    """Test the compact binary encoding (Accept: GRAPH_BINARY_MEDIA_TYPE)"""
+
+    @pytest.mark.asyncio
+    async def test_visualization_binary_matches_json(
+        self,
+        authenticated_client: AsyncClient,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Test that the binary columns carry the same graph as the JSON body"""
+        graph_id = private_graph_with_few_nodes_and_relations_in_db["graph"].id
+        url = f"/me/graphs/{graph_id}/visualization"
+        expected = (await authenticated_client.get(url)).json()
+
+        response = await authenticated_client.get(
+            url, headers={"Accept": GRAPH_BINARY_MEDIA_TYPE}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == GRAPH_BINARY_MEDIA_TYPE
+        assert response.headers["etag"]
+        columns = decode(response.content)
+        ids = [str(node_id) for node_id in columns["nodes.id"]]
+        nodes = [
+            {"id": i, "name": n, "description": d, "mastery_score": pytest.approx(m)}
+            for i, n, d, m in zip(
+                ids,
+                columns["nodes.name"],
+                columns["nodes.description"],
+                columns["nodes.mastery_score"].tolist(),
+                strict=True,
+            )
+        ]
+        edges = [
+            {"source_id": ids[a], "target_id": ids[b]}
+            for a, b in zip(
+                columns["edges.source"].tolist(),
+                columns["edges.target"].tolist(),
+                strict=True,
+            )
+        ]
+        assert _sorted({"nodes": nodes, "edges": edges}) == _sorted(expected)
+
+    @pytest.mark.asyncio
+    async def test_visualization_binary_not_modified(
+        self,
+        authenticated_client: AsyncClient,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Test that a matching If-None-Match is answered with 304"""
+        graph_id = private_graph_with_few_nodes_and_relations_in_db["graph"].id
+        url = f"/me/graphs/{graph_id}/visualization"
+        headers = {"Accept": GRAPH_BINARY_MEDIA_TYPE}
+        etag = (await authenticated_client.get(url, headers=headers)).headers["etag"]
+
+        response = await authenticated_client.get(
+            url, headers={**headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_content_binary(
+        self,
+        authenticated_client: AsyncClient,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Test that content is encoded with graph metadata and indexed edges"""
+        graph_id = private_graph_with_few_nodes_and_relations_in_db["graph"].id
+        url = f"/me/graphs/{graph_id}/content"
+        expected = (await authenticated_client.get(url)).json()
+        headers = {"Accept": GRAPH_BINARY_MEDIA_TYPE}
+
+        response = await authenticated_client.get(url, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        columns = decode(response.content)
+        assert columns["graph"] == expected["graph"]
+        ids = [str(node_id) for node_id in columns["nodes.id"]]
+        assert sorted(ids) == sorted(node["id"] for node in expected["nodes"])
+        prerequisites = [
+            {"from_node_id": ids[a], "to_node_id": ids[b], "weight": pytest.approx(w)}
+            for a, b, w in zip(
+                columns["prerequisites.from"].tolist(),
+                columns["prerequisites.to"].tolist(),
+                columns["prerequisites.weight"].tolist(),
+                strict=True,
+            )
+        ]
+        assert sorted(prerequisites, key=repr) == sorted(
+            expected["prerequisites"], key=repr
+        )
+
+        etag = response.headers["etag"]
+        not_modified = await authenticated_client.get(
+            url, headers={**headers, "If-None-Match": etag}
+        )
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
 
 class TestGetMyGraphContent:
     """Test GET /me/graphs/{graph_id}/content endpoint"""
@@ -542,6 +676,88 @@ class TestGetMyGraphContent:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    @pytest.mark.asyncio
+    async def test_get_my_graph_content_stream_matches_json(
+        self,
+        authenticated_client: AsyncClient,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Test that ?stream=true returns the same document, in chunks"""
+        graph_id = private_graph_with_few_nodes_and_relations_in_db["graph"].id
+        url = f"/me/graphs/{graph_id}/content"
+        expected = (await authenticated_client.get(url)).json()
+
+        with patch.object(settings, "GRAPH_STREAM_BATCH_SIZE", 2):
+            response = await authenticated_client.get(url, params={"stream": True})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["nodes"]) == 5
+        assert len(data["prerequisites"]) == 2
+        assert _sorted(data) == _sorted(expected)
+
+    @pytest.mark.asyncio
+    async def test_get_my_graph_content_not_modified(
+        self,
+        authenticated_client: AsyncClient,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+        sql_statements: list[str],
+    ):
+        """Test that a current client copy is answered with 304 before any content query"""
+        graph_id = private_graph_with_few_nodes_and_relations_in_db["graph"].id
+        url = f"/me/graphs/{graph_id}/content"
+        first = await authenticated_client.get(url)
+        etag = first.headers["etag"]
+        assert not etag.startswith("W/")
+        assert first.headers["last-modified"]
+
+        sql_statements.clear()
+        response = await authenticated_client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert not any("knowledge_nodes" in sql for sql in sql_statements)
+        assert not any("prerequisites" in sql for sql in sql_statements)
+
+        by_date = await authenticated_client.get(
+            url, headers={"If-Modified-Since": first.headers["last-modified"]}
+        )
+        assert by_date.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.asyncio
+    async def test_get_my_graph_content_etag_changes_on_question_write(
+        self,
+        authenticated_client: AsyncClient,
+        test_db: AsyncSession,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Test that adding a question bumps the content version"""
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        nodes = private_graph_with_few_nodes_and_relations_in_db["nodes"]
+        node = next(iter(nodes.values()))
+        url = f"/me/graphs/{graph.id}/content"
+        etag = (await authenticated_client.get(url)).headers["etag"]
+
+        await create_question(
+            test_db,
+            graph_id=graph.id,
+            node_id=node.id,
+            question_type="multiple_choice",
+            text="?",
+            details={
+                "question_type": "multiple_choice",
+                "options": ["a", "b"],
+                "correct_answer": 0,
+            },
+            difficulty="easy",
+        )
+        # The client shares the test session; a real request loads the graph afresh
+        test_db.expire(graph)
+        response = await authenticated_client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+
 
 class TestEnrollInMyGraph:
     """Test POST /me/graphs/{graph_id}/enrollments endpoint"""
@@ -21,7 +21,8 @@ from app.models.enrollment import GraphEnrollment
 from app.models.knowledge_graph import KnowledgeGraph
 from app.models.knowledge_node import KnowledgeNode
 from app.models.question import Question, QuestionDifficulty, QuestionType
-from app.models.user import User
+from app.models.user import User, UserMastery
+from app.services.graph_content_cache import graph_content_cache
 from app.services.question_rec import NodeSelectionResult
 
 
@@ -86,6 +87,33 @@ class TestGetTemplateGraphs:
         assert template is not None
         assert template["is_enrolled"] is None
 
+    @pytest.mark.asyncio
+    async def test_get_template_graphs_not_modified(
+        self,
+        authenticated_client: AsyncClient,
+        template_graph_in_db: KnowledgeGraph,
+    ):
+        """Test conditional requests: 304 until the user's listing changes"""
+        first = await authenticated_client.get("/graphs/templates")
+        etag = first.headers["etag"]
+
+        response = await authenticated_client.get(
+            "/graphs/templates", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["last-modified"] == first.headers["last-modified"]
+
+        enroll = await authenticated_client.post(
+            f"/graphs/{template_graph_in_db.id}/enrollments"
+        )
+        assert enroll.status_code == status.HTTP_201_CREATED
+
+        response = await authenticated_client.get(
+            "/graphs/templates", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+
 
 class TestEnrollInTemplateGraph:
     """Test POST /graphs/{graph_id}/enrollments endpoint"""
@@ -307,7 +335,7 @@ class TestGetNextQuestionInEnrolledGraph:
         )
 
         with patch(
-            "app.routes.public_graph.QuestionService.select_next_node",
+            "app.routes.public_graph.QuestionService.select_next_question",
             new=AsyncMock(return_value=selection_result),
         ):
             response = await authenticated_client.get(
@@ -359,10 +387,11 @@ class TestGetNextQuestionInEnrolledGraph:
             knowledge_node=node,
             selection_reason="new_learning",
             priority_score=0.2,
+            question=question,
         )
 
         with patch(
-            "app.routes.public_graph.QuestionService.select_next_node",
+            "app.routes.public_graph.QuestionService.select_next_question",
             new=AsyncMock(return_value=selection_result),
         ):
             response = await authenticated_client.get(
@@ -397,7 +426,7 @@ class TestGetNextQuestionInEnrolledGraph:
     ):
         """Test that unexpected errors surface as 500 responses."""
         with patch(
-            "app.routes.public_graph.QuestionService.select_next_node",
+            "app.routes.public_graph.QuestionService.select_next_question",
             new=AsyncMock(side_effect=RuntimeError("boom")),
         ):
             response = await authenticated_client.get(
@@ -534,6 +563,65 @@ class TestGetGraphVisualization:
 class TestGetPublicGraphContent:
     """Test GET /graphs/{graph_id}/content endpoint"""
 
+    @pytest.mark.asyncio
+    async def test_shared_content_matches_uncached_document(
+        self,
+        authenticated_client: AsyncClient,
+        test_db: AsyncSession,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+        sql_statements: list[str],
+    ):
+        """Test that public content is built once and merged with is_enrolled"""
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        graph.is_public = True
+        await test_db.commit()
+        # The owner endpoint builds the document without the shared cache
+        owner = await authenticated_client.get(f"/me/graphs/{graph.id}/content")
+        expected = owner.json()
+        hits = graph_content_cache.hits
+
+        first = await authenticated_client.get(f"/graphs/{graph.id}/content")
+        sql_statements.clear()
+        second = await authenticated_client.get(f"/graphs/{graph.id}/content")
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert second.json() == first.json() == expected
+        assert graph_content_cache.hits == hits + 1
+        assert not any("knowledge_nodes" in sql for sql in sql_statements)
+
+    @pytest.mark.asyncio
+    async def test_shared_visualization_merges_user_mastery(
+        self,
+        authenticated_client: AsyncClient,
+        test_db: AsyncSession,
+        user_in_db: User,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Test that cached visualization nodes carry the user's own scores"""
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        nodes = private_graph_with_few_nodes_and_relations_in_db["nodes"]
+        node = next(iter(nodes.values()))
+        graph.is_public = True
+        test_db.add(
+            UserMastery(
+                user_id=user_in_db.id,
+                graph_id=graph.id,
+                node_id=node.id,
+                cached_retrievability=0.75,
+            )
+        )
+        await test_db.commit()
+        expected = await authenticated_client.get(
+            f"/me/graphs/{graph.id}/visualization"
+        )
+
+        response = await authenticated_client.get(f"/graphs/{graph.id}/visualization")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected.json()
+        scores = {n["id"]: n["mastery_score"] for n in response.json()["nodes"]}
+        assert scores[str(node.id)] == 0.75
+
     @pytest.mark.asyncio
     async def test_get_content_template_graph_success(
         self,
@@ -61,7 +61,7 @@ class TestGetNextQuestionForOwnedGraph:
         )
 
         with patch(
-            "app.routes.question.QuestionService.select_next_node",
+            "app.routes.question.QuestionService.select_next_question",
             new=AsyncMock(return_value=selection_result),
         ):
             response = await authenticated_client.get(
@@ -112,10 +112,11 @@ class TestGetNextQuestionForOwnedGraph:
             knowledge_node=node,
             selection_reason="new_learning",
             priority_score=0.2,
+            question=question,
         )
 
         with patch(
-            "app.routes.question.QuestionService.select_next_node",
+            "app.routes.question.QuestionService.select_next_question",
             new=AsyncMock(return_value=selection_result),
         ):
             response = await authenticated_client.get(
@@ -188,10 +189,11 @@ class TestGetNextQuestionForOwnedGraph:
             knowledge_node=node,
             selection_reason="new_learning",
             priority_score=0.1,
+            question=question,
         )
 
         with patch(
-            "app.routes.question.QuestionService.select_next_node",
+            "app.routes.question.QuestionService.select_next_question",
             new=AsyncMock(return_value=selection_result),
         ):
             response = await authenticated_client.get(
@@ -213,7 +215,7 @@ class TestGetNextQuestionForOwnedGraph:
     ):
         """Test that unexpected errors surface as 500 responses."""
         with patch(
-            "app.routes.question.QuestionService.select_next_node",
+            "app.routes.question.QuestionService.select_next_question",
             new=AsyncMock(side_effect=RuntimeError("boom")),
         ):
             response = await authenticated_client.get(
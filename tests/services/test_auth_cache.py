@@ -0,0 +1,136 @@
+"""
+Tests for the authentication caches (app/services/auth_cache.py).
+
+These tests verify that:
+1. Verified JWT payloads are reused until the token expires
+2. Users are served without a database round trip while cached
+3. Committed user updates evict the cached entry
+4. The optional Redis tier is read and written
+"""
+
+import json
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import deps
+from app.models.user import User
+from app.services.auth_cache import REDIS_KEY_PREFIX, TokenCache, UserCache, user_cache
+
+
+class TestTokenCache:
+    def test_returns_payload_until_exp(self):
+        cache = TokenCache()
+        cache.set("token", {"sub": "u", "exp": time.time() + 60})
+
+        assert cache.get("token")["sub"] == "u"
+        assert cache.get("other") is None
+
+    def test_drops_expired_payload(self):
+        cache = TokenCache()
+        cache.set("token", {"sub": "u", "exp": time.time() - 1})
+
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_does_not_cache_tokens_without_exp(self):
+        cache = TokenCache()
+        cache.set("token", {"sub": "u"})
+
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = TokenCache(max_size=2)
+        exp = time.time() + 60
+        for token in ("a", "b", "c"):
+            cache.set(token, {"sub": token, "exp": exp})
+
+        assert len(cache) == 2
+        assert cache.get("a") is None
+
+    def test_decode_verifies_signature_once(self, mocker):
+        token_cache = TokenCache()
+        mocker.patch.object(deps, "token_cache", token_cache)
+        decode = mocker.patch.object(
+            deps.jwt, "decode", return_value={"sub": "u", "exp": time.time() + 60}
+        )
+
+        assert deps._decode_jwt_token("token")["sub"] == "u"
+        assert deps._decode_jwt_token("token")["sub"] == "u"
+        decode.assert_called_once()
+
+
+class TestUserCache:
+    @pytest.mark.asyncio
+    async def test_second_lookup_skips_database(
+        self, test_db: AsyncSession, user_in_db: User, sql_statements: list[str]
+    ):
+        """Should return a detached copy of the user without a query."""
+        cache = UserCache()
+        await cache.get_user(test_db, user_in_db.id)
+        sql_statements.clear()
+
+        user = await cache.get_user(test_db, user_in_db.id)
+
+        assert sql_statements == []
+        assert user is not user_in_db
+        assert user.id == user_in_db.id
+        assert user.email == user_in_db.email
+        assert user.is_active == user_in_db.is_active
+        assert user.created_at == user_in_db.created_at
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(
+        self, test_db: AsyncSession, user_in_db: User, mocker
+    ):
+        cache = UserCache(ttl_seconds=30)
+        await cache.get_user(test_db, user_in_db.id)
+
+        later = time.monotonic() + 31
+        mocker.patch("app.services.auth_cache.time.monotonic", return_value=later)
+        await cache.get_user(test_db, user_in_db.id)
+
+        assert cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_committed_update_evicts_user(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Should drop the cached user once an update to it is committed."""
+        await user_cache.get_user(test_db, user_in_db.id)
+
+        user_in_db.is_active = False
+        await test_db.commit()
+
+        user = await user_cache.get_user(test_db, user_in_db.id)
+        assert user.is_active is False
+
+    @pytest.mark.asyncio
+    async def test_redis_tier(self, test_db: AsyncSession, user_in_db: User):
+        """Should write misses to Redis and serve later misses from it."""
+        redis_client = AsyncMock()
+        redis_client.get.return_value = None
+        await UserCache(redis_client=redis_client).get_user(test_db, user_in_db.id)
+
+        key, data = redis_client.set.call_args.args
+        assert key == f"{REDIS_KEY_PREFIX}:{user_in_db.id}"
+
+        # A fresh process (empty local tier) is served from Redis
+        redis_client.get.return_value = data
+        cache = UserCache(redis_client=redis_client)
+        user = await cache.get_user(test_db, user_in_db.id)
+
+        assert user.email == json.loads(data)["email"]
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_queries(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        cache = UserCache(ttl_seconds=0)
+        await cache.get_user(test_db, user_in_db.id)
+
+        assert len(cache) == 0
@@ -0,0 +1,118 @@
+"""
+Tests for the shared graph content cache (app/services/graph_content_cache.py).
+
+These tests verify that:
+1. Parts are built once per (kind, graph, content_version) and then shared
+2. The local tier is bounded by payload bytes (LRU)
+3. The optional Redis tier is read and written, and failures fall back to
+   building
+"""
+
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.services.graph_content_cache import (
+    REDIS_KEY_PREFIX,
+    GraphContentCache,
+    _pack,
+    _unpack,
+)
+
+
+def _builder(*parts: bytes) -> AsyncMock:
+    return AsyncMock(return_value=list(parts))
+
+
+class TestGraphContentCache:
+    @pytest.mark.asyncio
+    async def test_builds_once_per_version(self):
+        cache = GraphContentCache()
+        graph_id = uuid4()
+        build = _builder(b"3", b"[]")
+
+        first = await cache.get_or_build(("content", graph_id, 1), build)
+        second = await cache.get_or_build(("content", graph_id, 1), build)
+        await cache.get_or_build(("content", graph_id, 2), build)
+
+        assert first == second == [b"3", b"[]"]
+        assert build.await_count == 2
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cache.stats()["bytes"] == 6
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_by_bytes(self):
+        cache = GraphContentCache(max_bytes=10)
+        a, b, c = (("content", uuid4(), 0) for _ in range(3))
+
+        await cache.get_or_build(a, _builder(b"x" * 4))
+        await cache.get_or_build(b, _builder(b"x" * 4))
+        await cache.get_or_build(a, _builder())  # a is now most recent
+        await cache.get_or_build(c, _builder(b"x" * 4))
+
+        assert len(cache) == 2
+        build = _builder(b"y")
+        await cache.get_or_build(b, build)
+        build.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_oversized_entry_is_not_kept(self):
+        cache = GraphContentCache(max_bytes=4)
+
+        parts = await cache.get_or_build(("content", uuid4(), 0), _builder(b"large"))
+
+        assert parts == [b"large"]
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_builds(self):
+        cache = GraphContentCache(max_bytes=0)
+        build = _builder(b"1")
+        key = ("content", uuid4(), 0)
+
+        await cache.get_or_build(key, build)
+        await cache.get_or_build(key, build)
+
+        assert build.await_count == 2
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_redis_tier(self):
+        """Should write misses to Redis and serve a fresh process from it."""
+        graph_id = uuid4()
+        key = ("visualization", graph_id, 7)
+        redis_client = AsyncMock()
+        redis_client.get.return_value = None
+        await GraphContentCache(redis_client=redis_client).get_or_build(
+            key, _builder(b"[]", b"", b"{")
+        )
+
+        redis_key, data = redis_client.set.call_args.args
+        assert redis_key == f"{REDIS_KEY_PREFIX}:visualization:{graph_id}:7"
+
+        redis_client.get.return_value = data
+        cache = GraphContentCache(redis_client=redis_client)
+        build = _builder()
+        parts = await cache.get_or_build(key, build)
+
+        assert parts == [b"[]", b"", b"{"]
+        build.assert_not_awaited()
+        assert (cache.redis_hits, cache.misses) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_build(self):
+        redis_client = AsyncMock()
+        redis_client.get.side_effect = ConnectionError("down")
+        redis_client.set.side_effect = ConnectionError("down")
+        cache = GraphContentCache(redis_client=redis_client)
+
+        parts = await cache.get_or_build(("content", uuid4(), 0), _builder(b"1"))
+
+        assert parts == [b"1"]
+        assert cache.misses == 1
+
+    def test_pack_round_trip(self):
+        parts = [b"", b"abc", "é".encode()]
+
+        assert _unpack(_pack(parts)) == parts
@@ -0,0 +1,56 @@
+"""
+Integration tests for the graph counter reconciliation command.
+
+These tests verify that:
+1. Drifted node/question/prerequisite counters are recounted
+2. Corrected graphs get a new content version
+3. A rerun over consistent counters changes nothing
+"""
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import DatabaseManager
+from app.models.knowledge_graph import KnowledgeGraph
+from app.services.graph_counter_reconciliation import (
+    GraphCounterReconciliationService,
+)
+
+
+class TestGraphCounterReconciliation:
+    @pytest.mark.asyncio
+    async def test_fixes_drifted_counters(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+        template_graph_in_db: KnowledgeGraph,
+    ):
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        version = graph.content_version
+        # Rows written around the application (e.g. a restore)
+        await test_db.execute(
+            update(KnowledgeGraph)
+            .where(KnowledgeGraph.id == graph.id)
+            .values(node_count=0, prerequisite_count=7)
+        )
+        await test_db.commit()
+
+        service = GraphCounterReconciliationService(test_db_manager, batch_size=1)
+        report = await service.run()
+
+        assert report.graphs_scanned == 2
+        assert report.graphs_fixed == 1
+        assert report.batches == 2
+
+        await test_db.refresh(graph)
+        assert (graph.node_count, graph.prerequisite_count, graph.question_count) == (
+            5,
+            2,
+            0,
+        )
+        assert graph.content_version == version + 1
+
+        rerun = await service.run()
+        assert rerun.graphs_fixed == 0
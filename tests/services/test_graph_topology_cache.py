@@ -0,0 +1,117 @@
+"""
+Integration tests for GraphTopologyCache.
+
+These tests verify that:
+1. In-memory ancestor depths match the recursive CTE
+2. Structure changes bump the graph version and invalidate cached entries
+3. The cache is LRU-bounded
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.knowledge_graph import get_graph_structure_version
+from app.crud.mastery import get_prerequisite_roots_to_bonus
+from app.crud.prerequisite import bulk_insert_prerequisites_tx, create_prerequisite
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode
+from app.models.user import User
+from app.services.graph_topology_cache import GraphTopologyCache
+
+
+class TestGraphTopologyCache:
+    @pytest.mark.asyncio
+    async def test_depths_match_recursive_cte(
+        self,
+        test_db: AsyncSession,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Should return the same {node_id: depth} map as the CTE for every node."""
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        nodes = private_graph_with_few_nodes_and_relations_in_db["nodes"]
+        cache = GraphTopologyCache()
+
+        for node in nodes.values():
+            expected = await get_prerequisite_roots_to_bonus(
+                test_db, graph.id, node.id
+            )
+            result = await cache.get_prerequisite_depths(test_db, graph.id, node.id)
+            assert result == expected
+
+        assert cache.misses == 1
+        assert cache.hits == len(nodes) - 1
+
+    @pytest.mark.asyncio
+    async def test_create_prerequisite_invalidates(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Should reload the topology after create_prerequisite bumps the version."""
+        graph = KnowledgeGraph(owner_id=user_in_db.id, name="G", slug="g")
+        test_db.add(graph)
+        await test_db.flush()
+        a = KnowledgeNode(graph_id=graph.id, node_name="A")
+        b = KnowledgeNode(graph_id=graph.id, node_name="B")
+        c = KnowledgeNode(graph_id=graph.id, node_name="C")
+        test_db.add_all([a, b, c])
+        await test_db.commit()
+
+        cache = GraphTopologyCache()
+        assert await cache.get_prerequisite_depths(test_db, graph.id, c.id) == {}
+
+        await create_prerequisite(test_db, graph.id, b.id, c.id)
+        assert await get_graph_structure_version(test_db, graph.id) == 1
+        assert await cache.get_prerequisite_depths(test_db, graph.id, c.id) == {
+            b.id: 1
+        }
+
+        await bulk_insert_prerequisites_tx(test_db, graph.id, [(a.id, b.id, 1.0)])
+        await test_db.commit()
+        assert await get_graph_structure_version(test_db, graph.id) == 2
+        assert await cache.get_prerequisite_depths(test_db, graph.id, c.id) == {
+            b.id: 1,
+            a.id: 2,
+        }
+        assert cache.misses == 3
+
+    @pytest.mark.asyncio
+    async def test_noop_bulk_insert_keeps_version(
+        self,
+        test_db: AsyncSession,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Should not bump the version when ON CONFLICT skips every row."""
+        graph = private_graph_with_few_nodes_and_relations_in_db["graph"]
+        nodes = private_graph_with_few_nodes_and_relations_in_db["nodes"]
+        before = await get_graph_structure_version(test_db, graph.id)
+
+        inserted = await bulk_insert_prerequisites_tx(
+            test_db,
+            graph.id,
+            [(nodes["derivatives"].id, nodes["integrals"].id, 1.0)],
+        )
+        await test_db.commit()
+
+        assert inserted == 0
+        assert await get_graph_structure_version(test_db, graph.id) == before
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, test_db: AsyncSession, user_in_db: User):
+        """Should evict the least recently used graph beyond max_size."""
+        graphs = [
+            KnowledgeGraph(owner_id=user_in_db.id, name=f"G{i}", slug=f"g-{i}")
+            for i in range(3)
+        ]
+        test_db.add_all(graphs)
+        await test_db.commit()
+
+        cache = GraphTopologyCache(max_size=2)
+        await cache.get(test_db, graphs[0].id)
+        await cache.get(test_db, graphs[1].id)
+        await cache.get(test_db, graphs[0].id)  # graphs[1] is now LRU
+        await cache.get(test_db, graphs[2].id)
+
+        assert len(cache) == 2
+        await cache.get(test_db, graphs[0].id)
+        assert cache.hits == 2
+        await cache.get(test_db, graphs[1].id)
+        assert cache.misses == 4
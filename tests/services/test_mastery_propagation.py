@@ -0,0 +1,94 @@
+"""
+Integration tests for the MasteryService propagation write path.
+
+These tests verify that:
+- Missing ancestor rows are created with one multi-row upsert
+- Existing ancestor rows are updated with one set-based UPDATE, whatever
+  the length of the prerequisite chain
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.prerequisite import create_prerequisite
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode
+from app.models.user import User, UserMastery
+from app.services.mastery import MasteryService
+
+CHAIN_LENGTH = 6
+
+
+async def _chain(test_db: AsyncSession, user: User) -> list[KnowledgeNode]:
+    """n0 -> n1 -> ... -> n5 (each node a prerequisite of the next)."""
+    graph = KnowledgeGraph(owner_id=user.id, name="G", slug="g")
+    test_db.add(graph)
+    await test_db.flush()
+    nodes = [
+        KnowledgeNode(graph_id=graph.id, node_name=f"N{i}")
+        for i in range(CHAIN_LENGTH)
+    ]
+    test_db.add_all(nodes)
+    await test_db.commit()
+    for parent, child in zip(nodes, nodes[1:], strict=False):
+        await create_prerequisite(test_db, graph.id, parent.id, child.id)
+    await test_db.commit()
+    return nodes
+
+
+def _writes(statements: list[str], verb: str) -> list[str]:
+    return [s for s in statements if s.lstrip().upper().startswith(verb)]
+
+
+class TestPropagationWrites:
+    @pytest.mark.asyncio
+    async def test_chain_is_written_with_one_statement_per_phase(
+        self,
+        test_db: AsyncSession,
+        user_in_db: User,
+        sql_statements: list[str],
+    ):
+        nodes = await _chain(test_db, user_in_db)
+        answered, ancestors = nodes[-1], nodes[:-1]
+        service = MasteryService()
+
+        with patch(
+            "app.services.mastery.MasteryLogic.should_trigger_implicit_review",
+            return_value=True,
+        ):
+            # First propagation creates every ancestor row
+            sql_statements.clear()
+            await service.propagate_mastery(
+                test_db, user_in_db, answered, True, p_g=0.0, p_s=0.0
+            )
+            assert len(_writes(sql_statements, "INSERT")) == 1
+            assert _writes(sql_statements, "UPDATE") == []
+            await test_db.commit()
+
+            created = {
+                node.id: await test_db.get(
+                    UserMastery, (user_in_db.id, node.graph_id, node.id)
+                )
+                for node in ancestors
+            }
+            first_reviews = {key: m.last_review for key, m in created.items()}
+
+            # Second propagation reviews them again with a single UPDATE
+            sql_statements.clear()
+            await service.propagate_mastery(
+                test_db, user_in_db, answered, True, p_g=0.0, p_s=0.0
+            )
+            assert _writes(sql_statements, "INSERT") == []
+            assert len(_writes(sql_statements, "UPDATE")) == 1
+            await test_db.commit()
+
+        test_db.expunge_all()
+        test_db.info.clear()
+        for node in ancestors:
+            mastery = await test_db.get(
+                UserMastery, (user_in_db.id, node.graph_id, node.id)
+            )
+            assert mastery.last_review > first_reviews[node.id]
+            assert mastery.fsrs_stability > 0
@@ -0,0 +1,119 @@
+"""
+Integration tests for background mastery propagation.
+
+These tests verify that:
+- The propagate_mastery worker handler applies implicit reviews
+- Redelivered tasks (same idempotency key) do not apply them twice
+"""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import DatabaseManager
+from app.crud.prerequisite import create_prerequisite
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode
+from app.models.processed_task import ProcessedTask
+from app.models.user import User, UserMastery
+from app.worker.config import WorkerContext
+from app.worker.handlers import handle_propagate_mastery
+
+
+async def _graph_with_prerequisite(test_db: AsyncSession, user: User):
+    graph = KnowledgeGraph(owner_id=user.id, name="G", slug="g")
+    test_db.add(graph)
+    await test_db.flush()
+    prereq = KnowledgeNode(graph_id=graph.id, node_name="Prereq")
+    target = KnowledgeNode(graph_id=graph.id, node_name="Target")
+    test_db.add_all([prereq, target])
+    await test_db.commit()
+    await create_prerequisite(test_db, graph.id, prereq.id, target.id)
+    return graph, prereq, target
+
+
+def _payload(user: User, node: KnowledgeNode) -> dict:
+    return {
+        "user_id": str(user.id),
+        "node_id": str(node.id),
+        "is_correct": True,
+        "p_g": 0.2,
+        "p_s": 0.1,
+    }
+
+
+class TestPropagateMasteryHandler:
+    @pytest.mark.asyncio
+    async def test_redelivery_is_applied_once(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+    ):
+        """Should apply the implicit review once per idempotency key."""
+        graph, prereq, target = await _graph_with_prerequisite(test_db, user_in_db)
+        ctx = WorkerContext(test_db_manager)
+
+        with patch(
+            "app.services.mastery.MasteryLogic.should_trigger_implicit_review",
+            return_value=True,
+        ):
+            await handle_propagate_mastery(_payload(user_in_db, target), ctx, "k-1")
+            async with test_db_manager.get_sql_session() as session:
+                first = await session.get(
+                    UserMastery, (user_in_db.id, graph.id, prereq.id)
+                )
+
+            # Redelivery of the same task
+            await handle_propagate_mastery(_payload(user_in_db, target), ctx, "k-1")
+            async with test_db_manager.get_sql_session() as session:
+                second = await session.get(
+                    UserMastery, (user_in_db.id, graph.id, prereq.id)
+                )
+                claims = await session.scalar(
+                    select(func.count()).select_from(ProcessedTask)
+                )
+
+        assert first is not None
+        assert second.last_review == first.last_review
+        assert second.fsrs_stability == first.fsrs_stability
+        assert claims == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_task_does_not_consume_key(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+    ):
+        """Should roll back the idempotency claim together with the writes."""
+        _, _, target = await _graph_with_prerequisite(test_db, user_in_db)
+        ctx = WorkerContext(test_db_manager)
+
+        with (
+            patch(
+                "app.services.mastery.MasteryService.propagate_mastery",
+                side_effect=RuntimeError("boom"),
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            await handle_propagate_mastery(_payload(user_in_db, target), ctx, "k-2")
+
+        async with test_db_manager.get_sql_session() as session:
+            assert await session.get(ProcessedTask, "k-2") is None
+
+    @pytest.mark.asyncio
+    async def test_missing_node_is_skipped(
+        self, test_db_manager: DatabaseManager, user_in_db: User
+    ):
+        """Should skip (not fail) when the node no longer exists."""
+        ctx = WorkerContext(test_db_manager)
+        payload = _payload(user_in_db, KnowledgeNode(id=uuid4()))
+
+        await handle_propagate_mastery(payload, ctx, "k-3")
+
+        async with test_db_manager.get_sql_session() as session:
+            assert await session.get(ProcessedTask, "k-3") is None
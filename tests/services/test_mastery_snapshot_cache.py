@@ -0,0 +1,159 @@
+"""
+Integration tests for MasterySnapshotCache.
+
+These tests verify that:
+1. A snapshot is loaded once and then served from memory
+2. Committed mastery writes (ORM flushes and MasteryService's set-based
+   upserts / UPDATEs) are written through to the cached snapshot
+3. Rolled back writes never reach the cache, and a session reading its own
+   uncommitted writes bypasses it
+4. A TTL of 0 disables caching
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.prerequisite import create_prerequisite
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode
+from app.models.user import FSRSState, User, UserMastery
+from app.services.mastery import MasteryService
+from app.services.mastery_snapshot_cache import (
+    MasterySnapshotCache,
+    mastery_snapshot_cache,
+)
+
+
+@pytest.fixture
+def cache():
+    mastery_snapshot_cache.clear()
+    mastery_snapshot_cache.hits = mastery_snapshot_cache.misses = 0
+    yield mastery_snapshot_cache
+    mastery_snapshot_cache.clear()
+
+
+async def _graph(test_db: AsyncSession, user: User, size: int = 3):
+    graph = KnowledgeGraph(owner_id=user.id, name="G", slug="g")
+    test_db.add(graph)
+    await test_db.flush()
+    nodes = [KnowledgeNode(graph_id=graph.id, node_name=f"N{i}") for i in range(size)]
+    test_db.add_all(nodes)
+    await test_db.commit()
+    return graph, nodes
+
+
+def _mastery(user: User, node: KnowledgeNode, due_date: datetime) -> UserMastery:
+    return UserMastery(
+        user_id=user.id,
+        graph_id=node.graph_id,
+        node_id=node.id,
+        cached_retrievability=0.7,
+        fsrs_state=FSRSState.REVIEW.value,
+        fsrs_stability=6.0,
+        fsrs_difficulty=5.0,
+        due_date=due_date,
+    )
+
+
+class TestMasterySnapshotCache:
+    @pytest.mark.asyncio
+    async def test_second_read_is_served_from_memory(
+        self,
+        cache: MasterySnapshotCache,
+        test_db: AsyncSession,
+        user_in_db: User,
+        sql_statements: list[str],
+    ):
+        graph, nodes = await _graph(test_db, user_in_db)
+        test_db.add(_mastery(user_in_db, nodes[0], datetime.now(UTC)))
+        await test_db.commit()
+
+        first = await cache.get(test_db, user_in_db.id, graph.id)
+        sql_statements.clear()
+        second = await cache.get(test_db, user_in_db.id, graph.id)
+
+        assert second is first
+        assert nodes[0].id in second
+        assert sql_statements == []
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_orm_commit_writes_through(
+        self, cache: MasterySnapshotCache, test_db: AsyncSession, user_in_db: User
+    ):
+        graph, nodes = await _graph(test_db, user_in_db)
+        snapshot = await cache.get(test_db, user_in_db.id, graph.id)
+        assert len(snapshot) == 0
+
+        now = datetime.now(UTC)
+        test_db.add(_mastery(user_in_db, nodes[1], now - timedelta(hours=1)))
+        await test_db.commit()
+
+        cached = await cache.get(test_db, user_in_db.id, graph.id)
+        assert cached is snapshot
+        assert cached.due_node_ids(now) == [nodes[1].id]
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_propagation_writes_through(
+        self, cache: MasterySnapshotCache, test_db: AsyncSession, user_in_db: User
+    ):
+        """Upserted and bulk-updated ancestor rows reach the snapshot on commit."""
+        graph, (a, b, c) = await _graph(test_db, user_in_db)
+        await create_prerequisite(test_db, graph.id, a.id, b.id)
+        await create_prerequisite(test_db, graph.id, b.id, c.id)
+        test_db.add(_mastery(user_in_db, b, datetime.now(UTC) + timedelta(days=9)))
+        await test_db.commit()
+        snapshot = await cache.get(test_db, user_in_db.id, graph.id)
+
+        with patch(
+            "app.services.mastery.MasteryLogic.should_trigger_implicit_review",
+            return_value=True,
+        ):
+            await MasteryService().propagate_mastery(
+                test_db, user_in_db, c, True, p_g=0.0, p_s=0.0
+            )
+        await test_db.commit()
+
+        cached = await cache.get(test_db, user_in_db.id, graph.id)
+        assert cached is snapshot
+        for node in (a, b):
+            row = await test_db.get(UserMastery, (user_in_db.id, graph.id, node.id))
+            assert cached.due_date(node.id) == row.due_date
+            assert cached.stability_map([node.id]) == {node.id: row.fsrs_stability}
+
+    @pytest.mark.asyncio
+    async def test_rollback_is_not_cached(
+        self, cache: MasterySnapshotCache, test_db: AsyncSession, user_in_db: User
+    ):
+        graph, nodes = await _graph(test_db, user_in_db)
+        user_id, graph_id, node_id = user_in_db.id, graph.id, nodes[2].id
+        snapshot = await cache.get(test_db, user_id, graph_id)
+
+        test_db.add(_mastery(user_in_db, nodes[2], datetime.now(UTC)))
+        await test_db.flush()
+        # The writing session sees its own uncommitted row
+        own = await cache.get(test_db, user_id, graph_id)
+        assert own is not snapshot
+        assert node_id in own
+        await test_db.rollback()
+
+        cached = await cache.get(test_db, user_id, graph_id)
+        assert cached is snapshot
+        assert node_id not in cached
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_caching(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        graph, _ = await _graph(test_db, user_in_db)
+        cache = MasterySnapshotCache(ttl_seconds=0)
+
+        await cache.get(test_db, user_in_db.id, graph.id)
+        await cache.get(test_db, user_in_db.id, graph.id)
+
+        assert len(cache) == 0
+        assert cache.misses == 2
@@ -0,0 +1,208 @@
+"""
+Integration tests for QuestionService.
+
+These tests verify that the single round-trip recommendation
+(select_next_question) makes exactly the same selection as the
+multi-query reference path (select_next_node).
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode, Prerequisite
+from app.models.question import Question, QuestionDifficulty, QuestionType
+from app.models.user import FSRSState, User, UserMastery
+from app.services.question_rec import QuestionService
+
+
+def _question(graph_id, node_id) -> Question:
+    return Question(
+        graph_id=graph_id,
+        node_id=node_id,
+        question_type=QuestionType.MULTIPLE_CHOICE.value,
+        text="Q",
+        details={
+            "question_type": QuestionType.MULTIPLE_CHOICE.value,
+            "options": ["a", "b"],
+            "correct_answer": 0,
+            "p_g": 0.5,
+            "p_s": 0.1,
+        },
+        difficulty=QuestionDifficulty.EASY.value,
+    )
+
+
+async def _seed_random_graph(
+    test_db: AsyncSession, user: User, seed: int, num_nodes: int = 14
+) -> KnowledgeGraph:
+    """Seed a random DAG with questions and mastery records.
+
+    Due dates avoid the urgency tier boundaries (24h/72h) so both paths see
+    the same tiers even though they read the clock at slightly different times.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+
+    graph = KnowledgeGraph(owner_id=user.id, name=f"G{seed}", slug=f"g-{seed}")
+    test_db.add(graph)
+    await test_db.flush()
+
+    nodes = [
+        KnowledgeNode(
+            graph_id=graph.id,
+            node_name=f"N{i}",
+            level=rng.choice([0, 1, 1, 2, None]),
+            dependents_count=rng.randint(0, 3),
+        )
+        for i in range(num_nodes)
+    ]
+    test_db.add_all(nodes)
+    await test_db.flush()
+
+    # Edges only go from lower to higher index -> acyclic
+    for i in range(num_nodes):
+        for j in range(i + 1, num_nodes):
+            if rng.random() < 0.15:
+                test_db.add(
+                    Prerequisite(
+                        graph_id=graph.id,
+                        from_node_id=nodes[i].id,
+                        to_node_id=nodes[j].id,
+                    )
+                )
+
+    for node in nodes:
+        if rng.random() < 0.8:
+            for _ in range(rng.randint(1, 2)):
+                test_db.add(_question(graph.id, node.id))
+
+        roll = rng.random()
+        if roll < 0.5:
+            # Every third seed has due reviews; the rest exercise Phase 3
+            hour_choices = [-48, -5, 5, 30, 100] if seed % 3 == 0 else [-48, -5]
+            hours = rng.choice(hour_choices)  # negative = not due yet
+            test_db.add(
+                UserMastery(
+                    user_id=user.id,
+                    graph_id=graph.id,
+                    node_id=node.id,
+                    cached_retrievability=rng.choice([0.2, 0.5, rng.random()]),
+                    fsrs_state=FSRSState.REVIEW.value,
+                    fsrs_stability=rng.choice([None, 1.0, 3.0, 8.0]),
+                    fsrs_difficulty=5.0,
+                    due_date=now - timedelta(hours=hours),
+                    last_review=now - timedelta(days=1),
+                )
+            )
+
+    await test_db.commit()
+    return graph
+
+
+class TestSelectNextQuestion:
+    """select_next_question must match select_next_node."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", range(12))
+    async def test_matches_multi_query_selection(
+        self, test_db: AsyncSession, user_in_db: User, seed: int
+    ):
+        """Should select the same node, reason and score as select_next_node."""
+        graph = await _seed_random_graph(test_db, user_in_db, seed)
+        service = QuestionService()
+
+        expected = await service.select_next_node(test_db, user_in_db.id, graph.id)
+        result = await service.select_next_question(test_db, user_in_db.id, graph.id)
+
+        assert result.selection_reason == expected.selection_reason
+        assert result.priority_score == expected.priority_score
+        if expected.knowledge_node is None:
+            assert result.knowledge_node is None
+            assert result.question is None
+        else:
+            assert result.knowledge_node.id == expected.knowledge_node.id
+            assert result.question is not None
+            assert result.question.node_id == expected.knowledge_node.id
+
+    @pytest.mark.asyncio
+    async def test_empty_graph_returns_none_available(
+        self, test_db: AsyncSession, private_graph_in_db: KnowledgeGraph
+    ):
+        """Should report none_available when the graph has no questions."""
+        result = await QuestionService().select_next_question(
+            test_db, private_graph_in_db.owner_id, private_graph_in_db.id
+        )
+
+        assert result.knowledge_node is None
+        assert result.selection_reason == "none_available"
+
+    @pytest.mark.asyncio
+    async def test_fallback_when_all_candidates_blocked(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Should fall back to the lowest-level candidate, like select_next_node."""
+        graph = KnowledgeGraph(owner_id=user_in_db.id, name="G", slug="g")
+        test_db.add(graph)
+        await test_db.flush()
+        a = KnowledgeNode(graph_id=graph.id, node_name="A", level=1)
+        b = KnowledgeNode(graph_id=graph.id, node_name="B", level=2)
+        test_db.add_all([a, b])
+        await test_db.flush()
+        # Cycle: both candidates block each other
+        test_db.add_all(
+            [
+                Prerequisite(graph_id=graph.id, from_node_id=a.id, to_node_id=b.id),
+                Prerequisite(graph_id=graph.id, from_node_id=b.id, to_node_id=a.id),
+                _question(graph.id, a.id),
+                _question(graph.id, b.id),
+            ]
+        )
+        await test_db.commit()
+
+        service = QuestionService()
+        expected = await service.select_next_node(test_db, user_in_db.id, graph.id)
+        result = await service.select_next_question(test_db, user_in_db.id, graph.id)
+
+        assert result.knowledge_node.id == expected.knowledge_node.id == a.id
+        assert result.selection_reason == "new_learning"
+
+    @pytest.mark.asyncio
+    async def test_due_prerequisite_wins(
+        self, test_db: AsyncSession, user_in_db: User
+    ):
+        """Should prefer a due node that is a prerequisite of another due node."""
+        now = datetime.now(UTC)
+        graph = KnowledgeGraph(owner_id=user_in_db.id, name="G", slug="g")
+        test_db.add(graph)
+        await test_db.flush()
+        parent = KnowledgeNode(graph_id=graph.id, node_name="Parent", level=5)
+        child = KnowledgeNode(graph_id=graph.id, node_name="Child", level=0)
+        test_db.add_all([parent, child])
+        await test_db.flush()
+        test_db.add(
+            Prerequisite(graph_id=graph.id, from_node_id=parent.id, to_node_id=child.id)
+        )
+        for node in (parent, child):
+            test_db.add(_question(graph.id, node.id))
+            test_db.add(
+                UserMastery(
+                    user_id=user_in_db.id,
+                    graph_id=graph.id,
+                    node_id=node.id,
+                    cached_retrievability=0.5,
+                    due_date=now - timedelta(hours=2),
+                )
+            )
+        await test_db.commit()
+
+        result = await QuestionService().select_next_question(
+            test_db, user_in_db.id, graph.id
+        )
+
+        assert result.knowledge_node.id == parent.id
+        assert result.selection_reason == "fsrs_due_review"
+        assert result.priority_score == 1000
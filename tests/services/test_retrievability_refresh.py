@@ -0,0 +1,116 @@
+"""
+Integration tests for RetrievabilityRefreshService.
+
+These tests verify the bulk refresh job end to end:
+- Keyset pagination over user_mastery
+- Vectorized R(t) computation
+- Set-based write-back and the throughput report
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import DatabaseManager
+from app.domain.mastery_logic import MasteryLogic
+from app.models.user import FSRSState, User, UserMastery
+from app.services.retrievability_refresh import RetrievabilityRefreshService
+
+
+async def _seed_masteries(
+    test_db: AsyncSession, user: User, graph_data: dict, now: datetime
+) -> None:
+    graph = graph_data["graph"]
+    for i, node in enumerate(graph_data["nodes"].values()):
+        reviewed = i > 0
+        test_db.add(
+            UserMastery(
+                user_id=user.id,
+                graph_id=graph.id,
+                node_id=node.id,
+                cached_retrievability=1.0,
+                fsrs_state=FSRSState.REVIEW.value
+                if reviewed
+                else FSRSState.LEARNING.value,
+                fsrs_stability=2.0 * i if reviewed else None,
+                fsrs_difficulty=5.0 if reviewed else None,
+                last_review=now - timedelta(days=3 * i) if reviewed else None,
+                due_date=now,
+            )
+        )
+    await test_db.commit()
+
+
+class TestRetrievabilityRefreshService:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batch_size,concurrency", [(2, 2), (100, 1)])
+    async def test_refreshes_all_rows(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+        batch_size: int,
+        concurrency: int,
+    ):
+        """Should rewrite every row with R(t) evaluated at the run timestamp."""
+        now = datetime.now(UTC)
+        await _seed_masteries(
+            test_db, user_in_db, private_graph_with_few_nodes_and_relations_in_db, now
+        )
+
+        service = RetrievabilityRefreshService(
+            test_db_manager, batch_size=batch_size, concurrency=concurrency
+        )
+        report = await service.run(now=now)
+
+        assert report.rows_scanned == 5
+        assert report.rows_updated == 5
+        assert report.batches == -(-5 // batch_size)
+        assert report.rows_per_second > 0
+
+        test_db.expire_all()
+        masteries = (await test_db.execute(select(UserMastery))).scalars().all()
+        for mastery in masteries:
+            expected = MasteryLogic.calculate_retrievabilities(
+                [mastery.fsrs_stability], [mastery.last_review], now
+            )[0]
+            assert mastery.cached_retrievability == pytest.approx(expected)
+            if mastery.last_review is None:
+                assert mastery.cached_retrievability == 0.0
+
+    @pytest.mark.asyncio
+    async def test_second_run_skips_unchanged_rows(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+        private_graph_with_few_nodes_and_relations_in_db: dict,
+    ):
+        """Should not rewrite rows whose cached value is already current."""
+        now = datetime.now(UTC)
+        await _seed_masteries(
+            test_db, user_in_db, private_graph_with_few_nodes_and_relations_in_db, now
+        )
+        service = RetrievabilityRefreshService(test_db_manager, batch_size=3)
+
+        await service.run(now=now)
+        report = await service.run(now=now)
+
+        assert report.rows_scanned == 5
+        assert report.rows_updated == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_table(self, test_db_manager: DatabaseManager):
+        """Should finish cleanly when there is nothing to refresh."""
+        report = await RetrievabilityRefreshService(test_db_manager).run()
+
+        assert report.rows_scanned == 0
+        assert report.batches == 0
+
+    def test_rejects_invalid_configuration(self):
+        """Should reject non-positive batch size or concurrency."""
+        with pytest.raises(ValueError):
+            RetrievabilityRefreshService(None, batch_size=-1)
@@ -0,0 +1,115 @@
+"""
+Integration tests for bounded review history.
+
+These tests verify that:
+1. Explicit reviews trim review_events to REVIEW_HISTORY_MAX_EVENTS inline
+2. The compaction command summarises untracked rows before trimming them
+3. Lifetime totals (review_count, lapse_count, first_review) survive the trim
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import DatabaseManager
+from app.crud.review_event import get_review_events
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode
+from app.models.review_event import ReviewEvent
+from app.models.user import User, UserMastery
+from app.services.mastery import MasteryService
+from app.services.review_history_compaction import ReviewHistoryCompactionService
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+async def _node(test_db: AsyncSession, user: User) -> KnowledgeNode:
+    graph = KnowledgeGraph(owner_id=user.id, name="G", slug="g")
+    test_db.add(graph)
+    await test_db.flush()
+    node = KnowledgeNode(graph_id=graph.id, node_name="N")
+    test_db.add(node)
+    await test_db.commit()
+    return node
+
+
+class TestInlineTrim:
+    @pytest.mark.asyncio
+    async def test_reviews_keep_only_recent_events(
+        self,
+        test_db: AsyncSession,
+        user_in_db: User,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(settings, "REVIEW_HISTORY_MAX_EVENTS", 2)
+        node = await _node(test_db, user_in_db)
+        service = MasteryService()
+
+        for _ in range(4):
+            await service._update_single_node_mastery(
+                test_db, user_in_db, node, is_correct=True, p_g=0.0, p_s=0.0
+            )
+        await test_db.commit()
+
+        key = (user_in_db.id, node.graph_id, node.id)
+        events = await get_review_events(test_db, *key)
+        assert len(events) == 2
+        mastery = await test_db.get(UserMastery, key)
+        assert mastery.review_count == 4
+        assert mastery.first_review is not None
+
+
+class TestReviewHistoryCompaction:
+    @pytest.mark.asyncio
+    async def test_summarises_then_trims(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+    ):
+        node = await _node(test_db, user_in_db)
+        key = (user_in_db.id, node.graph_id, node.id)
+        # History recorded before the summary columns existed
+        test_db.add(UserMastery(user_id=key[0], graph_id=key[1], node_id=key[2]))
+        await test_db.flush()
+        history = [(3, "review"), (3, "review"), (1, "relearning"), (3, "review")]
+        test_db.add_all(
+            ReviewEvent(
+                user_id=key[0],
+                graph_id=key[1],
+                node_id=key[2],
+                rating=rating,
+                state_after=state,
+                step=0,
+                reviewed_at=START + timedelta(days=day),
+            )
+            for day, (rating, state) in enumerate(history)
+        )
+        await test_db.commit()
+
+        service = ReviewHistoryCompactionService(test_db_manager, keep=2, batch_size=1)
+        report = await service.run()
+
+        assert report.rows_summarised == 1
+        assert report.events_deleted == 2
+
+        events = await get_review_events(test_db, *key)
+        assert [event.reviewed_at for event in events] == [
+            START + timedelta(days=2),
+            START + timedelta(days=3),
+        ]
+
+        test_db.expunge_all()
+        test_db.info.clear()
+        mastery = await test_db.get(UserMastery, key)
+        assert mastery.review_count == 4
+        assert mastery.lapse_count == 1
+        assert mastery.first_review == START
+        await test_db.commit()
+
+        # Already summarised and trimmed: a rerun changes nothing
+        rerun = await service.run()
+        assert rerun.rows_summarised == 0
+        assert rerun.events_deleted == 0
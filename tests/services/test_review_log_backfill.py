@@ -0,0 +1,110 @@
+"""
+Integration tests for the review_log -> review_events backfill.
+
+These tests verify that:
+1. Legacy JSONB logs become review_events rows in their original order
+2. last_step is taken from the last log entry
+3. The run is resumable/idempotent and can drop the legacy column
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import DatabaseManager
+from app.crud.review_event import get_review_events, legacy_review_log_exists
+from app.models.knowledge_graph import KnowledgeGraph
+from app.models.knowledge_node import KnowledgeNode
+from app.models.user import User, UserMastery
+from app.services.review_log_backfill import ReviewLogBackfillService
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+async def _legacy_masteries(test_db: AsyncSession, user: User, count: int):
+    """Mastery rows with review logs stored the old way (JSONB column)."""
+    graph = KnowledgeGraph(owner_id=user.id, name="G", slug="g")
+    test_db.add(graph)
+    await test_db.flush()
+    nodes = [KnowledgeNode(graph_id=graph.id, node_name=f"N{i}") for i in range(count)]
+    test_db.add_all(nodes)
+    await test_db.flush()
+    test_db.add_all(
+        UserMastery(user_id=user.id, graph_id=graph.id, node_id=node.id)
+        for node in nodes
+    )
+    await test_db.commit()
+
+    await test_db.execute(
+        text(
+            "ALTER TABLE user_mastery "
+            "ADD COLUMN review_log JSONB NOT NULL DEFAULT '[]'::jsonb"
+        )
+    )
+    for i, node in enumerate(nodes):
+        log = [
+            {
+                "rating": rating,
+                "review_datetime": (START + timedelta(days=day)).isoformat(),
+                "state_after": "learning",
+                "step": day,
+            }
+            for day, rating in enumerate([1, 3, 4][: i + 1])
+        ]
+        await test_db.execute(
+            text(
+                "UPDATE user_mastery SET review_log = CAST(:log AS jsonb) "
+                "WHERE node_id = :node_id"
+            ),
+            {"log": json.dumps(log), "node_id": node.id},
+        )
+    await test_db.commit()
+    return graph, nodes
+
+
+class TestReviewLogBackfill:
+    @pytest.mark.asyncio
+    async def test_moves_logs_into_review_events(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+    ):
+        graph, nodes = await _legacy_masteries(test_db, user_in_db, 3)
+
+        report = await ReviewLogBackfillService(test_db_manager, batch_size=2).run()
+
+        assert report.rows_migrated == 3
+        assert report.events_inserted == 1 + 2 + 3
+        assert report.batches == 2
+
+        events = await get_review_events(test_db, user_in_db.id, graph.id, nodes[2].id)
+        assert [event.rating for event in events] == [1, 3, 4]
+        assert [event.reviewed_at for event in events] == [
+            START + timedelta(days=day) for day in range(3)
+        ]
+
+        test_db.expunge_all()
+        test_db.info.clear()
+        mastery = await test_db.get(UserMastery, (user_in_db.id, graph.id, nodes[2].id))
+        assert mastery.last_step == 2
+
+    @pytest.mark.asyncio
+    async def test_rerun_is_noop_and_drops_column(
+        self,
+        test_db: AsyncSession,
+        test_db_manager: DatabaseManager,
+        user_in_db: User,
+    ):
+        await _legacy_masteries(test_db, user_in_db, 2)
+        service = ReviewLogBackfillService(test_db_manager)
+        await service.run()
+
+        report = await service.run(drop_column=True)
+
+        assert report.rows_migrated == 0
+        assert report.column_dropped is True
+        assert await legacy_review_log_exists(test_db) is False
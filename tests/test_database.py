@@ -0,0 +1,83 @@
+"""
+Tests for DatabaseManager pool configuration and pool metrics.
+
+Tests cover:
+- DB_POOL_* settings reaching the engine's pool
+- pgbouncer-compatible connect arguments
+- Checkout wait / timeout metrics (app.core.pool_metrics)
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.core.database import DatabaseManager
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, PoolMetrics
+
+
+def _manager(**overrides) -> DatabaseManager:
+    return DatabaseManager(settings.model_copy(update=overrides))
+
+
+class TestPoolConfiguration:
+    def test_pool_settings_are_applied(self):
+        manager = _manager(DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2, DB_POOL_TIMEOUT=5.0)
+        pool = manager.sql_engine.pool
+
+        assert isinstance(pool, InstrumentedAsyncQueuePool)
+        assert pool.size() == 3
+        assert pool._max_overflow == 2
+        assert pool._timeout == 5.0
+
+    def test_pgbouncer_disables_prepared_statement_caches(self):
+        args = _manager(DB_PGBOUNCER=True)._connect_args()
+
+        assert args["statement_cache_size"] == 0
+        assert args["prepared_statement_cache_size"] == 0
+        name_func = args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+    def test_default_connect_args_are_empty(self):
+        assert _manager(DB_PGBOUNCER=False)._connect_args() == {}
+
+
+class TestPoolMetrics:
+    def test_wait_averages(self):
+        metrics = PoolMetrics()
+        metrics.record_wait(0.002)
+        metrics.record_wait(0.004)
+
+        result = metrics.as_dict()
+        assert result["checkouts"] == 2
+        assert result["wait_avg_ms"] == pytest.approx(3.0)
+        assert result["wait_max_ms"] == pytest.approx(4.0)
+
+    @pytest.mark.asyncio
+    async def test_status_reports_checked_out_and_timeouts(self):
+        manager = _manager(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT=0.1)
+        try:
+            async with manager.sql_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                assert manager.pool_status()["checked_out"] == 1
+
+                with pytest.raises(PoolTimeoutError):
+                    async with manager.sql_engine.connect():
+                        pass
+
+            status = manager.pool_status()
+            assert status["checked_out"] == 0
+            assert status["checkouts"] == 1
+            assert status["timeouts"] == 1
+        finally:
+            await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_health_endpoint(self, client: AsyncClient):
+        response = await client.get("/health/pool")
+
+        assert response.status_code == 200
+        assert {"pool_size", "checked_out", "overflow", "wait_avg_ms"} <= set(
+            response.json()
+        )
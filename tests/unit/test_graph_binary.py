@@ -0,0 +1,95 @@
+"""
+Unit tests for the compact graph encoding (app/domain/graph_binary.py).
+"""
+
+import json
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.domain.graph_binary import GraphBinaryWriter, decode
+
+
+class TestGraphBinary:
+    def test_round_trip(self):
+        ids = [uuid4() for _ in range(3)]
+        buffer = (
+            GraphBinaryWriter()
+            .json("graph", {"name": "G", "tags": ["math"]})
+            .uuids("nodes.id", ids)
+            .strings("nodes.name", ["Limits", "Derivées", "积分"])
+            .strings("nodes.description", [None, "", "text"])
+            .float32("nodes.mastery_score", [0.1, 0.5, 0.9])
+            .int32("edges.source", [0, 1])
+            .int32("edges.target", [1, 2])
+            .to_bytes()
+        )
+
+        columns = decode(buffer)
+
+        assert columns["graph"] == {"name": "G", "tags": ["math"]}
+        assert columns["nodes.id"] == ids
+        assert columns["nodes.name"] == ["Limits", "Derivées", "积分"]
+        assert columns["nodes.description"] == [None, "", "text"]
+        np.testing.assert_allclose(columns["nodes.mastery_score"], [0.1, 0.5, 0.9])
+        assert columns["edges.source"].tolist() == [0, 1]
+        assert columns["edges.target"].tolist() == [1, 2]
+
+    def test_empty_columns(self):
+        buffer = GraphBinaryWriter().uuids("nodes.id", []).int32("e", []).to_bytes()
+
+        columns = decode(buffer)
+
+        assert columns["nodes.id"] == []
+        assert columns["e"].size == 0
+
+    def test_numeric_payloads_are_aligned(self):
+        """Typed array views need 4-byte aligned payloads."""
+        buffer = (
+            GraphBinaryWriter()
+            .strings("odd", ["abc"])
+            .float32("x", [1.0, 2.0])
+            .to_bytes()
+        )
+        # The float32 payload is the last 8 bytes of the buffer
+        assert len(buffer) % 4 == 0
+        assert np.frombuffer(buffer[-8:], dtype="<f4").tolist() == [1.0, 2.0]
+
+    def test_rejects_foreign_buffers(self):
+        with pytest.raises(ValueError):
+            decode(b'{"nodes": []}')
+
+    def test_smaller_than_json(self):
+        ids = [uuid4() for _ in range(1000)]
+        edges = [(i, i + 1) for i in range(999)]
+        as_json = json.dumps(
+            {
+                "nodes": [
+                    {
+                        "id": str(i),
+                        "name": "n",
+                        "description": None,
+                        "mastery_score": 0.1,
+                    }
+                    for i in ids
+                ],
+                "edges": [
+                    {"source_id": str(ids[a]), "target_id": str(ids[b])}
+                    for a, b in edges
+                ],
+            }
+        ).encode()
+
+        buffer = (
+            GraphBinaryWriter()
+            .uuids("nodes.id", ids)
+            .strings("nodes.name", ["n"] * len(ids))
+            .strings("nodes.description", [None] * len(ids))
+            .float32("nodes.mastery_score", [0.1] * len(ids))
+            .int32("edges.source", [a for a, _ in edges])
+            .int32("edges.target", [b for _, b in edges])
+            .to_bytes()
+        )
+
+        assert len(buffer) * 5 < len(as_json)
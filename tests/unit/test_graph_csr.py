@@ -0,0 +1,72 @@
+"""
+Unit tests for the CSR graph structure (app/domain/graph_csr.py).
+"""
+
+from uuid import uuid4
+
+from app.domain.graph_csr import CSRGraph
+
+
+def _ids(n: int):
+    return [uuid4() for _ in range(n)]
+
+
+class TestCSRGraphFromEdges:
+    def test_builds_both_directions(self):
+        a, b, c = _ids(3)
+        graph = CSRGraph.from_edges([a, b, c], [(a, b), (a, c), (b, c)])
+
+        assert graph.num_nodes == 3
+        assert graph.num_edges == 3
+        assert sorted(graph.successors(graph.index[a]).tolist()) == [
+            graph.index[b],
+            graph.index[c],
+        ]
+        assert sorted(graph.predecessors(graph.index[c]).tolist()) == [
+            graph.index[a],
+            graph.index[b],
+        ]
+        assert graph.predecessors(graph.index[a]).size == 0
+
+    def test_appends_missing_endpoints(self):
+        a, b = _ids(2)
+        graph = CSRGraph.from_edges([], [(a, b)])
+
+        assert graph.node_ids == (a, b)
+        assert graph.index == {a: 0, b: 1}
+
+    def test_empty_graph(self):
+        graph = CSRGraph.from_edges([], [])
+
+        assert graph.num_nodes == 0
+        assert graph.num_edges == 0
+        assert graph.ancestor_depths(uuid4()) == {}
+
+
+class TestAncestorDepths:
+    def test_returns_minimum_depth(self):
+        """A -> C and A -> B -> C: A is at depth 1, not 2."""
+        a, b, c = _ids(3)
+        graph = CSRGraph.from_edges([a, b, c], [(a, c), (a, b), (b, c)])
+
+        assert graph.ancestor_depths(c) == {a: 1, b: 1}
+
+    def test_multi_level_chain(self):
+        a, b, c, d = _ids(4)
+        graph = CSRGraph.from_edges([a, b, c, d], [(a, b), (b, c), (c, d)])
+
+        assert graph.ancestor_depths(d) == {c: 1, b: 2, a: 3}
+        assert graph.ancestor_depths(d, max_depth=2) == {c: 1, b: 2}
+        assert graph.ancestor_depths(a) == {}
+
+    def test_cycle_terminates_and_excludes_start(self):
+        a, b = _ids(2)
+        graph = CSRGraph.from_edges([a, b], [(a, b), (b, a)])
+
+        assert graph.ancestor_depths(a) == {b: 1}
+
+    def test_unknown_node(self):
+        a, b = _ids(2)
+        graph = CSRGraph.from_edges([a, b], [(a, b)])
+
+        assert graph.ancestor_depths(uuid4()) == {}
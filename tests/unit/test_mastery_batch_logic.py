@@ -0,0 +1,222 @@
+import random
+from copy import deepcopy
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from fsrs import Card, Rating, Scheduler, State
+
+from app.domain.mastery_batch_logic import (
+    FSRSBatchScheduler,
+    FSRSCardBatch,
+    from_datetime64,
+    to_datetime64,
+)
+from app.domain.mastery_logic import MasteryLogic
+from app.models.user import FSRSState, UserMastery
+
+FUZZ_VALUE = 0.37
+START = datetime(2025, 1, 1, 9, 0, tzinfo=UTC)
+
+
+def _random_cards(scheduler: Scheduler, count: int, seed: int) -> list[Card]:
+    """Produce cards in varied states by replaying random review histories."""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        card = Card(card_id=i + 1)
+        now = START
+        for _ in range(rng.randint(0, 8)):
+            now += timedelta(minutes=rng.choice([5, 30, 600, 1440 * 3, 1440 * 20]))
+            card, _ = scheduler.review_card(card, Rating(rng.randint(1, 4)), now)
+        cards.append(card)
+    return cards
+
+
+def _to_batch(cards: list[Card]) -> FSRSCardBatch:
+    batch = FSRSCardBatch.empty(len(cards))
+    for i, card in enumerate(cards):
+        batch.state[i] = card.state.value
+        batch.step[i] = card.step or 0
+        batch.stability[i] = np.nan if card.stability is None else card.stability
+        batch.difficulty[i] = np.nan if card.difficulty is None else card.difficulty
+    batch.due = to_datetime64([card.due for card in cards])
+    batch.last_review = to_datetime64([card.last_review for card in cards])
+    return batch
+
+
+class TestFSRSBatchScheduler:
+    @pytest.mark.parametrize(
+        "scheduler",
+        [
+            Scheduler(),
+            Scheduler(enable_fuzzing=False),
+            Scheduler(
+                learning_steps=[timedelta(minutes=1)],
+                relearning_steps=[],
+                maximum_interval=100,
+            ),
+        ],
+        ids=["default", "no-fuzz", "custom-steps"],
+    )
+    @pytest.mark.parametrize("elapsed", [timedelta(minutes=10), timedelta(days=7)])
+    def test_review_parity_with_scalar_scheduler(self, scheduler, elapsed):
+        """Verify batch review matches fsrs.Scheduler.review_card card by card.
+
+        Expected:
+            - State, step, due date and last review are identical.
+            - Stability and difficulty agree to floating point precision.
+        """
+        cards = _random_cards(Scheduler(), count=60, seed=7)
+        batch_scheduler = FSRSBatchScheduler(scheduler)
+
+        for rating in Rating:
+            now = max(card.last_review or START for card in cards) + elapsed
+            with patch("fsrs.scheduler.random", return_value=FUZZ_VALUE):
+                expected = [
+                    scheduler.review_card(deepcopy(card), rating, now)[0]
+                    for card in cards
+                ]
+
+            result = batch_scheduler.review(
+                _to_batch(cards),
+                rating,
+                now,
+                fuzz=np.full(len(cards), FUZZ_VALUE),
+            )
+
+            assert result.state.tolist() == [c.state.value for c in expected]
+            assert [
+                step if state != State.Review.value else None
+                for step, state in zip(result.step.tolist(), result.state.tolist())
+            ] == [c.step for c in expected]
+            assert from_datetime64(result.due) == [c.due for c in expected]
+            assert result.stability.tolist() == pytest.approx(
+                [c.stability for c in expected], rel=1e-9
+            )
+            assert result.difficulty.tolist() == pytest.approx(
+                [c.difficulty for c in expected], rel=1e-9
+            )
+            assert set(from_datetime64(result.last_review)) == {now}
+
+    def test_retrievability_parity_with_scalar_scheduler(self):
+        """Verify batch R(t) matches Scheduler.get_card_retrievability.
+
+        Expected:
+            - New cards have R = 0.0; reviewed cards match the scalar value.
+        """
+        scheduler = Scheduler()
+        cards = _random_cards(scheduler, count=50, seed=11)
+        batch = _to_batch(cards)
+        batch_scheduler = FSRSBatchScheduler(scheduler)
+
+        for offset in (timedelta(0), timedelta(hours=30), timedelta(days=45)):
+            now = START + timedelta(days=60) + offset
+            expected = [scheduler.get_card_retrievability(c, now) for c in cards]
+            result = batch_scheduler.get_retrievability(batch, now)
+            assert result.tolist() == pytest.approx(expected, rel=1e-12)
+
+    def test_mixed_ratings_per_card(self):
+        """Verify each card is reviewed with its own rating.
+
+        Expected:
+            - Results equal reviewing each card individually.
+        """
+        scheduler = Scheduler(enable_fuzzing=False)
+        cards = _random_cards(scheduler, count=40, seed=3)
+        ratings = [Rating((i % 4) + 1) for i in range(len(cards))]
+        now = START + timedelta(days=90)
+
+        expected = [
+            scheduler.review_card(deepcopy(card), rating, now)[0]
+            for card, rating in zip(cards, ratings)
+        ]
+        result = FSRSBatchScheduler(scheduler).review(
+            _to_batch(cards), np.array([r.value for r in ratings]), now
+        )
+
+        assert result.state.tolist() == [c.state.value for c in expected]
+        assert from_datetime64(result.due) == [c.due for c in expected]
+
+
+class TestMasteryLogicBatch:
+    @staticmethod
+    def _masteries(now: datetime) -> list[UserMastery]:
+        return [
+            UserMastery(
+                user_id=uuid4(),
+                graph_id=uuid4(),
+                node_id=uuid4(),
+                last_review=None,
+                fsrs_state=FSRSState.LEARNING.value,
+                fsrs_stability=0.0,
+                fsrs_difficulty=0.0,
+                due_date=now,
+            ),
+            UserMastery(
+                user_id=uuid4(),
+                graph_id=uuid4(),
+                node_id=uuid4(),
+                last_review=now - timedelta(days=4),
+                fsrs_state=FSRSState.REVIEW.value,
+                fsrs_stability=5.0,
+                fsrs_difficulty=6.0,
+                due_date=now + timedelta(days=1),
+            ),
+            UserMastery(
+                user_id=uuid4(),
+                graph_id=uuid4(),
+                node_id=uuid4(),
+                last_review=now - timedelta(minutes=20),
+                fsrs_state=FSRSState.LEARNING.value,
+                fsrs_stability=2.3,
+                fsrs_difficulty=4.1,
+                due_date=now - timedelta(minutes=10),
+                last_step=1,
+            ),
+        ]
+
+    def test_implicit_review_updates_match_scalar(self):
+        """Verify the batch implicit review matches the per-record version.
+
+        Expected:
+            - Every field of every update dictionary matches.
+        """
+        now = START + timedelta(days=30)
+        masteries = self._masteries(now)
+
+        with patch("fsrs.scheduler.random", return_value=0.0), patch(
+            "numpy.random.default_rng"
+        ) as mock_rng:
+            mock_rng.return_value.random.side_effect = lambda n: np.zeros(n)
+            expected = [
+                MasteryLogic.calculate_implicit_review_update(m, now)
+                for m in masteries
+            ]
+            result = MasteryLogic.calculate_implicit_review_updates(masteries, now)
+
+        assert len(result) == len(expected)
+        for batch_update, scalar_update in zip(result, expected):
+            assert batch_update.keys() == scalar_update.keys()
+            for key, value in scalar_update.items():
+                if isinstance(value, float):
+                    assert batch_update[key] == pytest.approx(value, rel=1e-9)
+                else:
+                    assert batch_update[key] == value
+
+    def test_implicit_review_updates_empty(self):
+        """Verify an empty input returns no updates."""
+        assert MasteryLogic.calculate_implicit_review_updates([], START) == []
+
+    def test_get_current_retrievabilities(self):
+        """Verify batch R(t) matches get_current_retrievability per record."""
+        now = START + timedelta(days=30)
+        masteries = self._masteries(now)
+
+        with patch("app.domain.mastery_logic.get_now", return_value=now):
+            expected = [MasteryLogic.get_current_retrievability(m) for m in masteries]
+            result = MasteryLogic.get_current_retrievabilities(masteries)
+
+        assert result.tolist() == pytest.approx(expected, rel=1e-12)
@@ -94,12 +94,12 @@ class TestMasteryLogic:
         assert card1.card_id == expected_id
 
     def test_step_persistence(self):
-        """Verify that 'step' is correctly recovered from the review_log.
+        """Verify that 'step' is correctly recovered from last_step.
 
         Crucial for multi-step learning phases to prevent infinite loops.
 
         Expected:
-            - Card step matches the last value in review_log.
+            - Card step matches the step of the last review.
         """
         node_id = uuid4()
         mastery = UserMastery(
@@ -108,11 +108,8 @@ class TestMasteryLogic:
             node_id=node_id,
             last_review=get_now(),
             fsrs_state=FSRSState.LEARNING.value,
-            # Simulate a log where we were at step 1
-            review_log=[
-                {"rating": 1, "state_after": "learning", "step": 0},
-                {"rating": 3, "state_after": "learning", "step": 1},
-            ],
+            # The last review left us at step 1
+            last_step=1,
         )
 
         card = MasteryLogic.build_fsrs_card(mastery)
@@ -120,7 +117,7 @@ class TestMasteryLogic:
         assert card.step == 1
 
     def test_step_persistence_missing_log(self):
-        """Verify default step is 0 if logs are missing or malformed.
+        """Verify default step is 0 if no step was recorded.
 
         Expected:
             - Card step defaults to 0.
@@ -131,15 +128,11 @@ class TestMasteryLogic:
             node_id=uuid4(),
             last_review=get_now(),
             fsrs_state=FSRSState.LEARNING.value,
-            review_log=[],
+            last_step=None,
         )
         card = MasteryLogic.build_fsrs_card(mastery)
         assert card.step == 0
 
-        mastery.review_log = [{"rating": 3}]  # Missing 'step' key
-        card = MasteryLogic.build_fsrs_card(mastery)
-        assert card.step == 0
-
     def test_calculate_next_state_correct_basic(self):
         """Verify basic FSRS update on a correct answer.
 
@@ -286,3 +279,43 @@ class TestMasteryLogic:
 
         finally:
             MasteryLogic._fsrs_scheduler = original_scheduler
+
+    def test_calculate_next_state_review_summary(self):
+        """Verify lifetime counters: first review kept, lapse only from review state.
+
+        Expected:
+            - review_count increments on every review.
+            - lapse_count increments on Again while in the review state.
+            - first_review keeps the earliest review time.
+        """
+        now = get_now()
+        first = now - timedelta(days=30)
+        mastery = UserMastery(
+            user_id=uuid4(),
+            graph_id=uuid4(),
+            node_id=uuid4(),
+            last_review=now - timedelta(days=5),
+            fsrs_state=FSRSState.REVIEW.value,
+            fsrs_stability=10.0,
+            fsrs_difficulty=5.0,
+            review_count=7,
+            lapse_count=1,
+            first_review=first,
+        )
+
+        lapse = MasteryLogic.calculate_next_state(
+            mastery=mastery, is_correct=False, p_g=0.0, p_s=0.0, now=now
+        )
+        assert lapse["review_count"] == 8
+        assert lapse["lapse_count"] == 2
+        assert lapse["first_review"] == first
+
+        mastery.fsrs_state = FSRSState.LEARNING.value
+        mastery.review_count = None
+        mastery.first_review = None
+        relearn = MasteryLogic.calculate_next_state(
+            mastery=mastery, is_correct=False, p_g=0.0, p_s=0.0, now=now
+        )
+        assert relearn["review_count"] == 1
+        assert relearn["lapse_count"] == 1
+        assert relearn["first_review"] == now
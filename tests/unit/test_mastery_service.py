@@ -85,19 +85,17 @@ async def test_update_mastery_from_grading_success(
 
     mock_mastery_logic.get_initial_retrievability.return_value = 0.5
 
-    # get_or_create_mastery is awaited
-    mock_mastery_crud.get_or_create_mastery = AsyncMock(
-        return_value=(mock_mastery, False)
-    )
+    # The mastery row was loaded with the question (no upsert needed)
+    mock_mastery_crud.get_loaded_mastery.return_value = mock_mastery
+    mock_mastery_crud.upsert_masteries = AsyncMock()
 
     mock_updates = {"cached_retrievability": 0.8, "fsrs_stability": 2.0}
     mock_mastery_logic.calculate_next_state.return_value = mock_updates
 
     # Prerequisite mocking for propagation
-    mock_mastery_crud.get_prerequisite_roots_to_bonus = AsyncMock(
+    mock_mastery_crud.get_prerequisite_ancestors_with_masteries = AsyncMock(
         return_value={}
     )  # No propagation
-    mock_mastery_crud.get_masteries_by_nodes = AsyncMock(return_value={})
 
     # Execute
     result = await mastery_service.update_mastery_from_grading(
@@ -112,7 +110,10 @@ async def test_update_mastery_from_grading_success(
     mock_question_crud.get_node_by_question.assert_called_once_with(
         db_session, mock_question
     )
-    mock_mastery_crud.get_or_create_mastery.assert_awaited_once()
+    mock_mastery_crud.get_loaded_mastery.assert_called_once_with(
+        db_session, user.id, graph_id, node_id
+    )
+    mock_mastery_crud.upsert_masteries.assert_not_awaited()
     mock_mastery_logic.calculate_next_state.assert_called_once()
 
     # Verify updates applied
@@ -200,25 +201,21 @@ async def test_propagate_mastery_implicit_review(
     node_answered = KnowledgeNode(id=node_id, graph_id=graph_id)
 
     # Mock return values for implicit review
-    # 1. Prereq roots found
-    mock_mastery_crud.get_prerequisite_roots_to_bonus = AsyncMock(
-        return_value={prereq_id: 1}
-    )
-
-    # 2. Existing mastery for prereq found
+    # 1. Prereq root found, with an existing mastery
     mock_prereq_mastery = UserMastery(
         user_id=user.id, graph_id=graph_id, node_id=prereq_id, cached_retrievability=0.4
     )
-    mock_mastery_crud.get_masteries_by_nodes = AsyncMock(
-        return_value={prereq_id: mock_prereq_mastery}
+    mock_mastery_crud.get_prerequisite_ancestors_with_masteries = AsyncMock(
+        return_value={prereq_id: (1, mock_prereq_mastery)}
     )
 
-    # 3. Logic: Should trigger implicit review
+    # 2. Logic: Should trigger implicit review
     mock_mastery_logic.should_trigger_implicit_review.return_value = True
 
-    # 4. Logic: Calculate updates
+    # 3. Logic: Calculate updates
     mock_updates = {"cached_retrievability": 0.45, "last_review": datetime.now()}
-    mock_mastery_logic.calculate_implicit_review_update.return_value = mock_updates
+    mock_mastery_logic.calculate_implicit_review_updates.return_value = [mock_updates]
+    mock_mastery_crud.bulk_apply_implicit_reviews = AsyncMock(return_value=1)
 
     # Execute
     await mastery_service.propagate_mastery(
@@ -226,13 +223,17 @@ async def test_propagate_mastery_implicit_review(
     )
 
     # Verify
-    mock_mastery_crud.get_prerequisite_roots_to_bonus.assert_called_once_with(
-        db_session, graph_id, node_id
+    mock_mastery_crud.get_prerequisite_ancestors_with_masteries.assert_called_once_with(
+        db_session, user.id, graph_id, node_id
+    )
+    mock_mastery_logic.calculate_implicit_review_updates.assert_called_once_with(
+        [mock_prereq_mastery], ANY
     )
-    mock_mastery_crud.get_masteries_by_nodes.assert_called_once()
-    mock_mastery_logic.calculate_implicit_review_update.assert_called_once_with(
-        mock_prereq_mastery, ANY
+    # One set-based UPDATE for all triggered ancestors
+    mock_mastery_crud.bulk_apply_implicit_reviews.assert_awaited_once_with(
+        db_session, user.id, graph_id, [prereq_id], [mock_updates]
     )
+    # The loaded model mirrors the written values without becoming dirty
     assert mock_prereq_mastery.cached_retrievability == 0.45
     db_session.flush.assert_called_once()
 
@@ -254,16 +255,19 @@ async def test_propagate_mastery_creates_new_mastery_if_missing(
     node_answered = KnowledgeNode(id=node_id, graph_id=graph_id)
 
     # Prereq exists but no mastery record yet
-    mock_mastery_crud.get_prerequisite_roots_to_bonus = AsyncMock(
-        return_value={prereq_id: 1}
+    mock_mastery_crud.get_prerequisite_ancestors_with_masteries = AsyncMock(
+        return_value={prereq_id: (1, None)}
     )
-    mock_mastery_crud.get_masteries_by_nodes = AsyncMock(return_value={})  # Empty map
 
     mock_mastery_logic.should_trigger_implicit_review.return_value = True
     mock_mastery_logic.get_initial_retrievability.return_value = 0.5
-    mock_mastery_logic.calculate_implicit_review_update.return_value = {
-        "cached_retrievability": 0.55
-    }
+    mock_mastery_logic.calculate_implicit_review_updates.return_value = [
+        {"cached_retrievability": 0.55}
+    ]
+    created = UserMastery(user_id=user.id, graph_id=graph_id, node_id=prereq_id)
+    mock_mastery_crud.upsert_masteries = AsyncMock(
+        return_value={(graph_id, prereq_id): (created, True)}
+    )
 
     # Execute
     await mastery_service.propagate_mastery(
@@ -271,13 +275,16 @@ async def test_propagate_mastery_creates_new_mastery_if_missing(
     )
 
     # Verify
-    # Should add new mastery to session
-    assert db_session.add.called
-    added_obj = db_session.add.call_args[0][0]
-    assert isinstance(added_obj, UserMastery)
-    assert added_obj.user_id == user.id
-    assert added_obj.node_id == prereq_id
-    assert added_obj.cached_retrievability == 0.55  # Updated value
+    # Should create the new mastery with the implicit review already applied
+    mock_mastery_crud.upsert_masteries.assert_awaited_once()
+    _, user_id, rows = mock_mastery_crud.upsert_masteries.await_args.args
+    assert user_id == user.id
+    assert rows == [
+        {"graph_id": graph_id, "node_id": prereq_id, "cached_retrievability": 0.55}
+    ]
+    # A freshly created row is not reviewed a second time
+    mock_mastery_logic.calculate_implicit_review_updates.assert_called_once()
+    db_session.add.assert_not_called()
 
 
 @pytest.mark.asyncio
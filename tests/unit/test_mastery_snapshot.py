@@ -0,0 +1,108 @@
+"""
+Unit tests for the mastery snapshot (app/domain/mastery_snapshot.py).
+"""
+
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from app.domain.mastery_snapshot import MasterySnapshot
+
+NOW = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+
+
+def _snapshot():
+    overdue, due_later, never = uuid4(), uuid4(), uuid4()
+    snapshot = MasterySnapshot.from_rows(
+        [
+            (overdue, 4.0, NOW - timedelta(hours=1), 0.6),
+            (due_later, 12.5, NOW + timedelta(days=2), 0.9),
+            (never, None, None, 0.1),
+        ]
+    )
+    return snapshot, overdue, due_later, never
+
+
+class TestMasterySnapshotReads:
+    def test_empty(self):
+        snapshot = MasterySnapshot.from_rows([])
+
+        assert len(snapshot) == 0
+        assert snapshot.due_node_ids(NOW) == []
+        assert snapshot.stability_map([uuid4()]) == {}
+
+    def test_due_node_ids(self):
+        snapshot, overdue, due_later, _ = _snapshot()
+
+        assert snapshot.due_node_ids(NOW) == [overdue]
+        assert snapshot.due_node_ids(NOW + timedelta(days=3)) == [overdue, due_later]
+
+    def test_due_date_round_trips(self):
+        snapshot, overdue, _, never = _snapshot()
+
+        assert snapshot.due_date(overdue) == NOW - timedelta(hours=1)
+        assert snapshot.due_date(never) is None
+
+    def test_cached_retrievability_default(self):
+        snapshot, _, due_later, _ = _snapshot()
+
+        assert snapshot.cached_retrievability(due_later, default=0.1) == 0.9
+        assert snapshot.cached_retrievability(uuid4(), default=0.1) == 0.1
+
+    def test_stability_map(self):
+        snapshot, overdue, _, never = _snapshot()
+        unknown = uuid4()
+
+        assert snapshot.stability_map([overdue, never, unknown]) == {
+            overdue: 4.0,
+            never: None,
+        }
+
+
+class TestMasterySnapshotApply:
+    def test_updates_existing_rows_in_place(self):
+        snapshot, overdue, _, _ = _snapshot()
+
+        snapshot.apply([(overdue, 8.0, NOW + timedelta(days=5), 0.95)])
+
+        assert len(snapshot) == 3
+        assert snapshot.due_node_ids(NOW) == []
+        assert snapshot.stability_map([overdue]) == {overdue: 8.0}
+        assert snapshot.cached_retrievability(overdue, default=0.0) == 0.95
+
+    def test_appends_new_rows_once(self):
+        snapshot, _, _, _ = _snapshot()
+        new = uuid4()
+
+        snapshot.apply(
+            [
+                (new, 0.5, NOW + timedelta(days=1), 0.3),
+                (new, 1.5, NOW - timedelta(minutes=5), 0.4),
+            ]
+        )
+
+        assert len(snapshot) == 4
+        assert new in snapshot
+        # The later value for the same node wins
+        assert snapshot.stability_map([new]) == {new: 1.5}
+        assert new in snapshot.due_node_ids(NOW)
+
+
+class TestMasterySnapshotDigest:
+    def test_independent_of_row_order(self):
+        rows = [
+            (uuid4(), 4.0, NOW, 0.6),
+            (uuid4(), None, None, 0.1),
+        ]
+
+        assert (
+            MasterySnapshot.from_rows(rows).digest()
+            == MasterySnapshot.from_rows(rows[::-1]).digest()
+        )
+
+    def test_changes_on_apply(self):
+        snapshot, overdue, _, _ = _snapshot()
+        before = snapshot.digest()
+
+        snapshot.apply([(overdue, 4.0, NOW - timedelta(hours=1), 0.55)])
+
+        assert snapshot.digest() != before
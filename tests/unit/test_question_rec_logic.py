@@ -318,6 +318,22 @@ class TestFilterByStability:
 
         assert len(result) == 0
 
+    def test_unreviewed_prerequisite_stability_defaults_to_zero(self):
+        """Verify a prerequisite with NULL stability (never reviewed) fails threshold.
+
+        Expected:
+            - None stability treated as 0.0 instead of raising TypeError.
+            - Candidate is filtered out.
+        """
+        candidate_id = uuid4()
+        prereq_id = uuid4()
+
+        result = QuestionRecLogic.filter_by_stability(
+            [candidate_id], {candidate_id: [prereq_id]}, {prereq_id: None}, 0.5
+        )
+
+        assert len(result) == 0
+
     def test_quality_capped_at_1_0(self):
         """Verify quality is capped at 1.0 even when average stability exceeds 1.0.
 
@@ -0,0 +1,126 @@
+"""
+Unit tests for the background worker (app/worker).
+
+Redis is replaced by an AsyncMock client; handlers are registered per test.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.worker import worker as worker_module
+from app.worker.config import DLQ_NAME, MAIN_QUEUE_NAME, TASK_HANDLERS, enqueue_task
+from app.worker.worker import AsyncWorker, process_task
+
+
+@pytest.fixture
+def ctx():
+    context = MagicMock()
+    context.redis_client = AsyncMock()
+    return context
+
+
+@pytest.fixture
+def handler(mocker):
+    mock = AsyncMock()
+    mocker.patch.dict(TASK_HANDLERS, {"test_task": mock})
+    return mock
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(mocker):
+    return mocker.patch.object(worker_module.asyncio, "sleep", new=AsyncMock())
+
+
+def _task(task_type: str = "test_task") -> str:
+    return json.dumps(
+        {"task_type": task_type, "payload": {"x": 1}, "idempotency_key": "key-1"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_enqueue_task_pushes_envelope():
+    redis_client = AsyncMock()
+
+    key = await enqueue_task(redis_client, "test_task", {"x": 1}, "key-1")
+
+    assert key == "key-1"
+    queue, data = redis_client.lpush.call_args.args
+    assert queue == MAIN_QUEUE_NAME
+    task = json.loads(data)
+    assert task["task_type"] == "test_task"
+    assert task["payload"] == {"x": 1}
+    assert task["idempotency_key"] == "key-1"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_task_generates_idempotency_key():
+    key = await enqueue_task(AsyncMock(), "test_task", {})
+
+    assert key
+
+
+@pytest.mark.asyncio
+async def test_process_task_success(ctx, handler):
+    assert await process_task(_task(), ctx) is True
+
+    handler.assert_awaited_once_with({"x": 1}, ctx, "key-1")
+    ctx.redis_client.lpush.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_task_retries_then_succeeds(ctx, handler, no_backoff):
+    handler.side_effect = [RuntimeError("flaky"), None]
+
+    assert await process_task(_task(), ctx) is True
+
+    assert handler.await_count == 2
+    no_backoff.assert_awaited_once_with(1)
+    ctx.redis_client.lpush.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_task_moves_to_dlq_after_max_retries(ctx, handler):
+    handler.side_effect = RuntimeError("boom")
+
+    assert await process_task(_task(), ctx, max_retries=3) is False
+
+    assert handler.await_count == 3
+    queue, data = ctx.redis_client.lpush.call_args.args
+    assert queue == DLQ_NAME
+    dlq_entry = json.loads(data)
+    assert dlq_entry["error_message"] == "boom"
+    assert dlq_entry["retry_count"] == 3
+    assert dlq_entry["original_task"]["idempotency_key"] == "key-1"
+
+
+@pytest.mark.asyncio
+async def test_process_task_unknown_type_goes_to_dlq(ctx):
+    assert await process_task(_task("no_such_task"), ctx) is False
+
+    queue, _ = ctx.redis_client.lpush.call_args.args
+    assert queue == DLQ_NAME
+
+
+@pytest.mark.asyncio
+async def test_worker_acks_after_processing(ctx, handler):
+    worker = AsyncWorker(MagicMock(), worker_id="w1", concurrency=1)
+    worker.ctx = ctx
+
+    await worker._handle(_task())
+
+    ctx.redis_client.lrem.assert_awaited_once_with(worker.processing_queue, 1, _task())
+    assert worker.stats.processed_count == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_requeues_in_flight_tasks(ctx):
+    worker = AsyncWorker(MagicMock(), worker_id="w1", concurrency=1)
+    worker.ctx = ctx
+    ctx.redis_client.lmove.side_effect = [_task(), _task(), None]
+
+    assert await worker.requeue_in_flight() == 2
+    ctx.redis_client.lmove.assert_awaited_with(
+        worker.processing_queue, MAIN_QUEUE_NAME, "RIGHT", "RIGHT"
+    )